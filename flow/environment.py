@@ -13,23 +13,26 @@ from __future__ import print_function
 from __future__ import division
 import os
 import re
+import json
+import time
 import socket
+import getpass
 import logging
 import importlib
+import subprocess
 from collections import OrderedDict
+from hashlib import sha1
 
 from signac.common import config
 from signac.common import six
 from signac.common.six import with_metaclass
 
-from .scheduling.base import JobStatus
-from .scheduling.lsf import LSFScheduler
-from .scheduling.slurm import SlurmScheduler
-from .scheduling.torque import TorqueScheduler
-from .scheduling.simple_scheduler import SimpleScheduler
-from .scheduling.fakescheduler import FakeScheduler
 from .util import config as flow_config
+from .util.cache import FileCache
+from .util.cache import user_cache_dir
+from .util.misc import _RateLimiter
 from .errors import NoSchedulerError
+from .errors import SubmitError
 
 if six.PY2:
     import imp
@@ -44,6 +47,60 @@ if six.PY2:
 # Global variable can be used to override detected environment
 ENVIRONMENT = None
 
+# The default time-to-live of the cached result of the environment detection in seconds.
+ENVIRONMENT_CACHE_TTL = 3600
+
+# The default number of retries after transient errors during submission.
+SUBMIT_RETRIES = 3
+
+# The delay before the first retry in seconds, which is doubled for each further retry.
+SUBMIT_RETRY_DELAY = 1.0
+
+# Fragments of scheduler error messages that indicate that the scheduler could not
+# be reached, such that the script was not submitted and may be submitted again.
+_UNREACHABLE_SCHEDULER_ERRORS = (
+    'unable to contact slurm controller',
+    'resource temporarily unavailable',
+    'connection refused',
+    'cannot connect to specified server host',
+    'batch system daemon not responding',
+)
+
+# Fragments of scheduler error messages that indicate that the submission timed out,
+# in which case the cluster job may have been queued nonetheless.
+_TIMEOUT_SUBMIT_ERRORS = (
+    'socket timed out on send/recv operation',
+    'timed out',
+)
+
+# Limits the rate of scheduler submissions of all threads of this process.
+_submit_rate_limiter = _RateLimiter()
+
+
+def _submit_error_matches(error, fragments):
+    "Return True if the message or output of a submission error contains any of fragments."
+    msg = '{} {}'.format(error, getattr(error, 'output', '') or '').lower()
+    return any(fragment in msg for fragment in fragments)
+
+
+def _is_queued(scheduler, _id):
+    """Return True if the scheduler reports a cluster job with the given name.
+
+    Returns None if the scheduler can not be queried.
+    """
+    scheduler._invalidate_cached_jobs()
+    try:
+        if scheduler.query_by_prefix:
+            jobs = scheduler.jobs(prefix=_id)
+        else:
+            jobs = scheduler.jobs()
+        # The elements of job arrays are reported with their index.
+        return any(job.name().partition('[')[0] == _id for job in jobs)
+    except (RuntimeError, EnvironmentError, NotImplementedError,
+            subprocess.CalledProcessError) as error:
+        logger.debug("Unable to query the scheduler for cluster job '{}': {}".format(_id, error))
+        return None
+
 
 def setup(py_modules, **attrs):
     """Setup function for environment modules.
@@ -96,6 +153,22 @@ class ComputeEnvironmentType(type):
         return super(ComputeEnvironmentType, cls).__init__(name, bases, dct)
 
 
+class _LazySchedulerType(object):
+    """Resolve the scheduler driver class of an environment on first access.
+
+    The scheduler driver modules are only imported for the environments that
+    are actually used, which keeps the import of flow itself fast.
+    """
+
+    def __init__(self, module, name):
+        self.module = module
+        self.name = name
+
+    def __get__(self, instance, owner):
+        module = importlib.import_module('.scheduling.' + self.module, __package__)
+        return getattr(module, self.name)
+
+
 class ComputeEnvironment(with_metaclass(ComputeEnvironmentType)):
     """Define computational environments.
 
@@ -113,6 +186,11 @@ class ComputeEnvironment(with_metaclass(ComputeEnvironmentType)):
     submit_flags = None
     template = 'base_script.sh'
 
+    # The environment variables that the result of is_present() depends on.
+    # The cached result of the environment detection is only used while their
+    # values are unchanged.
+    detection_variables = ('PATH',)
+
     @classmethod
     def is_present(cls):
         """Determine whether this specific compute environment is present.
@@ -149,6 +227,17 @@ class ComputeEnvironment(with_metaclass(ComputeEnvironmentType)):
 
         Scripts should be submitted to the environment, instead of directly
         to the scheduler to allow for environment specific post-processing.
+
+        The rate of submissions can be limited with the ``flow.submit_rate``
+        configuration key (submissions per second, 0 means unlimited). Submissions
+        that fail because the scheduler can not be reached are retried up to
+        ``flow.submit_retries`` times with exponential backoff. Submissions of named
+        cluster jobs that timed out are only retried if the scheduler does not
+        report the cluster job.
+
+        :returns:
+            The cluster job id for schedulers that report it, True if the script
+            was submitted without an id, otherwise a false value.
         """
         if flags is None:
             flags = []
@@ -156,9 +245,40 @@ class ComputeEnvironment(with_metaclass(ComputeEnvironmentType)):
         if env_flags:
             flags.extend(env_flags)
 
-        # Hand off the actual submission to the scheduler
-        if cls.get_scheduler().submit(script, flags=flags, *args, **kwargs):
-            return JobStatus.submitted
+        rate = float(flow_config.get_config_value('submit_rate', default=0))
+        retries = int(flow_config.get_config_value('submit_retries', default=SUBMIT_RETRIES))
+        delay = SUBMIT_RETRY_DELAY
+        scheduler = cls.get_scheduler()
+        for attempt in range(retries + 1):
+            _submit_rate_limiter.wait(rate)
+            try:
+                # Hand off the actual submission to the scheduler
+                result = scheduler.submit(script, flags=flags, *args, **kwargs)
+            except (SubmitError, subprocess.CalledProcessError) as error:
+                unreachable = _submit_error_matches(error, _UNREACHABLE_SCHEDULER_ERRORS)
+                timeout = kwargs.get('_id') is not None and \
+                    _submit_error_matches(error, _TIMEOUT_SUBMIT_ERRORS)
+                if attempt == retries or not (unreachable or timeout):
+                    raise
+                logger.warning(
+                    "Transient error during submission, retrying in {}s: {}".format(delay, error))
+                time.sleep(delay)
+                delay *= 2
+                if not unreachable:
+                    # A submission that timed out may have been queued nonetheless, it
+                    # is only repeated if the scheduler does not report the cluster job.
+                    queued = _is_queued(scheduler, kwargs['_id'])
+                    if queued is None:
+                        raise
+                    if queued:
+                        logger.warning("The cluster job '{}' was queued despite the error.".format(
+                            kwargs['_id']))
+                        return True
+            else:
+                if result:
+                    # Later queries must report the submitted cluster job.
+                    scheduler._invalidate_cached_jobs()
+                return result
 
     @classmethod
     def add_args(cls, parser):
@@ -228,30 +348,40 @@ class TestEnvironment(ComputeEnvironment):
     the job submission script generation in environments without
     a real scheduler.
     """
-    scheduler_type = FakeScheduler
+    scheduler_type = _LazySchedulerType('fakescheduler', 'FakeScheduler')
 
 
 class SimpleSchedulerEnvironment(ComputeEnvironment):
     "An environment for the simple-scheduler scheduler."
-    scheduler_type = SimpleScheduler
+    scheduler_type = _LazySchedulerType('simple_scheduler', 'SimpleScheduler')
     template = 'simple_scheduler.sh'
+    detection_variables = ('PATH', 'SIMPLE_SCHEDULER')
+
+    @classmethod
+    def add_args(cls, parser):
+        super(SimpleSchedulerEnvironment, cls).add_args(parser)
+        parser.add_argument(
+            '--after',
+            type=str,
+            help="Schedule this job to be executed after "
+                 "completion of a cluster job with this id.")
 
 
 class TorqueEnvironment(ComputeEnvironment):
     "An environment with TORQUE scheduler."
-    scheduler_type = TorqueScheduler
+    scheduler_type = _LazySchedulerType('torque', 'TorqueScheduler')
     template = 'torque.sh'
 
 
 class SlurmEnvironment(ComputeEnvironment):
     "An environment with SLURM scheduler."
-    scheduler_type = SlurmScheduler
+    scheduler_type = _LazySchedulerType('slurm', 'SlurmScheduler')
     template = 'slurm.sh'
 
 
 class LSFEnvironment(ComputeEnvironment):
     "An environment with LSF scheduler."
-    scheduler_type = LSFScheduler
+    scheduler_type = _LazySchedulerType('lsf', 'LSFScheduler')
     template = 'lsf.sh'
 
 
@@ -372,6 +502,42 @@ def registered_environments(import_configured=True):
     return list(ComputeEnvironment.registry.values())
 
 
+def _environment_cache():
+    "Return the cache for the result of the environment detection."
+    ttl = flow_config.get_config_value('environment_cache_ttl', default=ENVIRONMENT_CACHE_TTL)
+    return FileCache(os.path.join(user_cache_dir(), 'environment'), float(ttl))
+
+
+def _environment_cache_key(env_types):
+    """Return the cache key of the environment detection for this host and user.
+
+    The key depends on the values of the detection variables of all environments.
+    """
+    try:
+        user = getpass.getuser()
+    except Exception:   # The user name cannot be determined on all systems.
+        user = ''
+    variables = sorted({var for env in env_types for var in env.detection_variables})
+    values = sha1(json.dumps([[var, os.environ.get(var)] for var in variables]).encode())
+    return '\n'.join([socket.gethostname(), user, values.hexdigest()] +
+                     [_env_name(env) for env in env_types])
+
+
+def _env_name(env_type):
+    return '{}.{}'.format(env_type.__module__, env_type.__name__)
+
+
+def invalidate_environment_cache():
+    """Invalidate the cached results of the environment detection.
+
+    The detected environment is cached for each host, user, set of registered
+    environments, and values of their detection variables, e.g., ``PATH``. The
+    time-to-live of the cache in seconds can be configured with the
+    ``flow.environment_cache_ttl`` configuration key; use 0 to disable caching.
+    """
+    _environment_cache().invalidate()
+
+
 def get_environment(test=False, import_configured=True):
     """Attempt to detect the present environment.
 
@@ -380,6 +546,9 @@ def get_environment(test=False, import_configured=True):
     first EnvironmentClass where the is_present() method returns
     True.
 
+    The result of the detection is cached for each host and user,
+    see also :func:`invalidate_environment_cache`.
+
     :param test:
         Return the TestEnvironment
     :type test:
@@ -415,11 +584,24 @@ def get_environment(test=False, import_configured=True):
                 logger.debug("Select environment '{}'; DEBUG=True.".format(env_type.__name__))
                 return env_type
 
+        # The detection is expensive, the result is therefore cached for each host and user.
+        cache = _environment_cache()
+        key = _environment_cache_key(env_types)
+        if cache.ttl > 0:
+            cached = cache.get(key)
+            for env_type in env_types:
+                if _env_name(env_type) == cached:
+                    logger.debug("Select environment '{}'; cached.".format(env_type.__name__))
+                    return env_type
+
         # Default selection:
         for env_type in reversed(env_types):
             if env_type.is_present():
                 logger.debug("Select environment '{}'; is present.".format(env_type.__name__))
-                return env_type
-
-        # Otherwise, just return a standard environment
-        return StandardEnvironment
+                break
+        else:
+            # Otherwise, just return a standard environment
+            env_type = StandardEnvironment
+        if cache.ttl > 0:
+            cache.set(key, _env_name(env_type))
+        return env_type
@@ -6,9 +6,14 @@
 http://www.doeleadershipcomputing.org/
 """
 from ..environment import DefaultLSFEnvironment, DefaultTorqueEnvironment
+from ..util.template_filters import pack_resource_sets
 
 import math
-from fractions import gcd
+
+try:
+    from math import gcd
+except ImportError:     # Python 2
+    from fractions import gcd
 
 
 class SummitEnvironment(DefaultLSFEnvironment):
@@ -29,6 +34,8 @@ class SummitEnvironment(DefaultLSFEnvironment):
     """
     hostname_pattern = r'.*\.summit\.olcf\.ornl\.gov'
     template = 'summit.sh'
+    cores_per_node = 42
+    gpus_per_node = 6
 
     @staticmethod
     def calc_num_nodes(resource_sets, cores_per_node, gpus_per_node):
@@ -70,6 +77,64 @@ class SummitEnvironment(DefaultLSFEnvironment):
         gpus_per_set //= factor
         return nsets, tasks_per_set, cpus_per_set, gpus_per_set
 
+    @staticmethod
+    def split_resource_set(resource_set, min_tasks=1):
+        """Split a resource set into the smallest identical resource sets.
+
+        Each of the smaller resource sets has at least min_tasks tasks.
+        """
+        nsets, tasks, cpus, gpus = resource_set
+        factor = gcd(tasks, gcd(cpus, gpus))
+        for k in range(factor, 1, -1):
+            if factor % k == 0 and tasks // k >= min_tasks:
+                return nsets * k, tasks // k, cpus // k, gpus // k
+        return resource_set
+
+    @staticmethod
+    def plan_resource_sets(operations, cores_per_node, gpus_per_node, parallel=False):
+        """Plan the resource sets and launch order of operations with the minimal number of nodes.
+
+        Each operation uses the resource sets determined with guess_resource_sets(),
+        unless splitting them into smaller resource sets that fit into the remaining
+        cores and GPUs of nodes reduces the number of nodes. Operations executed in
+        parallel are launched in the given order, unless launching operations with
+        larger resource sets first reduces the number of nodes, since jsrun places
+        resource sets on the first nodes with sufficient free resources.
+
+        :returns:
+            The number of nodes and a list of tuples of each operation and its
+            resource sets in the order in which operations are launched.
+        """
+        def num_nodes(plan):
+            if parallel:
+                return pack_resource_sets([rs for _, rs in plan],
+                                          cores_per_node, gpus_per_node, sort=False)
+            # Operations executed in sequence are placed on the nodes one at a time.
+            return max([pack_resource_sets([rs], cores_per_node, gpus_per_node)
+                        for _, rs in plan] or [0])
+
+        def largest_first(plan):
+            return sorted(plan, key=lambda entry: max(
+                entry[1][2] / float(cores_per_node), entry[1][3] / float(gpus_per_node)),
+                reverse=True)
+
+        guessed = [(op, SummitEnvironment.guess_resource_sets(op, cores_per_node, gpus_per_node))
+                   for op in operations]
+        split = [(op, SummitEnvironment.split_resource_set(rs, op.directives.get('rs_tasks', 1)))
+                 for op, rs in guessed]
+        candidates = [guessed, largest_first(guessed), split, largest_first(split)]
+        best = min(range(len(candidates)), key=lambda i: num_nodes(candidates[i]))
+        plan = candidates[best]
+        nn = num_nodes(plan)
+        if best >= 2:
+            # Keep the resource sets determined for each operation where possible.
+            shapes = dict(guessed)
+            for i, (op, rs) in enumerate(plan):
+                alternative = plan[:i] + [(op, shapes[op])] + plan[i + 1:]
+                if num_nodes(alternative) <= nn:
+                    plan = alternative
+        return nn, plan
+
     @staticmethod
     def jsrun_options(resource_set):
         nsets, tasks, cpus, gpus = resource_set
@@ -81,6 +146,7 @@ class SummitEnvironment(DefaultLSFEnvironment):
 
     filters = {'calc_num_nodes': calc_num_nodes.__func__,
                'guess_resource_sets': guess_resource_sets.__func__,
+               'plan_resource_sets': plan_resource_sets.__func__,
                'jsrun_options': jsrun_options.__func__,
                'jsrun_extra_args': jsrun_extra_args.__func__}
 
@@ -1,15 +1,12 @@
 # Copyright (c) 2018 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
-"""Definitions of Exception classes used in this package."""
+"""Definitions of Exception classes used in this package.
 
-try:
-    import jinja2
-    from jinja2.ext import Extension as Jinja2Extension
-except ImportError:
-    JINJA2 = False
-else:
-    JINJA2 = True
+The :class:`TemplateError` jinja2 extension is only defined on first access,
+so that jinja2 is not imported unless templates are actually rendered.
+"""
+import sys
 
 
 class ConfigKeyError(KeyError):
@@ -27,7 +24,16 @@ class NoSchedulerError(AttributeError):
     pass
 
 
-if JINJA2:
+def _template_error_class():
+    "Define the TemplateError jinja2 extension."
+    try:
+        import jinja2
+        from jinja2.ext import Extension as Jinja2Extension
+    except ImportError:
+        class TemplateError(Exception):     # mock class, should never be used
+            pass
+
+        return TemplateError
 
     class TemplateError(Jinja2Extension):
         """Indicates errors in jinja2 templates"""
@@ -43,6 +49,15 @@ if JINJA2:
         def err(self, msg, caller):
             raise jinja2.TemplateError(msg)
 
+    return TemplateError
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name == 'TemplateError':
+            global TemplateError
+            TemplateError = _template_error_class()
+            return TemplateError
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
 else:
-    class TemplateError(Exception):     # mock class, should never be used
-        pass
+    TemplateError = _template_error_class()
@@ -0,0 +1,70 @@
+# Copyright (c) 2019 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Hooks to observe the execution engine of a :class:`~.FlowProject`.
+
+Each project instance provides a :class:`Hooks` instance as its ``hooks``
+attribute. Callbacks are registered by appending them to the respective list,
+for example:
+
+.. code-block:: python
+
+    project = MyProject()
+    project.hooks.on_start.append(lambda operation: print('Starting', operation))
+
+The following events are available:
+
+    * ``on_start(operation)``: Before a job-operation is executed.
+    * ``on_success(operation, elapsed)``: After a job-operation was executed
+      without raising an exception.
+    * ``on_exception(operation, error, elapsed)``: After the execution of a
+      job-operation raised an exception.
+    * ``on_condition_evaluated(name, job, eligible, elapsed)``: After the
+      conditions of an operation were evaluated for a job.
+    * ``on_submit(_id, operations, status, elapsed)``: After a bundle of
+      job-operations was submitted to a scheduler.
+
+The ``elapsed`` argument is the wall time in seconds spent on the event. Hooks are
+called within the process that executes the operation, that means within the worker
+processes for parallelized execution.
+"""
+import time
+from contextlib import contextmanager
+
+
+class Hooks(object):
+    "Collection of callbacks that are invoked on execution events."
+
+    _EVENTS = ('on_start', 'on_success', 'on_exception', 'on_condition_evaluated', 'on_submit')
+
+    def __init__(self):
+        for event in self._EVENTS:
+            setattr(self, event, list())
+
+    def __bool__(self):
+        return any(getattr(self, event) for event in self._EVENTS)
+
+    __nonzero__ = __bool__  # Python 2.7
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, ', '.join(
+            '{}={}'.format(event, getattr(self, event)) for event in self._EVENTS))
+
+    @contextmanager
+    def _observe(self, operation):
+        "Invoke the execution hooks for operation executed within this context."
+        for hook in self.on_start:
+            hook(operation)
+        start = time.time()
+        try:
+            yield
+        except Exception as error:
+            for hook in self.on_exception:
+                hook(operation, error, time.time() - start)
+            raise
+        else:
+            for hook in self.on_success:
+                hook(operation, time.time() - start)
+
+
+__all__ = ['Hooks']
@@ -11,13 +11,11 @@ import sys
 import argparse
 import logging
 import inspect
-from multiprocessing import Pool
 from functools import wraps
 
 from signac import get_project
 from signac.common import six
 
-from .util.tqdm import tqdm
 from .util.execution import fork
 
 
@@ -244,6 +242,10 @@ def run(parser=None):
     else:
         operation = operation_func
 
+    # Imported here to keep the import of this module light-weight.
+    from multiprocessing import Pool
+    from .util.tqdm import tqdm
+
     # Serial execution
     if args.np == 1 or len(jobs) < 2:
         if args.timeout is not None:
@@ -25,26 +25,22 @@ import datetime
 import json
 import inspect
 import functools
+import time
+import math
+import subprocess
+import uuid
 import contextlib
 from collections import defaultdict
 from collections import OrderedDict
 from itertools import islice
 from itertools import count
 from hashlib import sha1
-from multiprocessing import Pool
-from multiprocessing import cpu_count
-from multiprocessing import TimeoutError
-from multiprocessing.pool import ThreadPool
-from multiprocessing import Event
 
 import signac
 from signac.common import six
 from signac.contrib.hashing import calc_id
 from signac.contrib.filterparse import parse_filter_arg
 
-import jinja2
-from jinja2 import TemplateNotFound as Jinja2TemplateNotFound
-
 from .environment import get_environment
 from .scheduling.base import ClusterJob
 from .scheduling.base import JobStatus
@@ -52,9 +48,6 @@ from .scheduling.status import update_status
 from .errors import SubmitError
 from .errors import ConfigKeyError
 from .errors import NoSchedulerError
-from .errors import TemplateError
-from .util import tabulate
-from .util.tqdm import tqdm
 from .util.misc import _positive_int
 from .util.misc import _mkdir_p
 from .util.misc import draw_progressbar
@@ -67,11 +60,21 @@ from .util.progressbar import with_progressbar
 from .util.translate import abbreviate
 from .util.translate import shorten
 from .util.execution import fork
+from .util.execution import fork_with_usage
 from .util.execution import TimeoutExpired
+from .util.profiling import ProfileStore
+from .util.profiling import usage_record
+from .util.lease import LeaseManager
+from .util.memoize import MemoCache
+from .util.registry import BundleRegistry
+from .util.workqueue import WorkQueue
+from .util.cache import template_bytecode_cache
+from .util.cache import user_cache_dir
 from .labels import label
 from .labels import staticlabel
 from .labels import classlabel
 from .labels import _is_label_func
+from .hooks import Hooks
 from . import legacy
 from .util import config as flow_config
 
@@ -101,6 +104,40 @@ For example: {{ project.get_id() | captialize }}.
 The available filters are:
 {filters}"""
 
+# The default maximum number of concurrent submissions.
+SUBMIT_MAX_IN_FLIGHT = 4
+
+# The default time in seconds after which bundles whose scheduler jobs are no
+# longer reported are removed from the bundle registry.
+BUNDLE_GC_GRACE = 24 * 3600
+
+# The default time in seconds that is reserved at the end of the walltime of a
+# worker, within which the worker does not start any further operations.
+WORKER_WALLTIME_MARGIN = 300
+
+# The time in seconds a worker waits for operations claimed by other workers.
+WORKER_POLL_INTERVAL = 10
+
+# The default factor by which the estimated duration of a bundle is multiplied
+# to determine its walltime.
+WALLTIME_SAFETY_FACTOR = 1.2
+
+# The maximum factor by which the interval of the submission daemon is increased
+# after consecutive failures.
+DAEMON_MAX_BACKOFF = 16
+
+
+def _for_each_job(condition):
+    """Make a condition of a single job applicable to aggregates of jobs.
+
+    The returned condition is met for a tuple of jobs if it is met for all jobs.
+    """
+    def wrapper(job):
+        if isinstance(job, tuple):
+            return all(condition(j) for j in job)
+        return condition(job)
+    return wrapper
+
 
 class _condition(object):
 
@@ -109,15 +146,18 @@ class _condition(object):
 
     @classmethod
     def isfile(cls, filename):
-        return cls(lambda job: job.isfile(filename))
+        condition = _for_each_job(lambda job: job.isfile(filename))
+        # The file name is used to determine the input and output files of an operation.
+        condition._flow_filename = filename
+        return cls(condition)
 
     @classmethod
     def true(cls, key):
-        return cls(lambda job: job.document.get(key, False))
+        return cls(_for_each_job(lambda job: job.document.get(key, False)))
 
     @classmethod
     def false(cls, key):
-        return cls(lambda job: not job.document.get(key, False))
+        return cls(_for_each_job(lambda job: not job.document.get(key, False)))
 
     @classmethod
     def always(cls, func):
@@ -132,6 +172,17 @@ class _condition(object):
         return cls(lambda job: not condition(job))
 
 
+def _metacondition(other_func, metacondition):
+    """Adapt a metacondition on the conditions of other_func.
+
+    The conditions of operations that are not aggregate operations are evaluated
+    for each job when the metacondition is evaluated for an aggregate.
+    """
+    if getattr(other_func, '_flow_aggregate', False):
+        return metacondition
+    return _for_each_job(metacondition)
+
+
 class _pre(_condition):
 
     def __call__(self, func):
@@ -146,7 +197,7 @@ class _pre(_condition):
         def metacondition(job):
             pre_conditions = getattr(other_func, '_flow_pre', list())
             return all(c(job) for c in pre_conditions)
-        return cls(metacondition)
+        return cls(_metacondition(other_func, metacondition))
 
     @classmethod
     def after(cls, other_func):
@@ -154,7 +205,9 @@ class _pre(_condition):
         def metacondition(job):
             post_conditions = getattr(other_func, '_flow_post', list())
             return all(c(job) for c in post_conditions)
-        return cls(metacondition)
+        condition = _metacondition(other_func, metacondition)
+        condition._flow_after = other_func   # used to chain submissions
+        return cls(condition)
 
 
 class _post(_condition):
@@ -174,7 +227,12 @@ class _post(_condition):
         def metacondition(job):
             post_conditions = getattr(other_func, '_flow_post', list())
             return all(c(job) for c in post_conditions)
-        return cls(metacondition)
+        return cls(_metacondition(other_func, metacondition))
+
+
+def _declared_files(conditions):
+    "Return the file names of all conditions created with the isfile() condition."
+    return [c._flow_filename for c in conditions or () if hasattr(c, '_flow_filename')]
 
 
 def make_bundles(operations, size=None):
@@ -193,6 +251,188 @@ def make_bundles(operations, size=None):
             break
 
 
+def fit_bundles(operations, walltime, duration):
+    """Bundle operations such that each bundle completes within the walltime.
+
+    The operations of each bundle are assumed to be executed in sequence. They
+    are assigned in the order of decreasing duration to the first bundle with
+    sufficient remaining walltime (first-fit decreasing), which minimizes the
+    number of bundles. An operation whose duration exceeds the walltime by
+    itself is bundled on its own.
+
+    :param operations:
+        The operations to bundle.
+    :param walltime:
+        The maximum duration of a bundle in seconds.
+    :type walltime:
+        float
+    :param duration:
+        A function that returns the expected duration of an operation in seconds.
+    :type duration:
+        callable
+    :returns:
+        The bundles of operations.
+    :rtype:
+        list
+    """
+    bundles = []    # pairs of remaining walltime and operations
+    for op in sorted(operations, key=duration, reverse=True):
+        d = duration(op)
+        for bundle in bundles:
+            if bundle[0] >= d:
+                bundle[0] -= d
+                bundle[1].append(op)
+                break
+        else:
+            if d > walltime:
+                logger.warning(
+                    "The estimated duration of operation '{}' exceeds the walltime.".format(op))
+            bundles.append([walltime - d, [op]])
+    return [ops for _, ops in bundles]
+
+
+# The directives that determine the resources and the OpenMP/MPI layout of an operation.
+_RESOURCE_DIRECTIVES = ('np', 'ngpu', 'nranks', 'omp_num_threads', 'processor_fraction')
+
+
+def _pack_size(cores, gpus, cores_per_node, gpus_per_node, utilization, max_nodes):
+    """Return the number of identical operations that are packed into one bundle.
+
+    The bundle size is chosen for the smallest number of nodes that reaches the
+    target utilization of the binding resource, or for the best utilization
+    that is possible on up to max_nodes nodes.
+    """
+    if (gpus and not gpus_per_node) or (cores <= 0 and not gpus):
+        return 1
+    best_utilization, best_size = 0, 1
+    for nodes in range(1, max_nodes + 1):
+        size = min(int(nodes * capacity // demand) for demand, capacity in
+                   ((cores, cores_per_node), (gpus, gpus_per_node)) if demand > 0)
+        if size == 0:
+            continue
+        usage = max(size * cores / float(nodes * cores_per_node),
+                    size * gpus / float(nodes * gpus_per_node) if gpus else 0)
+        if usage > best_utilization:
+            best_utilization, best_size = usage, size
+        if usage >= utilization:
+            break
+    return best_size
+
+
+def pack_bundles(operations, cores_per_node, gpus_per_node=0, utilization=0.9,
+                 max_nodes=8, duration=None):
+    """Pack operations into bundles that fill whole nodes when executed in parallel.
+
+    Operations are grouped by their resource directives ('np', 'ngpu', 'nranks',
+    'omp_num_threads', and 'processor_fraction'), such that all bundles are
+    homogeneous in their OpenMP/MPI layout. The operations of each group are
+    packed into bundles that occupy the cores and GPUs of one or more nodes,
+    where only MPI operations may span multiple nodes.
+
+    :param operations:
+        The operations to bundle.
+    :param cores_per_node:
+        The number of cores per node.
+    :type cores_per_node:
+        int
+    :param gpus_per_node:
+        The number of GPUs per node.
+    :type gpus_per_node:
+        int
+    :param utilization:
+        The target utilization of the nodes occupied by each bundle.
+    :type utilization:
+        float
+    :param max_nodes:
+        The maximum number of nodes occupied by a bundle of MPI operations.
+    :type max_nodes:
+        int
+    :param duration:
+        A function that returns the expected duration of an operation. The
+        operations of each group are bundled in the order of decreasing
+        duration, such that operations of similar duration share a bundle.
+    :type duration:
+        callable
+    :yields:
+        The bundles of operations.
+    """
+    groups = OrderedDict()
+    for op in operations:
+        key = tuple(dict.get(op.directives, name) for name in _RESOURCE_DIRECTIVES)
+        groups.setdefault(key, []).append(op)
+    for (np, ngpu, nranks, omp_num_threads, processor_fraction), ops in groups.items():
+        if duration is not None:
+            ops.sort(key=duration, reverse=True)
+        size = _pack_size(
+            cores=(np or 1) * (1 if processor_fraction is None else processor_fraction),
+            gpus=ngpu or 0, cores_per_node=cores_per_node, gpus_per_node=gpus_per_node or 0,
+            utilization=utilization, max_nodes=max_nodes if nranks else 1)
+        for i in range(0, len(ops), size):
+            yield ops[i:i + size]
+
+
+def _aggregate_jobs(aggregate, jobs):
+    """Group jobs according to the aggregate specification of an operation.
+
+    :param aggregate:
+        True to aggregate all jobs, an integer to aggregate batches of that size,
+        one or more (dotted) state point keys to aggregate jobs with identical
+        values, or a callable that returns the group key of a job.
+    :param jobs:
+        The jobs to group.
+    :returns:
+        A list of tuples of jobs; the jobs and groups are ordered deterministically.
+    """
+    jobs = sorted(jobs, key=lambda job: job.get_id())
+    if aggregate is True:
+        return [tuple(jobs)] if jobs else []
+    elif isinstance(aggregate, six.integer_types):
+        return [tuple(jobs[i:i + aggregate]) for i in range(0, len(jobs), aggregate)]
+    elif isinstance(aggregate, (six.string_types, list, tuple)):
+        keys = [aggregate] if isinstance(aggregate, six.string_types) else aggregate
+
+        def get(sp, key):
+            for k in key.split('.'):
+                sp = sp.get(k) if isinstance(sp, dict) else None
+            return sp
+
+        def group_key(job):
+            sp = job.statepoint()
+            return json.dumps([get(sp, key) for key in keys], sort_keys=True)
+    else:
+        group_key = aggregate
+    groups = OrderedDict()
+    for job in jobs:
+        groups.setdefault(group_key(job), []).append(job)
+    return [tuple(group) for group in groups.values()]
+
+
+def _walltime_in_seconds(walltime):
+    "Convert a walltime in hours or as instance of datetime.timedelta to seconds."
+    if isinstance(walltime, datetime.timedelta):
+        return walltime.total_seconds()
+    return float(walltime) * 3600
+
+
+class _TemplateStream(object):
+    """A script that is rendered from a template while it is iterated over.
+
+    The rendered chunks are generated one at a time, such that large scripts
+    can be written without holding them in memory as a whole. The template
+    is rendered anew on each iteration, e.g., when a submission is retried.
+    """
+
+    def __init__(self, template, context):
+        self._template = template
+        self._context = context
+
+    def __iter__(self):
+        return iter(self._template.generate(** self._context))
+
+    def __str__(self):
+        return ''.join(self)
+
+
 class JobOperation(object):
     """This class represents the information needed to execute one operation for one job.
 
@@ -253,7 +493,7 @@ class JobOperation(object):
         # Evaluate strings and callables for job:
         def evaluate(value):
             if value and callable(value):
-                return value(job)
+                return value(self._argument)
             elif isinstance(value, six.string_types):
                 return value.format(job=job)
             else:
@@ -266,6 +506,20 @@ class JobOperation(object):
             {key: evaluate(value) for key, value in directives.items()})
         self.directives._keys_set_by_user = keys_set_by_user
 
+    @property
+    def jobs(self):
+        "The tuple of jobs associated with this operation."
+        return (self.job,)
+
+    @property
+    def _argument(self):
+        "The argument passed to the operation function and directive callables."
+        return self.job
+
+    def _jobs_id(self):
+        "Return an id that identifies the jobs associated with this operation."
+        return self.job.get_id()
+
     def __str__(self):
         return "{}({})".format(self.name, self.job)
 
@@ -283,7 +537,7 @@ class JobOperation(object):
 
         # The full name is designed to be truly unique for each job-operation.
         full_name = '{}%{}%{}%{}'.format(
-            project.root_directory(), self.job.get_id(), self.name, index)
+            project.root_directory(), self._jobs_id(), self.name, index)
 
         # The job_op_id is a hash computed from the unique full name.
         job_op_id = calc_id(full_name)
@@ -298,7 +552,7 @@ class JobOperation(object):
             raise ValueError("Value for MAX_LEN_ID is too small ({}).".format(self.MAX_LEN_ID))
 
         readable_name = '{}/{}/{}/{:04d}/'.format(
-            str(project)[:12], str(self.job)[:8], self.name[:12], index)[:max_len]
+            str(project)[:12], self._jobs_id()[:8], self.name[:12], index)[:max_len]
 
         # By appending the unique job_op_id, we ensure that each id is truly unique.
         return readable_name + job_op_id
@@ -322,6 +576,112 @@ class JobOperation(object):
             return JobStatus.unknown
 
 
+class AggregateJobOperation(JobOperation):
+    """This class represents the information needed to execute one operation for an aggregate.
+
+    An aggregate operation is executed once for a group of jobs, the operation
+    function and all directive callables are called with the tuple of jobs.
+
+    .. note::
+
+        This class is used by the :class:`~.FlowProject` class for the execution and
+        submission process and should not be instantiated by users themselves.
+
+    :param name:
+        The name of the operation.
+    :type name:
+        str
+    :param jobs:
+        The jobs associated with this operation.
+    :type jobs:
+        Sequence of :py:class:`signac.Job`.
+    :param cmd:
+        The command that executes this operation.
+    :type cmd:
+        str
+    :param directives:
+        A dictionary of additional parameters that provide instructions on how
+        to execute this operation, e.g., specifically required resources.
+    :type directives:
+        :class:`dict`
+    """
+
+    def __init__(self, name, jobs, cmd, directives=None, np=None):
+        self._jobs = tuple(jobs)
+        if not self._jobs:
+            raise ValueError("An aggregate operation requires at least one job.")
+        super(AggregateJobOperation, self).__init__(
+            name, self._jobs[0], cmd, directives=directives, np=np)
+
+    @property
+    def jobs(self):
+        return self._jobs
+
+    @property
+    def _argument(self):
+        return self._jobs
+
+    def _jobs_id(self):
+        if len(self._jobs) == 1:
+            return self.job.get_id()
+        return calc_id(sorted(job.get_id() for job in self._jobs))
+
+    def __str__(self):
+        if len(self._jobs) == 1:
+            return super(AggregateJobOperation, self).__str__()
+        return "{}({}+{})".format(self.name, self.job, len(self._jobs) - 1)
+
+    def __repr__(self):
+        return "{type}(name='{name}', jobs={jobs}, cmd={cmd}, directives={directives})".format(
+            type=type(self).__name__,
+            name=self.name,
+            jobs=[str(job) for job in self._jobs],
+            cmd=repr(self.cmd),
+            directives=self.directives)
+
+
+class _FusedJobOperation(JobOperation):
+    """Represents the execution of several job-operations with one 'exec' command.
+
+    The fused operations must have identical directives, which are shared by the
+    fused operation unless provided explicitly.
+    """
+
+    def __init__(self, operations, cmd, directives=None):
+        self.operations = list(operations)
+        first = self.operations[0]
+        self.name = first.name
+        self.job = first.job
+        self.cmd = cmd
+        self.directives = first.directives if directives is None else directives
+        for op in self.operations:
+            # Keys used by the template engine are tracked for all fused operations.
+            op.directives._keys_used = self.directives._keys_used
+
+    def __str__(self):
+        names = OrderedDict.fromkeys(op.name for op in self.operations)
+        jobs = OrderedDict.fromkeys(op.job for op in self.operations)
+        if len(jobs) == 1:
+            return "{}({})".format('+'.join(names), self.job)
+        return "{}({}+{})".format('+'.join(names), self.job, len(jobs) - 1)
+
+
+class _PilotOperation(object):
+    """Represents the execution of a worker that executes job-operations from the work queue.
+
+    The pilot operation provides the attributes of a :class:`.JobOperation` that are
+    used by the templates to generate the submission script.
+    """
+    name = 'worker'
+
+    def __init__(self, cmd, directives):
+        self.cmd = cmd
+        self.directives = directives
+
+    def __str__(self):
+        return self.name
+
+
 class FlowCondition(object):
     """A FlowCondition represents a condition as a function of a signac job.
 
@@ -487,8 +847,8 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
     def __init__(self, config=None, environment=None):
         super(FlowProject, self).__init__(config=config)
 
-        # Associate this class with a compute environment.
-        self._environment = environment or get_environment()
+        # Associate this class with a compute environment, which is detected on first use.
+        self._environment_ = environment
 
         # The standard local template directory is a directory called 'templates' within
         # the project root directory. This directory may be specified with the 'template_dir'
@@ -497,6 +857,9 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             self.root_directory(), self._config.get('template_dir', 'templates'))
         self._template_environment_ = dict()
 
+        # Callbacks invoked on execution events, see also: :class:`~.hooks.Hooks`.
+        self.hooks = Hooks()
+
         # Register all label functions with this project instance.
         self._label_functions = OrderedDict()
         self._register_labels()
@@ -504,6 +867,8 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         # Register all operation functions with this project instance.
         self._operation_functions = dict()
         self._operations = OrderedDict()
+        self._aggregates = dict()
+        self._operation_names = defaultdict(list)   # function -> operation names
         self._register_operations()
 
         # Enable the use of buffered mode for certain functions
@@ -512,6 +877,21 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         except KeyError:
             self._use_buffered_mode = False
 
+        # Job-operations are claimed with leases prior to execution to prevent that
+        # concurrently running processes execute the same job-operations.
+        try:
+            lease_ttl = self.config['flow'].as_float('lease_ttl')
+        except KeyError:
+            lease_ttl = None
+        self._leases = LeaseManager(os.path.join(self.root_directory(), '.leases'), lease_ttl)
+
+    @property
+    def _environment(self):
+        "The compute environment associated with this project."
+        if self._environment_ is None:
+            self._environment_ = get_environment()
+        return self._environment_
+
     def _setup_template_environment(self):
         """Setup the jinja2 template environemnt.
 
@@ -519,6 +899,9 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         and submit_operations() / submit() function and the corresponding command line
         sub commands.
         """
+        import jinja2
+        from .errors import TemplateError
+
         if self._config.get('flow') and self._config['flow'].get('environment_modules'):
             envs = self._config['flow'].as_list('environment_modules')
         else:
@@ -538,10 +921,13 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                      extra_packages +
                      [jinja2.PackageLoader('flow', 'templates')])
 
+        # Compiled templates are cached across processes and recompiled when
+        # the template source changes.
         template_environment = jinja2.Environment(
             loader=jinja2.ChoiceLoader(load_envs),
             trim_blocks=True,
-            extensions=[TemplateError])
+            extensions=[TemplateError],
+            bytecode_cache=template_bytecode_cache(os.path.join(user_cache_dir(), 'templates')))
 
         # Setup standard filters that can be used to format context variables.
         template_environment.filters['format_timedelta'] = tf.format_timedelta
@@ -549,6 +935,7 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         template_environment.filters['with_np_offset'] = tf.with_np_offset
         template_environment.filters['calc_tasks'] = tf.calc_tasks
         template_environment.filters['calc_num_nodes'] = tf.calc_num_nodes
+        template_environment.filters['pack_resource_sets'] = tf.pack_resource_sets
         template_environment.filters['check_utilization'] = tf.check_utilization
         template_environment.filters['homogeneous_openmp_mpi_config'] = \
             tf.homogeneous_openmp_mpi_config
@@ -758,14 +1145,24 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         "Return the canonical name to store bundle information."
         return os.path.join(self.root_directory(), '.bundles', bundle_id)
 
+    def _profile_store(self):
+        "Return the store for the execution profile records of this project."
+        return ProfileStore(os.path.join(self.root_directory(), '.profiles'))
+
+    def _bundle_registry(self):
+        "Return the registry of the operations of submitted bundles and job arrays."
+        return BundleRegistry(os.path.join(self.root_directory(), '.bundles', 'registry'))
+
+    def _work_queue(self):
+        "Return the queue of the job-operations that are executed by pilot jobs."
+        return WorkQueue(os.path.join(self.root_directory(), '.queue'))
+
     def _store_bundled(self, operations):
         """Store operation-ids as part of a bundle and return bundle id.
 
-        The operation identifiers are stored in a  text within a file
-        determined by the _fn_bundle() method.
-
-        This may be used to idenfity the status of individual operations
-        root directory. This is necessary to be able to identify each
+        The operation identifiers are stored in the bundle registry of the
+        project, which is used to identify the status of the individual
+        operations of a bundle.
 
         A single operation will not be stored, but instead the operation's
         id is directly returned.
@@ -782,24 +1179,127 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         if len(operations) == 1:
             return operations[0].get_id()
         else:
-            h = '.'.join(op.get_id() for op in operations)
-            bid = '{}/bundle/{}'.format(self, sha1(h.encode('utf-8')).hexdigest())
-            fn_bundle = self._fn_bundle(bid)
-            _mkdir_p(os.path.dirname(fn_bundle))
-            with open(fn_bundle, 'w') as file:
-                for operation in operations:
-                    file.write(operation.get_id() + '\n')
+            ids = [op.get_id() for op in operations]
+            bid = '{}/bundle/{}'.format(self, sha1('.'.join(ids).encode('utf-8')).hexdigest())
+            self._bundle_registry().add(bid, [ids])
             return bid
 
+    def _store_array(self, elements):
+        """Store the operation table of a job array and return the array id.
+
+        The table has one line per array element, which contains the ids of the
+        element's operations and the command to execute them separated by a tab.
+        The table is read by the submission script, the operation ids of each
+        element are also stored in the bundle registry.
+
+        :param elements:
+            The operations and the command of each array element.
+        :type elements:
+            A sequence of tuples of a sequence of :py:class:`.JobOperation` and str
+        :return:
+            The array id
+        :rtype:
+            str
+        """
+        ids = [[op.get_id() for op in ops] for ops, _ in elements]
+        lines = ['{}\t{}\n'.format(' '.join(ids_), cmd) for ids_, (_, cmd) in zip(ids, elements)]
+        aid = '{}/array/{}'.format(self, sha1(''.join(lines).encode('utf-8')).hexdigest())
+        fn_array = self._fn_bundle(aid)
+        _mkdir_p(os.path.dirname(fn_array))
+        with open(fn_array, 'w') as file:
+            file.writelines(lines)
+        self._bundle_registry().add(aid, ids)
+        return aid
+
+    def _read_legacy_bundle(self, bundle_id):
+        """Read the operation ids of a bundle that was stored in its own file.
+
+        :returns:
+            The operation ids of each element or None if the file does not exist.
+        """
+        try:
+            with open(self._fn_bundle(bundle_id)) as file:
+                return [line.split('\t', 1)[0].split() for line in file]
+        except (IOError, OSError):
+            return None
+
+    def _collect_bundles(self, registry, active):
+        """Remove expired bundles from the registry together with their files.
+
+        Bundles are removed once they were registered before the grace period and
+        are not referenced by any active scheduler job. The same applies to the
+        files of bundles that were stored before the registry was introduced.
+        The collection is skipped unless it is due, see
+        :py:meth:`.BundleRegistry.collection_due`.
+        """
+        grace = float(flow_config.get_config_value('bundle_gc_grace', default=BUNDLE_GC_GRACE))
+        if not registry.collection_due(grace):
+            return
+        for bid in registry.collect(grace, active):
+            if '/array/' in bid:
+                try:
+                    os.unlink(self._fn_bundle(bid))
+                except OSError:
+                    pass
+        legacy = os.path.dirname(self._fn_bundle('{}/bundle/'.format(self)))
+        if os.path.isdir(legacy):
+            threshold = time.time() - grace
+            for fn in os.listdir(legacy):
+                path = os.path.join(legacy, fn)
+                try:
+                    if '{}/bundle/{}'.format(self, fn) not in active and \
+                            os.path.getmtime(path) < threshold:
+                        os.unlink(path)
+                except OSError:
+                    pass
+            try:
+                os.rmdir(legacy)
+            except OSError:
+                pass    # The directory is not empty yet.
+
     def _expand_bundled_jobs(self, scheduler_jobs):
-        "Expand jobs which were submitted as part of a bundle."
+        """Expand jobs which were submitted as part of a bundle or job array.
+
+        The operations of the bundles are looked up in the bundle registry, which
+        is only read. Expired bundles that are not reported by the scheduler are
+        removed once all scheduler jobs were expanded.
+        Pilot jobs are expanded to the operations of the work queue that they
+        were submitted for.
+        """
+        prefixes = ('{}/bundle/'.format(self), '{}/array/'.format(self))
+        scheduler_jobs = list(scheduler_jobs)
+        pilot_prefix = '{}/pilot/'.format(self)
+        pilots = defaultdict(list)
+        if any(job.name().startswith(pilot_prefix) for job in scheduler_jobs):
+            for key, value in self._work_queue().items():
+                for pilot in value[2]:
+                    pilots[pilot].append(key)
+        # The elements of a job array are named after the array and their index;
+        # a name without index refers to all elements.
+        active = {job.name().partition('[')[0] for job in scheduler_jobs
+                  if job.name().startswith(prefixes)}
+        registry = self._bundle_registry()
+        bundles = registry.lookup(active) if active else dict()
         for job in scheduler_jobs:
-            if job.name().startswith('{}/bundle/'.format(self)):
-                with open(self._fn_bundle(job.name())) as file:
-                    for line in file:
-                        yield ClusterJob(line.strip(), job.status())
+            if job.name().startswith(prefixes):
+                bid, _, index = job.name().partition('[')
+                if bid not in bundles:
+                    bundles[bid] = self._read_legacy_bundle(bid)
+                    if bundles[bid] is None:
+                        logger.warning("Unable to find the operations of bundle '{}'.".format(bid))
+                elements = bundles[bid] or []
+                if index:
+                    i = int(index.rstrip(']'))
+                    elements = elements[i - 1:i]
+                for ids in elements:
+                    for _id in ids:
+                        yield ClusterJob(_id, job.status())
+            elif job.name().startswith(pilot_prefix):
+                for _id in pilots.get(job.name(), ()):
+                    yield ClusterJob(_id, job.status())
             else:
                 yield job
+        self._collect_bundles(registry, active)
 
     def scheduler_jobs(self, scheduler):
         """Fetch jobs from the scheduler.
@@ -807,8 +1307,10 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         This function will fetch all scheduler jobs from the scheduler
         and also expand bundled jobs automatically.
 
-        However, this function will not automatically filter scheduler
-        jobs which are not associated with this project.
+        Schedulers which support it are only queried for the scheduler jobs
+        with names starting with the project's name prefix. However, this
+        function will not filter all scheduler jobs which are not associated
+        with this project.
 
         :param scheduler:
             The scheduler instance.
@@ -817,9 +1319,27 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         :yields:
             All scheduler jobs fetched from the scheduler instance.
         """
-        for sjob in self._expand_bundled_jobs(scheduler.jobs()):
+        for sjob in self._expand_bundled_jobs(self._query_scheduler(scheduler)):
             yield sjob
 
+    def _query_scheduler(self, scheduler, refresh=False):
+        """Query the scheduler for the cluster jobs of this project.
+
+        The names of all cluster jobs submitted for this project start with the
+        first twelve characters of the project name, which is used to filter the
+        cluster jobs where supported by the scheduler.
+
+        :param refresh:
+            If True, recent snapshots of the scheduler queue are not used, e.g.,
+            to count the queued cluster jobs prior to a submission.
+        """
+        prefix = str(self)[:12] if scheduler.query_by_prefix else None
+        if refresh:
+            scheduler._invalidate_cached_jobs(getattr(scheduler, 'user', None), prefix)
+        if prefix is None:
+            return scheduler.jobs()
+        return scheduler.jobs(prefix=prefix)
+
     @staticmethod
     def _map_scheduler_jobs(scheduler_jobs):
         "Map all scheduler jobs by job id and operation name."
@@ -829,21 +1349,67 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                 expanded = JobOperation.expand_id(name)
                 yield expanded['job_id'], expanded['operation-name'], sjob
 
-    def _get_operations_status(self, job, cached_status):
+    def _get_aggregate_status(self, jobs, cached_status, containing=None):
+        """Return the status of all aggregate operations for the aggregates formed by jobs.
+
+        :param containing:
+            Only determine the status of the aggregates that contain this job.
+        :returns:
+            A mapping of job ids to a list of (name, status) tuples of the aggregate
+            operations, the status is shared by all jobs of an aggregate.
+        """
+        result = defaultdict(list)
+        for job_op in self._aggregate_operations(jobs, False, containing):
+            flow_op = self._operations[job_op.name]
+            completed = flow_op.complete(job_op.jobs)
+            eligible = False if completed else flow_op.eligible(job_op.jobs)
+            status = {
+                'scheduler_status': cached_status.get(job_op.get_id(), JobStatus.unknown),
+                'eligible': eligible,
+                'completed': completed,
+            }
+            for job in job_op.jobs:
+                result[job.get_id()].append((job_op.name, status))
+        return result
+
+    def _get_operations_status(self, job, cached_status, aggregate_status=None):
         "Return a dict with information about job-operations for this job."
+        hooks = self.hooks.on_condition_evaluated
         for job_op in self._job_operations(job, False):
             flow_op = self.operations[job_op.name]
+            if hooks:
+                start = time.time()
             completed = flow_op.complete(job)
             eligible = False if completed else flow_op.eligible(job)
+            if hooks:
+                for hook in hooks:
+                    hook(job_op.name, job, eligible, time.time() - start)
             scheduler_status = cached_status.get(job_op.get_id(), JobStatus.unknown)
             yield job_op.name, {
                 'scheduler_status': scheduler_status,
                 'eligible': eligible,
                 'completed': completed,
             }
-
-    def get_job_status(self, job, ignore_errors=False, cached_status=None):
-        "Return a dict with detailed information about the status of a job."
+        if self._aggregates:
+            if aggregate_status is None:
+                # Only the conditions of the aggregates of this job are evaluated.
+                aggregate_status = self._get_aggregate_status(self, cached_status, job)
+            for name, status in aggregate_status.get(job.get_id(), ()):
+                yield name, dict(status)
+
+    def _update_status_with_leases(self, status):
+        "Mark all job-operations that are claimed by a lease as active."
+        for job_op_id in self._leases.active():
+            status[job_op_id] = int(max(status.get(job_op_id, JobStatus.unknown), JobStatus.active))
+
+    def get_job_status(self, job, ignore_errors=False, cached_status=None,
+                       _aggregate_status=None):
+        """Return a dict with detailed information about the status of a job.
+
+        The status of aggregate operations is determined for the aggregates formed
+        by all jobs of the project, unless provided with the private
+        ``_aggregate_status`` argument.
+        """
         result = dict()
         result['job_id'] = str(job)
         try:
@@ -852,7 +1418,9 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                     cached_status = self.document['_status']._as_dict()
                 except KeyError:
                     cached_status = dict()
-            result['operations'] = OrderedDict(self._get_operations_status(job, cached_status))
+                self._update_status_with_leases(cached_status)
+            result['operations'] = OrderedDict(
+                self._get_operations_status(job, cached_status, _aggregate_status))
             result['_operations_error'] = None
         except Exception as error:
             msg = "Error while getting operations status for job '{}': '{}'.".format(job, error)
@@ -901,17 +1469,26 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             row[2] += ' ' + self._alias('requires_attention')
         return row
 
-    def _fetch_scheduler_status(self, jobs=None, file=None, ignore_errors=False):
-        "Update the status docs."
+    def _fetch_scheduler_status(self, jobs=None, file=None, ignore_errors=False,
+                                scheduler_jobs=None):
+        """Update the status docs.
+
+        :param scheduler_jobs:
+            The jobs reported by the scheduler, which is queried if not provided.
+        """
+        from .util.tqdm import tqdm
+
         if file is None:
             file = sys.stderr
         if jobs is None:
             jobs = list(self)
         try:
-            scheduler = self._environment.get_scheduler()
+            if scheduler_jobs is None:
+                scheduler_jobs = self._query_scheduler(self._environment.get_scheduler())
 
             self.document.setdefault('_status', dict())
-            scheduler_info = {sjob.name(): sjob.status() for sjob in self.scheduler_jobs(scheduler)}
+            scheduler_info = {sjob.name(): sjob.status()
+                              for sjob in self._expand_bundled_jobs(scheduler_jobs)}
             status = dict()
             print(self._tr("Query scheduler..."), file=file)
             for job in tqdm(jobs,
@@ -919,6 +1496,8 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                             total=len(jobs), file=file):
                 for op in self._job_operations(job, only_eligible=False):
                     status[op.get_id()] = int(scheduler_info.get(op.get_id(), JobStatus.unknown))
+            for op in self._aggregate_operations(jobs, only_eligible=False):
+                status[op.get_id()] = int(scheduler_info.get(op.get_id(), JobStatus.unknown))
             self.document._status.update(status)
         except NoSchedulerError:
             logger.debug("No scheduler available.")
@@ -930,6 +1509,9 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             logger.info("Updated job status cache.")
 
     def _fetch_status(self, jobs, err, ignore_errors, no_parallelize):
+        from multiprocessing.pool import ThreadPool
+        from .util.tqdm import tqdm
+
         # Update the project's status cache
         self._fetch_scheduler_status(jobs, err, ignore_errors)
 
@@ -948,9 +1530,21 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             cached_status = self.document['_status']._as_dict()
         except KeyError:
             cached_status = dict()
+        self._update_status_with_leases(cached_status)
+        aggregate_status = None
+        if self._aggregates:
+            # The status of aggregate operations is determined once per aggregate.
+            try:
+                aggregate_status = self._get_aggregate_status(jobs, cached_status)
+            except Exception as error:
+                logger.debug("Error while getting aggregate operations status: '{}'.".format(error))
+                if not ignore_errors:
+                    raise
+                aggregate_status = dict()
         _get_job_status = functools.partial(self.get_job_status,
                                             ignore_errors=ignore_errors,
-                                            cached_status=cached_status)
+                                            cached_status=cached_status,
+                                            _aggregate_status=aggregate_status)
 
         with self._potentially_buffered():
             try:
@@ -1081,6 +1675,8 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         :type no_parallelize:
             bool
         """
+        from .util import tabulate
+
         if file is None:
             file = sys.stdout
         if err is None:
@@ -1121,7 +1717,7 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         # Generate status overview:
         if overview:
             print("# Overview:", file=file)
-            print("{} {}\n".format(self._tr("Total # of jobs:"), len(statuses), file=file))
+            print("{} {}\n".format(self._tr("Total # of jobs:"), len(statuses)), file=file)
 
             # Draw progress bars
             progress = defaultdict(int)
@@ -1339,6 +1935,49 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             for a in sorted(abbreviate.table):
                 print('{}: {}'.format(a, abbreviate.table[a]), file=file)
 
+    def print_profile(self, names=None, slowest=10, file=None):
+        """Print a summary of the recorded execution profiles of this project.
+
+        The wall time of each executed job-operation is summarized per operation
+        in terms of the median (p50), the 95th percentile (p95), and the maximum.
+        The max. resident set size (RSS) is reported in kB.
+
+        :param names:
+            Only summarize the profiles of the operations with the given names.
+        :type names:
+            Sequence of :class:`str`
+        :param slowest:
+            The number of slowest job-operations to show.
+        :type slowest:
+            int
+        :param file:
+            Redirect all output to this file, defaults to sys.stdout.
+        """
+        from .util import tabulate
+
+        if file is None:
+            file = sys.stdout
+        store = self._profile_store()
+        summary = store.summary(names)
+        if not summary:
+            print("No profile records available.", file=file)
+            return
+
+        print("Execution profile:", file=file)
+        header = ['operation', 'count', 'failed', 'p50 [s]', 'p95 [s]', 'max [s]', 'max RSS [kB]']
+        rows = [[name, s['count'], s['failed'], s['p50'], s['p95'], s['max'], s['maxrss']]
+                for name, s in sorted(summary.items())]
+        print(tabulate.tabulate(rows, headers=header, floatfmt='.2f'), file=file)
+
+        if slowest:
+            records = [r for r in store if names is None or r['op'] in names]
+            records.sort(key=lambda r: r['wall'], reverse=True)
+            header = ['job_id', 'operation', 'wall [s]', 'cpu [s]', 'max RSS [kB]', 'status']
+            rows = [[r['job'], r['op'], r['wall'], r.get('cpu'), r.get('maxrss'), r['status']]
+                    for r in records[:slowest]]
+            print("\nSlowest job-operations:", file=file)
+            print(tabulate.tabulate(rows, headers=header, floatfmt='.2f'), file=file)
+
     def run_operations(self, operations=None, pretend=False, np=None, timeout=None, progress=False):
         """Execute the next operations as specified by the project's workflow.
 
@@ -1368,6 +2007,10 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         :type progess:
             bool
         """
+        from multiprocessing import Pool
+        from multiprocessing import cpu_count
+        from .util.tqdm import tqdm
+
         if six.PY2 and timeout is not None:
             logger.warning(
                 "The timeout argument for run() is not supported for "
@@ -1421,10 +2064,15 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
 
     @staticmethod
     def _dumps_op(op):
+        if isinstance(op, AggregateJobOperation):
+            return (op.name, [job._id for job in op.jobs], op.cmd, op.directives)
         return (op.name, op.job._id, op.cmd, op.directives)
 
     def _loads_op(self, blob):
         name, job_id, cmd, directives = blob
+        if isinstance(job_id, list):
+            jobs = [self.open_job(id=_id) for _id in job_id]
+            return AggregateJobOperation(name, jobs, cmd, directives)
         return JobOperation(name, self.open_job(id=job_id), cmd, directives)
 
     def _run_operations_in_parallel(self, pool, pickle, operations, progress, timeout):
@@ -1444,24 +2092,73 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         except Exception as error:  # Masking all errors since they must be pickling related.
             raise self._PickleError(error)
 
+        from .util.tqdm import tqdm
         results = [pool.apply_async(_fork_with_serialization, task) for task in s_tasks]
 
         for result in tqdm(results) if progress else results:
             result.get(timeout=timeout)
 
     def _fork(self, operation, timeout=None):
-        logger.info("Execute operation '{}'...".format(operation))
+        job_op_id = operation.get_id()
+        if not self._leases.acquire(job_op_id):
+            logger.info("Skip operation '{}', which is claimed by another process.".format(
+                operation))
+            return
+        try:
+            logger.info("Execute operation '{}'...".format(operation))
+
+            # Execute without forking if possible...
+            direct = timeout is None and operation.name in self._operation_functions and \
+                operation.directives.get('executable', sys.executable) == sys.executable
+            if self.hooks:
+                with self.hooks._observe(operation):
+                    self._execute_operation(operation, timeout, direct)
+            else:
+                self._execute_operation(operation, timeout, direct)
+        finally:
+            self._leases.release(job_op_id)
 
-        # Execute without forking if possible...
-        if timeout is None and operation.name in self._operation_functions and \
-                operation.directives.get('executable', sys.executable) == sys.executable:
+    def _execute_operation(self, operation, timeout=None, direct=False):
+        "Execute operation by calling the operation function directly or by forking."
+        if direct:
             logger.debug("Able to optimize execution of operation '{}'.".format(operation))
-            self._operation_functions[operation.name](operation.job)
-        else:   # need to fork
+            with self._profile_store().profile(operation.name, operation._jobs_id()):
+                self._call_operation_function(operation)
+        elif operation.name in self._operation_functions:
+            # The forked 'exec' command records the execution profile.
             fork(cmd=operation.cmd, timeout=timeout)
+        else:   # need to fork
+            with self._profile_store().profile(
+                    operation.name, operation._jobs_id(), forked=True) as record:
+                record['status'], usage = fork_with_usage(cmd=operation.cmd, timeout=timeout)
+                record.update(usage_record(usage))
+
+    def _call_operation_function(self, operation):
+        "Call the operation function, possibly restoring memoized outputs instead."
+        func = self._operation_functions[operation.name]
+        if not getattr(func, '_flow_memoize', False):
+            return func(operation._argument)
+
+        job = operation.job
+        inputs = _declared_files(getattr(func, '_flow_pre', None))
+        outputs = _declared_files(getattr(func, '_flow_post', None))
+        cache = MemoCache(os.path.join(self.root_directory(), '.memoize'))
+        try:
+            key = cache.key(operation.name, func, job, inputs)
+        except (IOError, OSError) as error:
+            logger.warning("Unable to memoize operation '{}': {}".format(operation, error))
+            return func(job)
+
+        if cache.restore(key, outputs, job.workspace()):
+            if self._operations[operation.name].complete(job):
+                logger.info("Restored outputs of operation '{}' from cache.".format(operation))
+                return
+        func(job)
+        if all(job.isfile(fn) for fn in outputs):
+            cache.store(key, outputs, job.workspace())
 
     def run(self, jobs=None, names=None, pretend=False, np=None, timeout=None, num=None,
-            num_passes=1, progress=False):
+            num_passes=1, progress=False, order=None):
         """Execute all pending operations for the given selection.
 
         This function will run in an infinite loop until all pending operations
@@ -1513,6 +2210,12 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             Show a progress bar during execution.
         :type progess:
             bool
+        :param order:
+            The policy for the execution order of the operations within each pass,
+            either 'lpt', 'priority', or a callable that returns the priority of a
+            job-operation.
+        :type order:
+            str or callable
         """
         # If no jobs argument is provided, we run operations for all jobs.
         if jobs is None:
@@ -1535,11 +2238,16 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         def log(msg, lvl=logging.INFO):
             messages.append((msg, lvl))
 
+        from multiprocessing import Event
         reached_execution_limit = Event()
 
         def select(operation):
-            if operation.job not in self:
-                log("Job '{}' is no longer part of the project.".format(operation.job))
+            for job in operation.jobs:
+                if job not in self:
+                    log("Job '{}' is no longer part of the project.".format(job))
+                    return False
+            if not pretend and self._leases.claimed(operation.get_id()):
+                log("Operation '{}' is claimed by another process.".format(operation))
                 return False
             if num is not None and select.total_execution_count >= num:
                 reached_execution_limit.set()
@@ -1588,11 +2296,102 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                     del messages[:]     # clear
             if not operations:
                 break   # No more pending operations or execution limits reached.
+            operations = self._order_operations(operations, order)
             logger.info(
                 "Executing {} operation(s) (Pass # {:02d})...".format(len(operations), i_pass))
             self.run_operations(operations, pretend=pretend,
                                 np=np, timeout=timeout, progress=progress)
 
+    def _queued_operation(self, value):
+        "Construct the job-operation of an item of the work queue."
+        name, job_ids = value[:2]
+        flow_op = self._operations[name]
+        jobs = [self.open_job(id=_id) for _id in job_ids]
+        if name in self._aggregates:
+            return AggregateJobOperation(
+                name, jobs, cmd=flow_op(tuple(jobs)), directives=flow_op.directives)
+        return JobOperation(name, jobs[0], cmd=flow_op(jobs[0]), directives=flow_op.directives)
+
+    def work(self, walltime=None, timeout=None):
+        """Execute the job-operations of the work queue until the queue is exhausted.
+
+        This function is executed by the pilot jobs submitted with ``submit --pilot``.
+        Each queued job-operation is claimed with a lease prior to execution, such
+        that any number of workers on different nodes can share the queue.
+        Job-operations that are complete, or whose job no longer exists, are removed
+        from the queue; job-operations that are not eligible yet remain queued, while
+        other workers execute operations that may make them eligible.
+
+        :param walltime:
+            The walltime of the worker in hours or as instance of datetime.timedelta.
+            Job-operations whose estimated duration exceeds the remaining walltime,
+            reduced by the ``flow.worker_walltime_margin`` (default: 300 seconds),
+            are not started.
+        :param timeout:
+            An optional timeout for each operation in seconds after which execution will
+            be cancelled.
+        :type timeout:
+            int
+        :returns:
+            The number of executed job-operations.
+        :rtype:
+            int
+        """
+        queue = self._work_queue()
+        deadline = None
+        if walltime is not None:
+            margin = float(flow_config.get_config_value(
+                'worker_walltime_margin', default=WORKER_WALLTIME_MARGIN))
+            deadline = time.time() + _walltime_in_seconds(walltime) - margin
+        estimate = self._estimate_duration_function()
+
+        executed, failed = 0, []
+        while True:
+            progress = waiting = False
+            for key, value in queue.items():
+                if not self._leases.acquire(key):
+                    waiting = True  # claimed by another worker
+                    continue
+                try:
+                    try:
+                        operation = self._queued_operation(value)
+                    except LookupError:
+                        logger.warning(
+                            "Removing '{}' from the work queue, the operation or job "
+                            "no longer exists.".format(key))
+                        queue.remove(key)
+                        continue
+                    flow_op = self._operations[operation.name]
+                    if flow_op.complete(operation._argument):
+                        queue.remove(key)
+                        continue
+                    if not flow_op.eligible(operation._argument):
+                        continue
+                    if deadline is not None and time.time() + estimate(operation) > deadline:
+                        continue
+                    try:
+                        self._fork(operation, timeout)
+                    except Exception as error:
+                        logger.error("Execution of operation '{}' failed: {}".format(
+                            operation, error))
+                        failed.append(str(operation))
+                    queue.remove(key)
+                    executed += 1
+                    progress = True
+                finally:
+                    self._leases.release(key)
+            if deadline is not None and time.time() > deadline:
+                logger.info("Stopping worker, the walltime is nearly exhausted.")
+                break
+            if not progress:
+                if not waiting:
+                    break
+                time.sleep(WORKER_POLL_INTERVAL)
+        if failed:
+            raise RuntimeError("The execution of {} of {} operation(s) failed: {}".format(
+                len(failed), executed, ', '.join(failed)))
+        return executed
+
     def _generate_operations(self, cmd, jobs, requires=None):
         "Generate job-operations for a given 'direct' command."
         for job in jobs:
@@ -1601,6 +2400,59 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             cmd_ = cmd.format(job=job)
             yield JobOperation(name=cmd_.replace(' ', '-'), cmd=cmd_, job=job)
 
+    def _estimate_duration_function(self):
+        """Return a function that estimates the duration of a job-operation in seconds.
+
+        The estimate is based on the 'cost' directive (in seconds), the recorded wall
+        times of previous executions of the same job-operation or operation, or the
+        'walltime' directive (in hours), in that order. Job-operations without any
+        estimate are assigned a duration of zero.
+        """
+        medians, latest = self._profile_store().estimates()
+
+        def estimate(operation):
+            cost = operation.directives.get('cost')
+            if cost is not None:
+                return float(cost)
+            try:
+                return latest[(operation.name, operation._jobs_id())]
+            except KeyError:
+                pass
+            if operation.name in medians:
+                return medians[operation.name]
+            walltime = operation.directives.get('walltime')
+            if walltime is not None:
+                return _walltime_in_seconds(walltime)
+            return 0
+
+        return estimate
+
+    def _order_operations(self, operations, order=None):
+        """Order the operations according to the given ordering policy.
+
+        The following policies are supported:
+
+            * 'lpt': Longest estimated processing time first.
+            * 'priority': Highest priority first as set with the job document's
+              'priority' key; the default priority is zero.
+            * A callable, which is called with the job-operation as argument and
+              returns its priority; highest priority first.
+
+        The relative order of operations with equal rank is preserved.
+        """
+        if order is None:
+            return operations
+        if callable(order):
+            key = order
+        elif order == 'lpt':
+            key = self._estimate_duration_function()
+        elif order == 'priority':
+            def key(operation):
+                return operation.job.document.get('priority', 0)
+        else:
+            raise ValueError("Unknown ordering policy '{}'.".format(order))
+        return sorted(operations, key=key, reverse=True)
+
     def _get_pending_operations(self, jobs, operation_names=None):
         "Get all pending operations for the given selection."
         assert not isinstance(operation_names, six.string_types)
@@ -1625,7 +2477,71 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         else:
             yield
 
-    def script(self, operations, parallel=False, template='script.sh', show_template_help=False):
+    def _fuse_operations(self, operations, parallel=False):
+        """Combine the execution of operation functions into fewer 'exec' commands.
+
+        For serial execution, consecutive operations of the same job are fused into
+        one command that executes them in sequence, and consecutive commands for the
+        same operations of different jobs are combined into one command. For parallel
+        execution, all commands for the same operation are combined into one command
+        that distributes the jobs over a process pool. Only operations with identical
+        directives are combined, which avoids the repeated start-up cost of the
+        interpreter.
+        """
+        def prefix(op):
+            "Return the command of op without the job id or None if op cannot be fused."
+            if type(op) is not JobOperation or op.name not in self._operation_functions or \
+                    op.name in self._aggregates:
+                return None
+            suffix = ' ' + op.job.get_id()
+            return op.cmd[:-len(suffix)] if op.cmd.endswith(suffix) else None
+
+        # Each unit is a sequence of operations of one job that is executed in sequence.
+        units = []
+        for op in operations:
+            if not parallel and units and prefix(op) and prefix(units[-1][0]) and \
+                    op.job == units[-1][0].job and op.directives == units[-1][0].directives:
+                units[-1].append(op)
+            else:
+                units.append([op])
+
+        # Units with the same operations and directives are combined across jobs.
+        groups = []
+        for unit in units:
+            key = prefix(unit[0]), [op.name for op in unit]
+            # MPI operations, and GPU operations executed in parallel, are launched individually.
+            combinable = key[0] and not (unit[0].directives.get('nranks') or
+                                         (parallel and unit[0].directives.get('ngpu')))
+            for group in reversed(groups if combinable else ()):
+                if group[0] == key and group[1][0][0].directives == unit[0].directives:
+                    group[1].append(unit)
+                    break
+                if not parallel and any(u[0].job == unit[0].job for u in group[1]):
+                    # The order of the operations of the same job must be preserved.
+                    groups.append((key, [unit]))
+                    break
+            else:
+                groups.append((key, [unit]))
+
+        for (prefix_, names), group in groups:
+            if len(group) == 1 and len(group[0]) == 1:
+                yield group[0][0]
+                continue
+            cmd = ' '.join([prefix_] + [unit[0].job.get_id() for unit in group])
+            if len(names) > 1:
+                cmd += ' --then ' + ' '.join(names[1:])
+            directives = None
+            if parallel:
+                cmd += ' --parallel {}'.format(len(group))
+                # The fan-out requires the resources of all combined operations.
+                directives = TrackGetItemDict(group[0][0].directives)
+                directives['np'] = sum(_num_processes(unit[0].directives) for unit in group)
+                directives._keys_set_by_user = group[0][0].directives._keys_set_by_user
+            yield _FusedJobOperation(
+                [op for unit in group for op in unit], cmd=cmd, directives=directives)
+
+    def script(self, operations, parallel=False, template='script.sh', show_template_help=False,
+               fuse=False):
         """Generate a run script to execute given operations.
 
         :param operations:
@@ -1644,6 +2560,11 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             Show help related to the templating system and then exit.
         :type show_template_help:
             bool
+        :param fuse:
+            Combine operation functions into fewer 'exec' commands where possible
+            (see :meth:`~.FlowProject._fuse_operations`).
+        :type fuse:
+            bool
         """
         template_environment = self._template_environment()
         template = template_environment.get_template(template)
@@ -1651,14 +2572,27 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         # For script generation we do not need the extra logic used for
         # generating cluster job scripts.
         context['base_script'] = 'base_script.sh'
+        if fuse:
+            operations = self._fuse_operations(operations, parallel)
         context['operations'] = list(operations)
         context['parallel'] = parallel
         if show_template_help:
             self._show_template_help_and_exit(template_environment, context)
         return template.render(** context)
 
-    def _generate_submit_script(self, _id, operations, template, show_template_help, env, **kwargs):
-        """Generate submission script to submit the execution of operations to a scheduler."""
+    def _generate_submit_script(self, _id, operations, template, show_template_help, env,
+                                stream=False, fuse=False, **kwargs):
+        """Generate submission script to submit the execution of operations to a scheduler.
+
+        :param stream:
+            Return a script that is rendered while it is iterated over instead of a str.
+        :type stream:
+            bool
+        :param fuse:
+            Combine operation functions into fewer 'exec' commands where possible.
+        :type fuse:
+            bool
+        """
         if template is None:
             template = env.template
         assert _id is not None
@@ -1677,10 +2611,14 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         context['base_script'] = env.template
         context['environment'] = env.__name__
         context['id'] = _id
+        if fuse:
+            operations = self._fuse_operations(operations, kwargs.get('parallel'))
         context['operations'] = list(operations)
         context.update(kwargs)
         if show_template_help:
             self._show_template_help_and_exit(template_environment, context)
+        if stream:
+            return _TemplateStream(template, context)
         return template.render(** context)
 
     def submit_operations(self, operations, _id=None, env=None, parallel=False, flags=None,
@@ -1728,78 +2666,469 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         :return:
             Return the submission status after successful submission or None.
         """
+        return self._submit_operations(
+            operations, _id=_id, env=env, parallel=parallel, flags=flags, force=force,
+            template=template, pretend=pretend, show_template_help=show_template_help,
+            **kwargs)[0]
+
+    def _submit_operations(self, operations, _id=None, env=None, parallel=False, flags=None,
+                           force=False, template='script.sh', pretend=False,
+                           show_template_help=False, **kwargs):
+        """Submit a sequence of operations and return the status and the cluster job id.
+
+        The cluster job id is None if the scheduler does not report it; in pretend
+        mode, the bundle id stands in for the cluster job id.
+        """
         if _id is None:
             _id = self._store_bundled(operations)
         if env is None:
             env = self._environment
 
-        print("Submitting cluster job '{}':".format(_id), file=sys.stderr)
-
-        def _msg(op):
-            print(" - Operation: {}".format(op), file=sys.stderr)
-            return op
+        # The message is printed at once, since bundles may be submitted concurrently.
+        print('\n'.join(["Submitting cluster job '{}':".format(_id)] +
+                        [" - Operation: {}".format(op) for op in operations]), file=sys.stderr)
 
+        # The script is streamed into the submission file by schedulers that support
+        # it, which means that it is only rendered during the actual submission.
+        stream = not pretend and getattr(env.scheduler_type, 'stream_scripts', False)
         try:
             script = self._generate_submit_script(
                 _id=_id,
-                operations=map(_msg, operations),
+                operations=operations,
                 template=template,
                 show_template_help=show_template_help,
                 env=env,
+                stream=stream,
                 parallel=parallel,
                 force=force,
                 **kwargs
             )
+            if pretend:
+                print(script)
+                status, cluster_id = None, _id
+            else:
+                start = time.time()
+                cluster_id = env.submit(_id=_id, script=script, flags=flags, **kwargs)
+                status = JobStatus.submitted if cluster_id else None
+                if not isinstance(cluster_id, six.string_types):
+                    cluster_id = None
+                for hook in self.hooks.on_submit:
+                    hook(_id, operations, status, time.time() - start)
         except ConfigKeyError as error:
             raise SubmitError(
                 "Unable to submit, because of a configuration error.\n"
                 "The following key is missing: {key}.\n"
                 "You can add the key to the configuration for example with:\n\n"
                 "  $ signac config --global set {key} VALUE\n".format(key=str(error)))
-        else:
-            # Keys which were explicitly set by the user, but are not evaluated by the
-            # template engine are cause for concern and might hint at a bug in the template
-            # script or ill-defined directives. Here we check whether all directive keys that
-            # have been explicitly set by the user were actually evaluated by the template
-            # engine and warn about those that have not been.
-            keys_unused = {
-                key for op in operations for key in
-                op.directives._keys_set_by_user.difference(op.directives.keys_used)}
-            if keys_unused:
-                logger.warning(
-                    "Some of the keys provided as part of the directives were not used by "
-                    "the template script, including: {}".format(
-                        ', '.join(sorted(keys_unused))))
-            if pretend:
-                print(script)
+
+        # Keys which were explicitly set by the user, but are not evaluated by the
+        # template engine are cause for concern and might hint at a bug in the template
+        # script or ill-defined directives. Here we check whether all directive keys that
+        # have been explicitly set by the user were actually evaluated by the template
+        # engine and warn about those that have not been.
+        keys_unused = {
+            key for op in operations for key in
+            op.directives._keys_set_by_user.difference(op.directives.keys_used)}
+        if keys_unused:
+            logger.warning(
+                "Some of the keys provided as part of the directives were not used by "
+                "the template script, including: {}".format(
+                    ', '.join(sorted(keys_unused))))
+        return status, cluster_id
+
+    def _submit_bundles(self, bundles, max_in_flight=None, cluster_ids=None,
+                        bundle_walltime=None, **kwargs):
+        """Submit bundles of operations with concurrent submissions.
+
+        The generation of the submission scripts and the scheduler calls of up to
+        max_in_flight bundles overlap. After the first failed submission, no further
+        bundles are submitted and the error is raised once all concurrent submissions
+        have finished.
+
+        :param bundles:
+            The bundles of operations to submit.
+        :type bundles:
+            Iterable of sequences of :py:class:`.JobOperation`
+        :param max_in_flight:
+            The maximum number of concurrent submissions, defaults to the value of
+            the ``flow.submit_max_in_flight`` configuration key or 4.
+        :type max_in_flight:
+            int
+        :param cluster_ids:
+            A mapping that is updated with the cluster job id of each submitted
+            operation, if it is reported by the scheduler.
+        :type cluster_ids:
+            dict
+        :param bundle_walltime:
+            A function that returns the walltime of a bundle, which replaces the
+            walltime argument unless it returns None.
+        :type bundle_walltime:
+            callable
+        :param kwargs:
+            Keyword arguments forwarded to :py:meth:`~.submit_operations`.
+        :yields:
+            The operations of each submitted bundle and the submission status.
+        """
+        if max_in_flight is None:
+            max_in_flight = int(flow_config.get_config_value(
+                'submit_max_in_flight', default=SUBMIT_MAX_IN_FLIGHT))
+
+        def submit_operations(bundle):
+            walltime = bundle_walltime(bundle) if bundle_walltime else None
+            if walltime is None:
+                status, cluster_id = self._submit_operations(operations=bundle, **kwargs)
             else:
-                return env.submit(_id=_id, script=script, flags=flags, **kwargs)
+                status, cluster_id = self._submit_operations(
+                    operations=bundle, **dict(kwargs, walltime=walltime))
+            if cluster_ids is not None and cluster_id is not None:
+                for op in bundle:
+                    cluster_ids[op.get_id()] = cluster_id
+            return status
 
-    def submit(self, bundle_size=1, jobs=None, names=None, num=None, parallel=False,
-               force=False, walltime=None, env=None, **kwargs):
-        """Submit function for the project's main submit interface.
+        if max_in_flight <= 1 or kwargs.get('pretend') or kwargs.get('show_template_help'):
+            # Scripts that are printed to screen are submitted in order.
+            for bundle in bundles:
+                yield bundle, submit_operations(bundle)
+            return
 
-        .. versionchanged:: 0.6
+        from multiprocessing.pool import ThreadPool
+        from threading import Event
+        failed = Event()
+
+        def submit(bundle):
+            if failed.is_set():
+                return bundle, None, None
+            try:
+                return bundle, submit_operations(bundle), None
+            except Exception as error:
+                failed.set()
+                return bundle, None, error
+
+        errors = []
+        with contextlib.closing(ThreadPool(processes=max_in_flight)) as pool:
+            for bundle, status, error in pool.imap(submit, bundles):
+                if error is None:
+                    yield bundle, status
+                else:
+                    errors.append(error)
+        if errors:
+            raise errors[0]
+
+    def _chained_operations(self, jobs, scheduled):
+        """Determine the operations that are executed after scheduled operations.
+
+        An operation is chained if it has a ``pre.after()`` condition on a scheduled
+        operation of the same job and all of its other pre-conditions are either
+        met or also ``pre.after()`` conditions on scheduled operations.
 
-        :param bundle_size:
-            Specify the number of operations to be bundled into one submission, defaults to 1.
-        :type bundle_size:
-            int
         :param jobs:
-            Only submit operations associated with the provided jobs. Defaults to all jobs.
-        :type jobs:
-            Sequence of instances :class:`.Job`.
-        :param names:
-            Only submit operations with any of the given names, defaults to all names.
-        :type names:
-            Sequence of :class:`str`
-        :param num:
-            Limit the total number of submitted operations, defaults to no limit.
-        :type num:
-            int
-        :param parallel:
-            Execute all bundled operations in parallel. Has no effect without bundling.
-        :type parallel:
+            The jobs to determine chained operations for.
+        :param scheduled:
+            A mapping of job ids to a mapping of the names of scheduled operations
+            to their cluster job ids.
+        :yields:
+            The chained operations and the colon-separated cluster job ids of the
+            operations they depend on.
+        """
+        for job in jobs:
+            names = scheduled[job.get_id()]
+            for name, flow_op in self._operations.items():
+                if name in self._aggregates or name in names:
+                    continue
+                after = set()
+                for cond in flow_op._prereqs:
+                    other = getattr(cond._callback, '_flow_after', None)
+                    deps = [n for n in self._operation_names.get(other, ()) if n in names]
+                    if deps:
+                        after.update(names[n] for n in deps)
+                    elif not cond(job):
+                        break
+                else:
+                    if not after or flow_op.complete(job):
+                        continue
+                    job_op = JobOperation(
+                        name=name, job=job, cmd=flow_op(job), directives=flow_op.directives)
+                    if self.eligible_for_submission(job_op):
+                        yield job_op, ':'.join(sorted(after))
+
+    def _submit_chained(self, bundles, bundle_size=1, after=None, **kwargs):
+        """Submit bundles of operations together with all operations chained to them.
+
+        Operations that are declared to be executed after submitted operations of
+        the same job with ``pre.after()`` are submitted with a dependency on the
+        cluster jobs of those operations, which requires a scheduler that reports
+        cluster job ids. The chains are followed until no further operations depend
+        on the submitted ones; chained operations with the same dependencies are
+        bundled.
+
+        :yields:
+            The operations of each submitted bundle and the submission status.
+        """
+        scheduled = defaultdict(dict)
+        stages = [(after, bundles)]
+        while stages:
+            cluster_ids = dict()
+            jobs = OrderedDict()
+            for after, bundles in stages:
+                for bundle, status in self._submit_bundles(
+                        bundles, cluster_ids=cluster_ids, after=after, **kwargs):
+                    for op in bundle:
+                        if op.get_id() not in cluster_ids:
+                            if status is not None:
+                                logger.warning(
+                                    "Unable to chain operations to '{}', the scheduler did "
+                                    "not report a cluster job id.".format(op))
+                        elif op.name not in self._aggregates:
+                            scheduled[op.job.get_id()][op.name] = cluster_ids[op.get_id()]
+                            jobs[op.job.get_id()] = op.job
+                    yield bundle, status
+            groups = OrderedDict()
+            for op, after in self._chained_operations(jobs.values(), scheduled):
+                groups.setdefault(after, []).append(op)
+            stages = [(after, make_bundles(ops, bundle_size)) for after, ops in groups.items()]
+
+    def _queue_slots(self, scheduler_jobs, max_queued):
+        "Return the number of cluster jobs that may be submitted to reach max_queued."
+        num_queued = self._count_queued_cluster_jobs(scheduler_jobs)
+        slots = max(0, max_queued - num_queued)
+        logger.info("The scheduler reports {} queued or active cluster job(s) of this project, "
+                    "submitting up to {} more.".format(num_queued, slots))
+        return slots
+
+    def _count_queued_cluster_jobs(self, scheduler_jobs):
+        """Count the cluster jobs of this project that are submitted, held, queued, or active.
+
+        :param scheduler_jobs:
+            The jobs reported by the scheduler.
+        """
+        # The ids of job-operations start with the first twelve characters of the
+        # project name, the ids of bundles, job arrays, and pilot jobs with the full name.
+        prefixes = ('{}/'.format(self), '{}/'.format(str(self)[:12]))
+        return sum(1 for sjob in scheduler_jobs if sjob.name().startswith(prefixes) and
+                   JobStatus.submitted <= sjob.status() <= JobStatus.active)
+
+    def _store_submission_status(self, submissions):
+        """Store the status of submitted operations in one batch.
+
+        The status of all successful submissions is stored, even if a later
+        submission fails.
+
+        :param submissions:
+            The submitted operations and the submission status.
+        :type submissions:
+            Iterable of tuples of a sequence of :py:class:`.JobOperation` and
+            :py:class:`~.JobStatus`
+        :returns:
+            The number of successful submissions.
+        :rtype:
+            int
+        """
+        status = dict()
+        submitted = 0
+        try:
+            for operations, value in submissions:
+                if value is not None:  # operations were submitted, store status
+                    submitted += 1
+                    for op in operations:
+                        status[op.get_id()] = int(value)
+        finally:
+            if status:
+                self.document.setdefault('_status', dict())
+                self.document._status.update(status)
+        return submitted
+
+    def _bundle_operations(self, operations, bundle_size=1, pack=False, env=None,
+                           walltime=None):
+        """Bundle operations up for submission.
+
+        :param pack:
+            Pack the operations into bundles that fill whole nodes of the environment
+            according to their resource directives instead of fixed-size bundles.
+        :type pack:
+            bool
+        :param walltime:
+            Bundle operations whose duration can be estimated such that each bundle is
+            expected to complete within this walltime when its operations are executed
+            in sequence, instead of fixed-size bundles. The remaining operations are
+            bundled according to the bundle size. Has no effect in combination with pack.
+        :returns:
+            An iterator over the bundles.
+        """
+        if walltime is not None and not pack:
+            duration = self._estimate_duration_function()
+            operations = list(operations)
+            target = _walltime_in_seconds(walltime) / self._walltime_safety_factor()
+            bundles = fit_bundles([op for op in operations if duration(op)], target, duration)
+            return bundles + list(
+                make_bundles([op for op in operations if not duration(op)], bundle_size))
+        if not pack:
+            return make_bundles(operations, bundle_size)
+        if env is None:
+            env = self._environment
+        cores_per_node = getattr(env, 'cores_per_node', None)
+        if not cores_per_node:
+            raise SubmitError(
+                "Unable to pack operations, the number of cores per node of "
+                "environment '{}' is unknown.".format(env))
+        return pack_bundles(
+            operations, cores_per_node, getattr(env, 'gpus_per_node', 0),
+            duration=self._estimate_duration_function())
+
+    @staticmethod
+    def _walltime_safety_factor():
+        return float(flow_config.get_config_value(
+            'walltime_safety_factor', default=WALLTIME_SAFETY_FACTOR))
+
+    def _bundle_walltime_function(self, parallel=False):
+        """Return a function that estimates the walltime of a bundle of operations.
+
+        The walltime is the sum of the estimated durations of the operations of the
+        bundle, or their maximum for parallel execution, multiplied by the
+        ``flow.walltime_safety_factor`` (default: 1.2) and rounded up to full
+        minutes. The function returns None if the duration of any operation of the
+        bundle is unknown.
+        """
+        duration = self._estimate_duration_function()
+        factor = self._walltime_safety_factor()
+
+        def bundle_walltime(bundle):
+            durations = [duration(op) for op in bundle]
+            if not durations or not all(durations):
+                return None
+            seconds = factor * (max(durations) if parallel else sum(durations))
+            return datetime.timedelta(minutes=math.ceil(seconds / 60.0))
+
+        return bundle_walltime
+
+    def _submit_arrays(self, bundles, env=None, parallel=False, bundle_walltime=None, **kwargs):
+        """Submit bundles of operations as job arrays with one array element per bundle.
+
+        Bundles with identical resource requirements are submitted as one job array.
+        The submission script selects the operations of each element from the array's
+        operation table by the array index provided by the scheduler.
+
+        :yields:
+            The operations of each submitted job array and the submission status.
+        """
+        if env is None:
+            env = self._environment
+        array_index = env.get_scheduler().array_index_var
+        if array_index is None:
+            raise SubmitError(
+                "The scheduler of environment '{}' does not support job arrays.".format(env))
+
+        arrays = OrderedDict()
+        for bundle in bundles:
+            ops = list(self._fuse_operations(bundle, parallel) if kwargs.get('fuse') else bundle)
+            if any(dict.get(op.directives, 'nranks') for op in ops):
+                raise SubmitError(
+                    "Operations that require MPI can not be submitted as job arrays.")
+            if parallel:
+                cmd = ' & '.join(op.cmd for op in ops) + ' & wait'
+            else:
+                cmd = ' && '.join(op.cmd for op in ops)
+            if '\n' in cmd:
+                raise SubmitError(
+                    "Operations with multi-line commands can not be submitted as job arrays.")
+            # The resources requested for an array apply to each of its elements.
+            key = (len(ops) if parallel else None,
+                   tuple(sorted({repr(sorted(dict.items(op.directives))) for op in ops})))
+            arrays.setdefault(key, []).append((bundle, cmd))
+
+        for elements in arrays.values():
+            _id = self._store_array(elements)
+            print("Submitting job array '{}' with {} element(s).".format(_id, len(elements)),
+                  file=sys.stderr)
+            if bundle_walltime is not None:
+                # The walltime of an array applies to each of its elements.
+                walltimes = [bundle_walltime(bundle) for bundle, _ in elements]
+                if None not in walltimes:
+                    kwargs['walltime'] = max(walltimes)
+            status = self.submit_operations(
+                operations=elements[0][0], _id=_id, env=env, parallel=parallel,
+                array_size=len(elements), array_table=self._fn_bundle(_id),
+                array_index=array_index, **kwargs)
+            yield [op for bundle, _ in elements for op in bundle], status
+
+    def _submit_pilots(self, operations, num_pilots, env=None, walltime=None, pretend=False,
+                       **kwargs):
+        """Queue operations for execution by pilot jobs and submit the pilot jobs.
+
+        The operations are added to the work queue of the project, from which the
+        ``worker`` command of each pilot job claims and executes them until the
+        queue is exhausted or the walltime of the pilot job is nearly used up. The
+        pilot jobs request the resources of the most demanding queued operation.
+        Queued operations are eligible for submission again once none of their
+        pilot jobs is reported by the scheduler anymore.
+
+        :param num_pilots:
+            The number of pilot jobs to submit.
+        :type num_pilots:
+            int
+        :returns:
+            The number of submitted pilot jobs.
+        """
+        operations = list(operations)
+        if not operations:
+            return 0
+        if env is None:
+            env = self._environment
+        cmd = '{} {} worker'.format(sys.executable, inspect.getsourcefile(type(self)))
+        if walltime is not None:
+            cmd += ' --walltime {}'.format(_walltime_in_seconds(walltime) / 3600.0)
+        directives = TrackGetItemDict(
+            np=max(dict.get(op.directives, 'np') for op in operations),
+            ngpu=max(dict.get(op.directives, 'ngpu') for op in operations),
+            nranks=0, omp_num_threads=0, processor_fraction=1)
+        directives._keys_set_by_user = set()
+
+        # The items are queued prior to the submission of their pilot jobs, which may
+        # start immediately. Items are only considered queued while one of their
+        # pilot jobs is reported by the scheduler (see _expand_bundled_jobs()).
+        pilots = ['{}/pilot/{}'.format(self, uuid.uuid4().hex) for _ in range(num_pilots)]
+        if not pretend:
+            self._work_queue().put(
+                (op.get_id(), [op.name, [job.get_id() for job in op.jobs], pilots])
+                for op in operations)
+        print("Queued {} operation(s) for execution by {} pilot job(s).".format(
+            len(operations), num_pilots), file=sys.stderr)
+        submitted = 0
+        for _id in pilots:
+            status = self.submit_operations(
+                operations=[_PilotOperation(cmd, directives)], _id=_id, env=env,
+                walltime=walltime, pretend=pretend, **kwargs)
+            submitted += status is not None
+        if submitted:
+            self._store_submission_status([(operations, JobStatus.submitted)])
+        return submitted
+
+    def submit(self, bundle_size=1, jobs=None, names=None, num=None, parallel=False,
+               force=False, walltime=None, env=None, order=None, array=False, pack=False,
+               chain=False, pilot=None, auto_walltime=False, max_queued=None, fuse=False,
+               **kwargs):
+        """Submit function for the project's main submit interface.
+
+        .. versionchanged:: 0.6
+
+        :param bundle_size:
+            Specify the number of operations to be bundled into one submission, defaults to 1.
+        :type bundle_size:
+            int
+        :param jobs:
+            Only submit operations associated with the provided jobs. Defaults to all jobs.
+        :type jobs:
+            Sequence of instances :class:`.Job`.
+        :param names:
+            Only submit operations with any of the given names, defaults to all names.
+        :type names:
+            Sequence of :class:`str`
+        :param num:
+            Limit the total number of submitted operations, defaults to no limit.
+        :type num:
+            int
+        :param parallel:
+            Execute all bundled operations in parallel. Has no effect without bundling.
+        :type parallel:
             bool
         :param force:
             Ignore all warnings or checks during submission, just submit.
@@ -1807,10 +3136,60 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             bool
         :param walltime:
             Specify the walltime in hours or as instance of datetime.timedelta.
+        :param order:
+            The policy for the submission order of the operations, either 'lpt',
+            'priority', or a callable that returns the priority of a job-operation.
+        :type order:
+            str or callable
+        :param array:
+            Submit the bundles as job arrays with one array element per bundle.
+        :type array:
+            bool
+        :param pack:
+            Pack the operations into bundles that fill whole nodes of the environment
+            according to their resource directives, instead of bundles of fixed size.
+            The operations of packed bundles are executed in parallel.
+        :type pack:
+            bool
+        :param chain:
+            Also submit the operations that are declared to be executed after the
+            submitted operations with ``pre.after()``, with a dependency on the
+            cluster jobs of the operations they are executed after.
+        :type chain:
+            bool
+        :param pilot:
+            Queue the operations in the project's work queue and submit this number
+            of pilot jobs, which claim and execute the queued operations, instead
+            of one cluster job per bundle.
+        :type pilot:
+            int
+        :param auto_walltime:
+            Determine the walltime of each submission from the estimated durations of
+            its operations, that means from the 'walltime' directives or from recorded
+            past executions. Operations executed in sequence are bundled to fit into
+            the given walltime instead of bundles of fixed size.
+        :type auto_walltime:
+            bool
+        :param max_queued:
+            Query the scheduler for the number of submitted, queued, and active cluster
+            jobs of this project and only submit as many bundles (or pilot jobs) as
+            required to reach this number. Cluster jobs of chained operations are
+            submitted in addition.
+        :type max_queued:
+            int
+        :param fuse:
+            Combine operation functions into fewer 'exec' commands where possible.
+        :type fuse:
+            bool
+        :returns:
+            The number of submitted cluster jobs.
+        :rtype:
+            int
         """
         # Regular argument checks and expansion
         if jobs is None:
             jobs = self  # select all jobs
+        kwargs['fuse'] = fuse
         if isinstance(names, six.string_types):
             raise ValueError(
                 "The 'names' argument must be a sequence of strings, however you "
@@ -1829,18 +3208,48 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         with self._potentially_buffered():
             operations = (op for op in self._get_pending_operations(jobs, names)
                           if self.eligible_for_submission(op))
+            operations = self._order_operations(operations, order)
             if num is not None:
                 operations = list(islice(operations, num))
 
-        # Bundle them up and submit.
-        for bundle in make_bundles(operations, bundle_size):
-            status = self.submit_operations(
-                operations=bundle, env=env, parallel=parallel,
-                force=force, walltime=walltime, **kwargs)
+        slots = None
+        if max_queued is not None:
+            slots = self._queue_slots(
+                list(self._query_scheduler(env.get_scheduler(), refresh=True)), max_queued)
+
+        if pilot:
+            if array or chain or pack:
+                raise SubmitError(
+                    "Pilot jobs can not be combined with job arrays, chained submissions, "
+                    "or packed bundles.")
+            pilot = pilot if slots is None else min(pilot, slots)
+            if not pilot:
+                return 0
+            return self._submit_pilots(operations, pilot, env=env, parallel=parallel,
+                                       force=force, walltime=walltime, **kwargs)
 
-            if status is not None:  # operations were submitted, store status
-                for op in bundle:
-                    op.set_status(status)
+        # Bundle them up and submit.
+        parallel = parallel or pack
+        if auto_walltime:
+            kwargs['bundle_walltime'] = self._bundle_walltime_function(parallel)
+        bundles = self._bundle_operations(
+            operations, bundle_size, pack, env,
+            walltime if auto_walltime and not parallel else None)
+        if slots is not None:
+            bundles = islice(bundles, slots)
+        if array and chain:
+            raise SubmitError("Job arrays can not be combined with chained submissions.")
+        elif array:
+            submissions = self._submit_arrays(
+                bundles, env=env, parallel=parallel, force=force, walltime=walltime, **kwargs)
+        elif chain:
+            submissions = self._submit_chained(
+                bundles, bundle_size, env=env, parallel=parallel, force=force,
+                walltime=walltime, **kwargs)
+        else:
+            submissions = self._submit_bundles(
+                bundles, env=env, parallel=parallel, force=force, walltime=walltime, **kwargs)
+        return self._store_submission_status(submissions)
 
     @classmethod
     def _add_submit_args(cls, parser):
@@ -1862,6 +3271,19 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             '--test',
             action='store_true',
             help="Do not interact with the scheduler, implies --pretend.")
+        parser.add_argument(
+            '--max-queued',
+            type=int,
+            metavar='N',
+            help="Only submit as many cluster jobs as required to keep N cluster jobs of "
+                 "this project submitted, queued, or active.")
+        parser.add_argument(
+            '--daemon',
+            type=float,
+            metavar='INTERVAL',
+            help="Repeat the submission with --max-queued every INTERVAL seconds until no "
+                 "operations are left to submit and no cluster jobs are queued. The "
+                 "interval is increased after failed submissions.")
         cls._add_operation_selection_arg_group(parser)
         cls._add_operation_bundling_arg_group(parser)
         cls._add_template_arg_group(parser)
@@ -1874,6 +3296,10 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             '-p', '--parallel',
             action='store_true',
             help="Execute all operations in parallel.")
+        execution_group.add_argument(
+            '--fuse',
+            action='store_true',
+            help="Combine the execution of operation functions into fewer 'exec' commands.")
         cls._add_direct_cmd_arg_group(parser)
         cls._add_template_arg_group(parser)
 
@@ -1940,6 +3366,11 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             '-n', '--num',
             type=int,
             help="Limit the total number of operations to be selected.")
+        selection_group.add_argument(
+            '--order',
+            choices=['lpt', 'priority'],
+            help="Order the selected operations, either longest estimated processing time "
+                 "first ('lpt') or by the 'priority' value of the job document ('priority').")
 
     @classmethod
     def _add_operation_bundling_arg_group(cls, parser):
@@ -1964,6 +3395,40 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             '-p', '--parallel',
             action='store_true',
             help="Execute all (bundled) operations in parallel.")
+        bundling_group.add_argument(
+            '--fuse',
+            action='store_true',
+            help="Combine the execution of operation functions into fewer 'exec' commands.")
+        bundling_group.add_argument(
+            '--array',
+            action='store_true',
+            help="Submit the bundles as job arrays with one array element per bundle, "
+                 "which requires a scheduler with support for job arrays.")
+        bundling_group.add_argument(
+            '--pack',
+            action='store_true',
+            help="Pack the operations into bundles that fill whole nodes according to "
+                 "their resource directives, instead of bundles of fixed size. The "
+                 "operations of packed bundles are executed in parallel.")
+        bundling_group.add_argument(
+            '--chain',
+            action='store_true',
+            help="Also submit the operations that are declared to be executed after the "
+                 "submitted operations of the same job, with a dependency on the cluster "
+                 "jobs of those operations.")
+        bundling_group.add_argument(
+            '--pilot',
+            type=_positive_int,
+            metavar='N',
+            help="Queue the operations in the project's work queue and submit N pilot "
+                 "jobs that execute the queued operations with the 'worker' command, "
+                 "instead of one cluster job per bundle.")
+        bundling_group.add_argument(
+            '--auto-walltime',
+            action='store_true',
+            help="Determine the walltime of each cluster job from the estimated durations "
+                 "of its operations. Operations executed in sequence are bundled to fit "
+                 "into the walltime provided with --walltime.")
 
     @classmethod
     def _add_direct_cmd_arg_group(cls, parser):
@@ -2196,19 +3661,54 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             str
         """
         for name, op in self._operations.items():
-            if op.complete(job):
+            if op.complete((job,) if name in self._aggregates else job):
                 yield name
 
     def _job_operations(self, job, only_eligible):
         "Yield instances of JobOperation constructed for specific jobs."
+        hooks = self.hooks.on_condition_evaluated
         for name, op in self.operations.items():
-            if only_eligible and not op.eligible(job):
+            if name in self._aggregates:
                 continue
+            if only_eligible:
+                if hooks:
+                    start = time.time()
+                    eligible = op.eligible(job)
+                    for hook in hooks:
+                        hook(name, job, eligible, time.time() - start)
+                    if not eligible:
+                        continue
+                elif not op.eligible(job):
+                    continue
             yield JobOperation(name=name, job=job, cmd=op(job), directives=op.directives)
 
+    def _aggregate_operations(self, jobs, only_eligible, containing=None):
+        """Yield instances of AggregateJobOperation constructed for aggregates of jobs.
+
+        If containing is provided, only the aggregates that contain this job are yielded.
+        """
+        hooks = self.hooks.on_condition_evaluated
+        for name, aggregate in self._aggregates.items():
+            op = self._operations[name]
+            for group in _aggregate_jobs(aggregate, jobs):
+                if containing is not None and containing not in group:
+                    continue
+                if only_eligible:
+                    start = time.time()
+                    eligible = op.eligible(group)
+                    for hook in hooks:
+                        hook(name, group, eligible, time.time() - start)
+                    if not eligible:
+                        continue
+                yield AggregateJobOperation(
+                    name=name, jobs=group, cmd=op(group), directives=op.directives)
+
     def next_operations(self, *jobs):
         """Determine the next eligible operations for jobs.
 
+        Aggregate operations are determined for the aggregates formed by the
+        given jobs and yielded after all other operations.
+
         :param jobs:
             The signac job handles.
         :type job:
@@ -2219,6 +3719,8 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         for job in jobs:
             for op in self._job_operations(job, True):
                 yield op
+        for op in self._aggregate_operations(jobs, True):
+            yield op
 
     def next_operation(self, job):
         """Determine the next operation for this job.
@@ -2236,7 +3738,7 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             return op
 
     @classmethod
-    def operation(cls, func, name=None):
+    def operation(cls, func=None, name=None, memoize=False, aggregate=None):
         """Add the function `func` as operation function to the class workflow definition.
 
         This function is designed to be used as a decorator function, for example:
@@ -2247,16 +3749,93 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             def hello(job):
                 print('Hello', job)
 
+        Operations with the `memoize` argument are memoized, that means their outputs
+        are stored in a content-addressed cache. The outputs are restored from the cache
+        instead of executing the operation when the operation's name and source code,
+        the job's state point, and the content of the input files match. The input and
+        output files are the files of the operation's ``pre.isfile()`` and
+        ``post.isfile()`` conditions, for example:
+
+        .. code-block:: python
+
+            @FlowProject.operation(memoize=True)
+            @FlowProject.pre.isfile('init.gsd')
+            @FlowProject.post.isfile('dump.gsd')
+            def simulate(job):
+                pass
+
+        Operations with the `aggregate` argument are executed once for an aggregate
+        of jobs and called with the tuple of jobs as their only argument, for example:
+
+        .. code-block:: python
+
+            @FlowProject.operation(aggregate='T')
+            @FlowProject.post.isfile('rdf.txt')
+            def analyze(jobs):
+                pass
+
+        The jobs are aggregated by the given state point key(s), in batches of the
+        given size, with a callable that returns the group key of a job, or all jobs
+        are aggregated if the argument is True. The conditions of aggregate operations
+        are evaluated for the tuple of jobs, built-in conditions such as
+        ``post.isfile()`` are met if they are met for all jobs of the aggregate.
+
         See also: :meth:`~.flow.FlowProject.add_operation`.
 
         .. versionadded:: 0.6
+
+        :param func:
+            The operation function.
+        :param name:
+            The name of the operation, defaults to the name of the function.
+        :type name:
+            str
+        :param memoize:
+            Memoize the outputs of this operation.
+        :type memoize:
+            bool
+        :param aggregate:
+            Execute this operation for aggregates of jobs.
+        :type aggregate:
+            bool, int, str, sequence of str, or callable
         """
         if isinstance(func, six.string_types):
-            return lambda op: cls.operation(op, name=func)
+            return lambda op: cls.operation(op, name=func, memoize=memoize, aggregate=aggregate)
+        if func is None:
+            return lambda op: cls.operation(op, name=name, memoize=memoize, aggregate=aggregate)
 
         if name is None:
             name = func.__name__
 
+        if aggregate is not None and aggregate is not False:
+            if memoize:
+                raise ValueError(
+                    "Memoization is not supported for aggregate operations ({}).".format(name))
+            if isinstance(aggregate, six.integer_types) and not isinstance(aggregate, bool):
+                if aggregate < 1:
+                    raise ValueError(
+                        "The aggregate batch size must be positive ({}).".format(name))
+            elif isinstance(aggregate, (list, tuple)):
+                if not aggregate or not all(isinstance(key, six.string_types)
+                                            for key in aggregate):
+                    raise ValueError(
+                        "Aggregates must be specified by one or more state point "
+                        "keys ({}).".format(name))
+            elif not (aggregate is True or isinstance(aggregate, six.string_types) or
+                      callable(aggregate)):
+                raise ValueError("Invalid aggregate specification ({}).".format(name))
+            func._flow_aggregate = aggregate
+
+        if memoize:
+            if getattr(func, '_flow_cmd', False):
+                raise ValueError(
+                    "Memoization is not supported for cmd operations ({}).".format(name))
+            if not _declared_files(getattr(func, '_flow_post', None)):
+                raise ValueError(
+                    "Memoized operations require at least one output file "
+                    "declared with a post.isfile() condition ({}).".format(name))
+            func._flow_memoize = True
+
         if (name, func) in cls._OPERATION_FUNCTIONS:
             raise ValueError(
                 "An operation with name '{}' is already registered.".format(name))
@@ -2292,13 +3871,30 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             except (KeyError, TypeError):
                 executable = sys.executable
 
-            path = getattr(func, '_flow_path', inspect.getsourcefile(inspect.getmodule(func)))
+            # The path is determined lazily, since it is not required for the
+            # execution of operations and expensive to determine.
+            path = []
+
+            def get_path():
+                if not path:
+                    path.append(getattr(func, '_flow_path', None) or
+                                inspect.getsourcefile(inspect.getmodule(func)))
+                return path[0]
+
+            if getattr(func, '_flow_aggregate', False):
+                # Aggregate operations are executed for all jobs of the aggregate at once.
+                def cmd(jobs):
+                    return "{} {} exec {} {}".format(
+                        executable(jobs) if callable(executable) else executable,
+                        get_path(), name, ' '.join(job.get_id() for job in jobs))
+                return cmd
+
             cmd_str = "{} {} exec {} {{job._id}}"
 
-            if callable(executable):
-                return lambda job: cmd_str.format(executable(job), path, name)
-            else:
-                return cmd_str.format(executable, path, name)
+            def cmd(job):
+                return cmd_str.format(
+                    executable(job) if callable(executable) else executable, get_path(), name)
+            return cmd
 
         for name, func in operations:
             if name in self._operations:
@@ -2316,6 +3912,9 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                 self._operations[name] = FlowOperation(
                     cmd=_guess_cmd(func, name, **params), **params)
                 self._operation_functions[name] = func
+            if getattr(func, '_flow_aggregate', False):
+                self._aggregates[name] = func._flow_aggregate
+            self._operation_names[func].append(name)
 
     @property
     def operations(self):
@@ -2332,6 +3931,8 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             return False
         if job_operation.get_status() >= JobStatus.submitted:
             return False
+        if self._leases.claimed(job_operation.get_id()):
+            return False
         return True
 
     def _main_status(self, args):
@@ -2361,10 +3962,19 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
 
     def _main_next(self, args):
         "Determine the jobs that are eligible for a specific operation."
-        for job in self:
-            if args.name in {op.name for op in self.next_operations(job)}:
+        jobs = list(self)
+        eligible = set()
+        for op in self.next_operations(*jobs):
+            if op.name == args.name:
+                eligible.update(op.jobs)
+        for job in jobs:
+            if job in eligible:
                 print(job)
 
+    def _main_profile(self, args):
+        "Print a summary of the recorded execution profiles."
+        self.print_profile(names=args.operation_name, slowest=args.slowest)
+
     def _main_run(self, args):
         "Run all (or select) job operations."
         if args.hidden_operation_name:
@@ -2388,7 +3998,8 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         run = functools.partial(self.run,
                                 jobs=jobs, names=args.operation_name, pretend=args.pretend,
                                 np=args.parallel, timeout=args.timeout, num=args.num,
-                                num_passes=args.num_passes, progress=args.progress)
+                                num_passes=args.num_passes, progress=args.progress,
+                                order=args.order)
 
         if args.switch_to_project_root:
             with add_cwd_to_environment_pythonpath():
@@ -2415,36 +4026,92 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                 operations = self._generate_operations(args.cmd, jobs, args.requires)
             else:
                 operations = self._get_pending_operations(jobs, args.operation_name)
+            operations = self._order_operations(operations, args.order)
             operations = list(islice(operations, args.num))
 
         # Generate the script and print to screen.
         print(self.script(
             operations=operations, parallel=args.parallel,
-            template=args.template, show_template_help=args.show_template_help))
+            template=args.template, show_template_help=args.show_template_help,
+            fuse=args.fuse))
 
     def _main_submit(self, args):
         if args.test:
             args.pretend = True
+        if args.daemon:
+            if args.max_queued is None or args.pretend:
+                raise ValueError(
+                    "The --daemon option requires the --max-queued option and can not be "
+                    "combined with --pretend or --test.")
+            _repeat_with_backoff(lambda: self._submit_from_args(args), args.daemon)
+        else:
+            self._submit_from_args(args)
+
+    def _submit_from_args(self, args):
+        """Submit the operations selected with the command line arguments.
+
+        :returns:
+            True if any bundles were submitted or cluster jobs of this project are
+            queued or active, otherwise False.
+        """
         kwargs = vars(args)
 
         # Select jobs:
         jobs = self._select_jobs_from_args(args)
 
-        # Fetch the scheduler status.
+        # Fetch the scheduler status, the scheduler is queried only once.
+        scheduler_jobs = slots = None
+        if args.max_queued is not None:
+            if args.test:
+                slots = args.max_queued     # The scheduler is not queried in test mode.
+            else:
+                scheduler_jobs = list(self._query_scheduler(
+                    self._environment.get_scheduler(), refresh=True))
+                slots = self._queue_slots(scheduler_jobs, args.max_queued)
         if not args.test:
-            self._fetch_scheduler_status(jobs)
+            self._fetch_scheduler_status(jobs, scheduler_jobs=scheduler_jobs)
 
         # Gather all pending operations ...
         with self._potentially_buffered():
             ops = self._get_pending_operations(jobs, args.operation_name)
+            if slots is not None:
+                ops = (op for op in ops if self.eligible_for_submission(op))
+            ops = self._order_operations(ops, args.order)
             ops = list(islice(ops, args.num))
 
+        if args.pilot:
+            if args.array or args.chain or args.pack:
+                raise SubmitError(
+                    "Pilot jobs can not be combined with job arrays, chained submissions, "
+                    "or packed bundles.")
+            pilots = args.pilot if slots is None else min(args.pilot, slots)
+            submitted = self._submit_pilots(ops, pilots, **kwargs) if pilots else 0
+            return submitted > 0 or (slots is not None and slots < args.max_queued)
+
         # Bundle operations up, generate the script, and submit to scheduler.
-        for bundle in make_bundles(ops, args.bundle_size):
-            status = self.submit_operations(operations=bundle, **kwargs)
-            if status is not None:
-                for op in bundle:
-                    op.set_status(status)
+        args.parallel = args.parallel or args.pack
+        if args.auto_walltime:
+            kwargs['bundle_walltime'] = self._bundle_walltime_function(args.parallel)
+        bundles = self._bundle_operations(
+            ops, args.bundle_size, args.pack,
+            walltime=getattr(args, 'walltime', None)
+            if args.auto_walltime and not args.parallel else None)
+        if slots is not None:
+            bundles = islice(bundles, slots)
+        if args.array and args.chain:
+            raise SubmitError("Job arrays can not be combined with chained submissions.")
+        elif args.array:
+            submissions = self._submit_arrays(bundles, **kwargs)
+        elif args.chain:
+            submissions = self._submit_chained(bundles, **kwargs)
+        else:
+            submissions = self._submit_bundles(bundles, **kwargs)
+        submitted = self._store_submission_status(submissions)
+        return submitted > 0 or (slots is not None and slots < args.max_queued)
+
+    def _main_worker(self, args):
+        executed = self.work(walltime=args.walltime, timeout=args.timeout)
+        logger.info("Executed {} operation(s).".format(executed))
 
     def _main_exec(self, args):
         if len(args.jobid):
@@ -2452,23 +4119,96 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         else:
             jobs = self
         try:
-            try:
-                operation_function = self._operation_functions[args.operation]
-            except KeyError:
-                operation = self._operations[args.operation]
-
-                def operation_function(job):
-                    cmd = operation(job).format(job=job)
-                    fork(cmd=cmd)
-
+            flow_op = self._operations[args.operation]
         except KeyError:
             raise KeyError("Unknown operation '{}'.".format(args.operation))
+        operation_function = self._operation_functions.get(args.operation)
+        direct = operation_function is not None
+
+        then = getattr(args, 'then', None) or []
+        for name in then:
+            if name not in self._operations:
+                raise KeyError("Unknown operation '{}'.".format(name))
 
         if getattr(operation_function, '_flow_aggregate', False):
-            operation_function(jobs)
+            if then:
+                raise ValueError("Aggregate operations cannot be fused with other operations.")
+            jobs = tuple(jobs)
+            self._exec_operation(AggregateJobOperation(
+                args.operation, jobs, cmd=flow_op(jobs), directives=flow_op.directives), direct)
+            return
+
+        names = [args.operation] + then
+        processes = getattr(args, 'parallel', None)
+        if processes and processes > 1:
+            self._exec_in_parallel(list(jobs), names, processes)
         else:
             for job in jobs:
-                operation_function(job)
+                self._exec_job(job, names)
+
+    def _exec_job(self, job, names):
+        """Execute the operations with the given names for job in sequence.
+
+        The first operation is always executed, the subsequent operations are only
+        executed if the post-conditions of the preceding operation are met.
+        """
+        for i, name in enumerate(names):
+            flow_op = self._operations[name]
+            if i:
+                previous = self._operations[names[i - 1]]
+                if previous._postconds and not previous.complete(job):
+                    logger.warning(
+                        "Skip operations {} for job '{}', since the post-conditions of "
+                        "operation '{}' are not met.".format(names[i:], job, names[i - 1]))
+                    break
+                if not flow_op.eligible(job):
+                    logger.info("Skip operation '{}({})', which is not eligible.".format(name, job))
+                    continue
+            self._exec_operation(
+                JobOperation(name, job, cmd=flow_op(job), directives=flow_op.directives),
+                direct=name in self._operation_functions)
+
+    def _exec_in_parallel(self, jobs, names, processes):
+        """Execute the operations for all jobs with a process pool.
+
+        Errors are isolated per job, that means an error for one job does not prevent
+        the execution for the other jobs. A summarizing error is raised at the end.
+        """
+        from multiprocessing import Pool
+
+        pickle = six.moves.cPickle
+        try:
+            s_project = pickle.dumps(self)
+        except (pickle.PicklingError, AttributeError, TypeError) as error:
+            try:
+                import cloudpickle as pickle
+            except ImportError:     # The cloudpickle package is not available.
+                raise error
+            s_project = pickle.dumps(self)
+
+        failed = []
+        with contextlib.closing(Pool(processes=min(processes, len(jobs)))) as pool:
+            results = [pool.apply_async(_exec_with_serialization,
+                                        (pickle.loads, s_project, job.get_id(), names))
+                       for job in jobs]
+            for job, result in zip(jobs, results):
+                try:
+                    result.get()
+                except Exception as error:
+                    logger.error("Execution of {} failed for job '{}': {}".format(
+                        names, job, error))
+                    failed.append(str(job))
+        if failed:
+            raise RuntimeError("The execution of {} failed for {} of {} job(s): {}".format(
+                names, len(failed), len(jobs), ', '.join(failed)))
+
+    def _exec_operation(self, operation, direct):
+        "Execute operation within the 'exec' command."
+        if self.hooks:
+            with self.hooks._observe(operation):
+                self._execute_operation(operation, direct=direct)
+        else:
+            self._execute_operation(operation, direct=direct)
 
     def _select_jobs_from_args(self, args):
         "Select jobs with the given command line arguments ('-j/-f/--doc-filter')."
@@ -2486,57 +4226,8 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             doc_filter = parse_filter_arg(args.doc_filter)
             return legacy.JobsCursorWrapper(self, filter_, doc_filter)
 
-    def main(self, parser=None):
-        """Call this function to use the main command line interface.
-
-        In most cases one would want to call this function as part of the
-        class definition, e.g.:
-
-        .. code-block:: python
-
-             my_project.py
-            from flow import FlowProject
-
-            class MyProject(FlowProject):
-                pass
-
-            if __name__ == '__main__':
-                MyProject().main()
-
-        You can then execute this script on the command line:
-
-        .. code-block:: bash
-
-            $ python my_project.py --help
-        """
-        if parser is None:
-            parser = argparse.ArgumentParser()
-
-        base_parser = argparse.ArgumentParser(add_help=False)
-
-        # The argparse module does not automatically merge options shared between the main
-        # parser and the subparsers. We therefore assign different destinations for each
-        # option and then merge them manually below.
-        for prefix, _parser in (('main_', parser), ('', base_parser)):
-            _parser.add_argument(
-                '-v', '--verbose',
-                dest=prefix + 'verbose',
-                action='count',
-                default=0,
-                help="Increase output verbosity.")
-            _parser.add_argument(
-                '--show-traceback',
-                dest=prefix + 'show_traceback',
-                action='store_true',
-                help="Show the full traceback on error.")
-            _parser.add_argument(
-                '--debug',
-                dest=prefix + 'debug',
-                action='store_true',
-                help="This option implies `-vv --show-traceback`.")
-
-        subparsers = parser.add_subparsers()
-
+    def _add_subcommand_parsers(self, subparsers, base_parser):
+        "Add the parsers for all subcommands of the main command line interface."
         parser_status = subparsers.add_parser(
             'status',
             parents=[base_parser])
@@ -2553,6 +4244,22 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             help="The name of the operation.")
         parser_next.set_defaults(func=self._main_next)
 
+        parser_profile = subparsers.add_parser(
+            'profile',
+            parents=[base_parser],
+            description="Summarize the recorded resource usage of executed operations.")
+        parser_profile.add_argument(
+            '-o', '--operation',
+            dest='operation_name',
+            nargs='+',
+            help="Only summarize the profiles of the specified operation(s).")
+        parser_profile.add_argument(
+            '--slowest',
+            type=int,
+            default=10,
+            help="The number of slowest job-operations to show (default=10).")
+        parser_profile.set_defaults(func=self._main_profile)
+
         parser_run = subparsers.add_parser(
             'run',
             parents=[base_parser],
@@ -2617,6 +4324,25 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         parser_submit.set_defaults(func=self._main_submit)
         print('Using environment configuration:', self._environment.__name__, file=sys.stderr)
 
+        parser_worker = subparsers.add_parser(
+            'worker',
+            parents=[base_parser],
+        )
+        parser_worker.add_argument(
+            '-w', '--walltime',
+            type=float,
+            help="The walltime of the worker in hours; operations that are not expected "
+                 "to complete within the remaining walltime are not started.")
+        parser_worker.add_argument(
+            '-t', '--timeout',
+            type=int,
+            help="A timeout in seconds after which the execution of one operation is canceled.")
+        parser_worker.set_defaults(func=self._main_worker)
+
+        self._add_exec_parser(subparsers, base_parser)
+
+    def _add_exec_parser(self, subparsers, base_parser):
+        "Add the parser for the 'exec' subcommand."
         parser_exec = subparsers.add_parser(
             'exec',
             parents=[base_parser],
@@ -2632,8 +4358,79 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             nargs='*',
             help="The job ids, as registered in the signac project. "
                  "Omit to default to all statepoints.")
+        parser_exec.add_argument(
+            '--then',
+            type=str,
+            nargs='+',
+            choices=list(sorted(self._operations)),
+            metavar='OPERATION',
+            help="Operations to execute for each job after the first operation, as long as "
+                 "the post-conditions of the preceding operations are met.")
+        parser_exec.add_argument(
+            '--parallel',
+            type=_positive_int,
+            metavar='N',
+            help="Execute the operations for different jobs in parallel with N processes. "
+                 "An error for one job does not prevent the execution for the other jobs.")
         parser_exec.set_defaults(func=self._main_exec)
 
+    def main(self, parser=None):
+        """Call this function to use the main command line interface.
+
+        In most cases one would want to call this function as part of the
+        class definition, e.g.:
+
+        .. code-block:: python
+
+             my_project.py
+            from flow import FlowProject
+
+            class MyProject(FlowProject):
+                pass
+
+            if __name__ == '__main__':
+                MyProject().main()
+
+        You can then execute this script on the command line:
+
+        .. code-block:: bash
+
+            $ python my_project.py --help
+        """
+        if parser is None:
+            parser = argparse.ArgumentParser()
+
+        base_parser = argparse.ArgumentParser(add_help=False)
+
+        # The argparse module does not automatically merge options shared between the main
+        # parser and the subparsers. We therefore assign different destinations for each
+        # option and then merge them manually below.
+        for prefix, _parser in (('main_', parser), ('', base_parser)):
+            _parser.add_argument(
+                '-v', '--verbose',
+                dest=prefix + 'verbose',
+                action='count',
+                default=0,
+                help="Increase output verbosity.")
+            _parser.add_argument(
+                '--show-traceback',
+                dest=prefix + 'show_traceback',
+                action='store_true',
+                help="Show the full traceback on error.")
+            _parser.add_argument(
+                '--debug',
+                dest=prefix + 'debug',
+                action='store_true',
+                help="This option implies `-vv --show-traceback`.")
+
+        subparsers = parser.add_subparsers()
+        if _subcommand(sys.argv[1:]) == 'exec':
+            # Only the 'exec' parser is constructed to reduce the start-up time, since
+            # the 'exec' command is invoked for the execution of each operation.
+            self._add_exec_parser(subparsers, base_parser)
+        else:
+            self._add_subcommand_parsers(subparsers, base_parser)
+
         args = parser.parse_args()
         if not hasattr(args, 'func'):
             parser.print_usage()
@@ -2677,13 +4474,6 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         except SubmitError as error:
             print("Submission error:", error, file=sys.stderr)
             _exit_or_raise()
-        except (TimeoutError, TimeoutExpired):
-            print("Error: Failed to complete execution due to "
-                  "timeout ({}s).".format(args.timeout), file=sys.stderr)
-            _exit_or_raise()
-        except Jinja2TemplateNotFound as error:
-            print("Did not find template script '{}'.".format(error), file=sys.stderr)
-            _exit_or_raise()
         except AssertionError:
             if not args.show_traceback:
                 print("ERROR: Encountered internal error during program execution. "
@@ -2691,7 +4481,15 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                       "information.", file=sys.stderr)
             _exit_or_raise()
         except Exception as error:
-            if not args.debug:
+            # Imported here, since jinja2 is only imported on demand.
+            from multiprocessing import TimeoutError as PoolTimeoutError
+            from jinja2 import TemplateNotFound
+            if isinstance(error, (PoolTimeoutError, TimeoutExpired)):
+                print("Error: Failed to complete execution due to "
+                      "timeout ({}s).".format(args.timeout), file=sys.stderr)
+            elif isinstance(error, TemplateNotFound):
+                print("Did not find template script '{}'.".format(error), file=sys.stderr)
+            elif not args.debug:
                 if str(error):
                     print("ERROR: Encountered error during program execution: '{}'\n"
                           "Execute with '--show-traceback' or '--debug' to get "
@@ -2703,12 +4501,57 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             _exit_or_raise()
 
 
+def _repeat_with_backoff(func, interval, max_backoff=None):
+    """Call func every interval seconds for as long as it returns True.
+
+    The interval is doubled after each failed call, up to max_backoff times the
+    original interval, and reset after the next successful call.
+    """
+    if max_backoff is None:
+        max_backoff = DAEMON_MAX_BACKOFF
+    delay = interval
+    while True:
+        try:
+            if not func():
+                logger.info("No operations left to submit and no cluster jobs queued.")
+                return
+            delay = interval
+        except (SubmitError, RuntimeError, EnvironmentError, subprocess.CalledProcessError) \
+                as error:
+            logger.warning("Submission failed, retrying in {} seconds: {}".format(delay, error))
+            time.sleep(delay)
+            delay = min(2 * delay, max_backoff * interval)
+            continue
+        time.sleep(delay)
+
+
+def _subcommand(argv):
+    "Return the subcommand, that means the first positional argument, of the command line."
+    for arg in argv:
+        if not arg.startswith('-'):
+            return arg
+
+
 def _fork_with_serialization(loads, project, operation):
     """Invoke the _fork() method on a serialized project instance."""
     project = loads(project)
     project._fork(project._loads_op(operation))
 
 
+def _num_processes(directives):
+    "Return the number of processes of an operation, which is at least one."
+    np = dict.get(directives, 'np')
+    if np is None:
+        np = (dict.get(directives, 'nranks') or 1) * (dict.get(directives, 'omp_num_threads') or 1)
+    return np
+
+
+def _exec_with_serialization(loads, project, job_id, names):
+    """Invoke the _exec_job() method on a serialized project instance."""
+    project = loads(project)
+    project._exec_job(project.open_job(id=job_id), names)
+
+
 ###
 # Status-related helper functions
 
@@ -2,9 +2,27 @@
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
 """Defines the API for the scheduling system."""
-from .fakescheduler import FakeScheduler
-from .torque import TorqueScheduler
-from .slurm import SlurmScheduler
+import sys
+import importlib
+
+
+# The scheduler drivers are imported on first access (PEP 562) where supported.
+_DRIVERS = {
+    'FakeScheduler': 'fakescheduler',
+    'TorqueScheduler': 'torque',
+    'SlurmScheduler': 'slurm',
+    }
+
+if sys.version_info < (3, 7):
+    from .fakescheduler import FakeScheduler    # noqa: F401
+    from .torque import TorqueScheduler         # noqa: F401
+    from .slurm import SlurmScheduler           # noqa: F401
+else:
+    def __getattr__(name):
+        if name in _DRIVERS:
+            module = importlib.import_module('.' + _DRIVERS[name], __name__)
+            return getattr(module, name)
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
 
 
 __all__ = [
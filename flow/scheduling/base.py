@@ -2,8 +2,41 @@
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
 """Definition of base classes for the scheduling system."""
+import os
 import enum
 import time
+import socket
+import getpass
+import logging
+
+from signac.common import six
+
+from ..util import config as flow_config
+from ..util.cache import FileCache
+from ..util.cache import user_cache_dir
+from ..util.lease import LeaseManager
+
+
+logger = logging.getLogger(__name__)
+
+
+# The time-to-live of scheduler query snapshots in seconds.
+SCHEDULER_CACHE_TTL = 10
+
+# The maximum time in seconds one process may spend refreshing a snapshot,
+# while other processes read the previous snapshot or wait for the new one.
+SCHEDULER_QUERY_TIMEOUT = 60
+
+
+def _write_script(file, script):
+    """Write a submission script to a file opened in binary mode.
+
+    The script is either a str or an iterable of str chunks, which are
+    written as they are generated, e.g., by a template stream.
+    """
+    for chunk in (script,) if isinstance(script, six.string_types) else script:
+        file.write(chunk.encode('utf-8'))
+    file.flush()
 
 
 class JobStatus(enum.IntEnum):
@@ -46,10 +79,25 @@ class Scheduler(object):
     # The UNIX time stamp of the last scheduler query.
     _last_query = None
 
+    # The environment variable that holds the index of a job array element,
+    # None if the scheduler does not support job arrays.
+    array_index_var = None
+
+    # Whether the submit() method accepts scripts that are rendered while they
+    # are written (see _write_script()), otherwise scripts are passed as str.
+    stream_scripts = False
+
+    # Whether the jobs() method accepts a name prefix, such that only cluster jobs
+    # with names starting with this prefix are queried or returned.
+    query_by_prefix = False
+
     # The amount of time in seconds a user needs to wait, before we
     # assume that repeated scheduler queries might risk a denial-of-service attack.
     _dos_timeout = 10
 
+    # In-memory snapshots of scheduler queries by cache key.
+    _query_cache = dict()
+
     @classmethod
     def _prevent_dos(cls):
         """This method should be called before querying the scheduler.
@@ -65,9 +113,102 @@ class Scheduler(object):
                     "Too many scheduler requests within a short time!")
         cls._last_query = time.time()
 
+    def _query_cache_key(self, user=None, prefix=None):
+        "Return the key of the scheduler query snapshot for this host, user, and prefix."
+        if user is None:
+            try:
+                user = getpass.getuser()
+            except Exception:   # The user name cannot be determined on all systems.
+                user = ''
+        return '\n'.join((type(self).__name__, socket.gethostname(), user, prefix or ''))
+
+    def _cached_jobs(self, fetch, user=None, prefix=None):
+        """Return the cluster jobs from a recent snapshot of the scheduler queue.
+
+        Snapshots are shared by all processes of a user on the same host and
+        expire after the time-to-live configured with the ``flow.scheduler_cache_ttl``
+        configuration key (default: 10 seconds); use 0 to disable caching.
+        Only one process refreshes an expired snapshot at a time, while other
+        processes read the previous snapshot or wait for the refreshed one.
+
+        :param fetch:
+            A callable that queries the scheduler and returns the cluster jobs.
+        :param user:
+            The user whose jobs are queried, defaults to the current user.
+        :type user:
+            str
+        :param prefix:
+            The name prefix of the queried jobs, if any.
+        :type prefix:
+            str
+        :returns:
+            A list of :class:`.ClusterJob`.
+        """
+        ttl = float(flow_config.get_config_value(
+            'scheduler_cache_ttl', default=SCHEDULER_CACHE_TTL))
+        if ttl <= 0:
+            return list(fetch())
+        key = self._query_cache_key(user, prefix)
+        cached = self._query_cache.get(key)
+        if cached is not None and time.time() - cached[0] < ttl:
+            return list(cached[1])
+
+        root = os.path.join(user_cache_dir(), 'scheduler')
+        cache = FileCache(root, ttl)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            leases = LeaseManager(os.path.join(root, 'locks'), ttl=SCHEDULER_QUERY_TIMEOUT)
+            if leases.acquire(key):
+                try:
+                    snapshot = cache.get(key)   # refreshed by another process meanwhile
+                    if snapshot is None:
+                        snapshot = [[job.name(), int(job.status())] for job in fetch()]
+                        cache.set(key, snapshot)
+                finally:
+                    leases.release(key)
+            else:
+                logger.debug("Scheduler query snapshot is being refreshed by another process.")
+                snapshot = FileCache(root, ttl + SCHEDULER_QUERY_TIMEOUT).get(key)
+                deadline = time.time() + SCHEDULER_QUERY_TIMEOUT
+                while snapshot is None and leases.claimed(key) and time.time() < deadline:
+                    time.sleep(0.5)
+                    snapshot = cache.get(key)
+                if snapshot is None:
+                    snapshot = [[job.name(), int(job.status())] for job in fetch()]
+
+        jobs = [ClusterJob(name, JobStatus(status)) for name, status in snapshot]
+        self._query_cache[key] = (time.time(), jobs)
+        return list(jobs)
+
+    def _invalidate_cached_jobs(self, user=None, prefix=None):
+        """Invalidate the snapshots of the scheduler queue, e.g., after a submission.
+
+        :param user:
+            The user whose jobs were queried, defaults to the current user.
+        :type user:
+            str
+        :param prefix:
+            The name prefix of the queried jobs, by default the snapshots of
+            all prefixes are invalidated.
+        :type prefix:
+            str
+        """
+        key = self._query_cache_key(user, prefix)
+        for cached in list(self._query_cache):
+            if cached == key or (prefix is None and cached.startswith(key)):
+                del self._query_cache[cached]
+        cache = FileCache(os.path.join(user_cache_dir(), 'scheduler'), 0)
+        if prefix is None:
+            cache.invalidate(prefix=key)
+        else:
+            cache.invalidate(key)
+
     def jobs(self):
         """Yield all cluster jobs.
 
+        Schedulers that set :attr:`query_by_prefix` accept an optional ``prefix``
+        argument to only yield the cluster jobs with names starting with it.
+
         :yields:
             :class:`.ClusterJob`
         """
@@ -6,6 +6,7 @@
 This module implements the Scheduler and ClusterJob classes for LSF.
 """
 from __future__ import print_function
+import re
 import getpass
 import subprocess
 import tempfile
@@ -15,6 +16,7 @@ import errno
 
 from .base import Scheduler
 from .base import ClusterJob, JobStatus
+from .base import _write_script
 
 
 logger = logging.getLogger(__name__)
@@ -34,13 +36,19 @@ def _parse_status(s):
     return JobStatus.registered
 
 
-def _fetch(user=None):
-    "Fetch the cluster job status information from the LSF scheduler."
+def _fetch(user=None, prefix=None):
+    """Fetch the cluster job status information from the LSF scheduler.
+
+    Only the fields required to determine the status of jobs are queried and
+    jobs are filtered by the scheduler if a name prefix is provided.
+    """
 
     if user is None:
         user = getpass.getuser()
 
-    cmd = ['bjobs', '-json', '-u', user]
+    cmd = ['bjobs', '-json', '-o', 'jobid stat job_name', '-u', user]
+    if prefix:
+        cmd.extend(['-J', prefix + '*'])
     try:
         result = json.loads(subprocess.check_output(cmd).decode('utf-8'))
     except subprocess.CalledProcessError:
@@ -54,6 +62,8 @@ def _fetch(user=None):
         raise RuntimeError("Could not parse LSF JSON output.")
 
     for record in result['RECORDS']:
+        if prefix and not record['JOB_NAME'].startswith(prefix):
+            continue
         yield LSFJob(record)
 
 
@@ -83,14 +93,24 @@ class LSFScheduler(Scheduler):
     # The standard command used to submit jobs to the LSF scheduler.
     submit_cmd = ['bsub']
 
+    array_index_var = 'LSB_JOBINDEX'
+    stream_scripts = True
+    query_by_prefix = True
+
     def __init__(self, user=None, **kwargs):
         super(LSFScheduler, self).__init__(**kwargs)
         self.user = user
 
-    def jobs(self):
-        "Yield cluster jobs by querying the scheduler."
-        self._prevent_dos()
-        for job in _fetch(user=self.user):
+    def jobs(self, prefix=None):
+        """Yield cluster jobs by querying the scheduler.
+
+        :param prefix:
+            Only yield cluster jobs with names starting with this prefix.
+        :type prefix:
+            str
+        """
+        for job in self._cached_jobs(
+                lambda: _fetch(user=self.user, prefix=prefix), self.user, prefix):
             yield job
 
     def submit(self, script, after=None, hold=False, pretend=False, flags=None, **kwargs):
@@ -99,9 +119,10 @@ class LSFScheduler(Scheduler):
         :param script:
             The job script submitted for execution.
         :type script:
-            str
+            str or iterable of str
         :param after:
-            Execute the submitted script after a job with this id has completed.
+            Execute the submitted script after the jobs with these ids, separated
+            by colons, have completed successfully.
         :type after:
             str
         :param pretend:
@@ -115,7 +136,7 @@ class LSFScheduler(Scheduler):
         :type flags:
             list
         :returns:
-            Returns True if the cluster job was successfully submitted, otherwise None.
+            The cluster job id if the script was successfully submitted, otherwise None.
         """
         if flags is None:
             flags = []
@@ -125,8 +146,8 @@ class LSFScheduler(Scheduler):
         submit_cmd = self.submit_cmd + flags
 
         if after is not None:
-            submit_cmd.extend(
-                ['-w', '"done({})"'.format(after.split('.')[0])])
+            submit_cmd.extend(['-w', ' && '.join(
+                'done({})'.format(_id.split('.')[0]) for _id in after.split(':'))])
 
         if hold:
             submit_cmd += ['-H']
@@ -137,10 +158,10 @@ class LSFScheduler(Scheduler):
             print()
         else:
             with tempfile.NamedTemporaryFile() as tmp_submit_script:
-                tmp_submit_script.write(str(script).encode('utf-8'))
-                tmp_submit_script.flush()
-                subprocess.check_output(submit_cmd + [tmp_submit_script.name])
-                return True
+                _write_script(tmp_submit_script, script)
+                output = subprocess.check_output(submit_cmd + [tmp_submit_script.name])
+                match = re.search(r'Job <(\d+)>', output.decode('utf-8'))
+                return match.group(1) if match else True
 
     @classmethod
     def is_present(cls):
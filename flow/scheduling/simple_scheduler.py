@@ -8,9 +8,11 @@ import json
 
 from .base import Scheduler
 from .base import ClusterJob, JobStatus
+from .base import _write_script
 
 
 class SimpleScheduler(Scheduler):
+    stream_scripts = True
 
     @classmethod
     def is_present(cls):
@@ -25,15 +27,16 @@ class SimpleScheduler(Scheduler):
         for _id, doc in status.items():
             yield ClusterJob(doc['job_name'], JobStatus(doc['status']))
 
-    def submit(self, script, pretend=False, **kwargs):
+    def submit(self, script, after=None, pretend=False, **kwargs):
         cmd = self.cmd + ['submit']
+        if after is not None:
+            cmd.extend(['--after', after])
         if pretend:
             print("# Submit command: {}".format(' '.join(cmd)))
             print(script)
             print()
         else:
             with tempfile.NamedTemporaryFile() as tmp_submit_script:
-                tmp_submit_script.write(str(script).encode('utf-8'))
-                tmp_submit_script.flush()
-                subprocess.check_output(cmd + [tmp_submit_script.name])
-                return True
+                _write_script(tmp_submit_script, script)
+                output = subprocess.check_output(cmd + [tmp_submit_script.name])
+                return output.decode('utf-8').strip() or True
@@ -0,0 +1,455 @@
+# Copyright (c) 2019 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""A simulator of the SLURM, LSF, and TORQUE schedulers.
+
+The simulator provides drop-in replacements for the ``squeue``/``sbatch``,
+``bjobs``/``bsub``, and ``qstat``/``qsub`` commands, such that the scheduler
+classes of signac-flow can be tested and benchmarked without a cluster.
+The commands are installed into a directory with:
+
+.. code-block:: bash
+
+    python -m flow.scheduling.simulator install BIN_DIR --data DATA_DIR --num-jobs 50000
+
+Once ``BIN_DIR`` is added to the ``PATH``, the :class:`~.SlurmScheduler`,
+:class:`~.LSFScheduler`, and :class:`~.TorqueScheduler` classes submit to and
+query the simulator. The configuration and submitted jobs are stored within
+the data directory. The state of each job is derived from its submission time:
+a job is queued for the configured queue time once its dependencies have
+completed, active for the configured run time, and inactive afterwards.
+Held jobs remain held. Submitted scripts are not executed.
+"""
+from __future__ import print_function
+import os
+import sys
+import json
+import time
+import re
+import random
+import getpass
+import argparse
+import fnmatch
+import shlex
+import logging
+from xml.sax.saxutils import escape
+
+from ..util.misc import _mkdir_p
+
+
+logger = logging.getLogger(__name__)
+
+
+# The environment variable that holds the path to the data directory.
+DATA_VAR = 'FLOW_SIMULATOR_DATA'
+
+DEFAULT_CONFIG = dict(
+    # The time in seconds each query or submission command takes.
+    query_latency=0.0,
+    submit_latency=0.0,
+    # The number of synthetic jobs of other projects and their state.
+    num_jobs=0,
+    synthetic_state='queued',
+    # The time in seconds that submitted jobs are queued and active.
+    queue_time=10.0,
+    run_time=60.0,
+    # The time in seconds that completed jobs are still reported.
+    keep_time=300.0,
+    # The fraction of jobs that fail and of commands that fail.
+    error_rate=0.0,
+    submit_failure_rate=0.0,
+    query_failure_rate=0.0,
+)
+
+SYNTHETIC_STATES = ('queued', 'held', 'active', 'inactive', 'error')
+
+
+class Simulator(object):
+    """The state of a simulated scheduler stored within a directory.
+
+    :param root:
+        The data directory of the simulator.
+    :type root:
+        str
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    @property
+    def _fn_config(self):
+        return os.path.join(self.root, 'config.json')
+
+    @property
+    def _fn_jobs(self):
+        return os.path.join(self.root, 'jobs.jsonl')
+
+    def config(self):
+        "Return the configuration of the simulator."
+        config = dict(DEFAULT_CONFIG)
+        try:
+            with open(self._fn_config) as file:
+                config.update(json.load(file))
+        except (IOError, OSError):
+            pass
+        return config
+
+    def configure(self, **kwargs):
+        "Update the configuration of the simulator."
+        unknown = set(kwargs).difference(DEFAULT_CONFIG)
+        if unknown:
+            raise ValueError("Unknown configuration keys: {}".format(', '.join(sorted(unknown))))
+        if kwargs.get('synthetic_state', 'queued') not in SYNTHETIC_STATES:
+            raise ValueError("Unknown state '{}'.".format(kwargs['synthetic_state']))
+        config = self.config()
+        config.update(kwargs)
+        _mkdir_p(self.root)
+        tmp = self._fn_config + '.tmp'
+        with open(tmp, 'w') as file:
+            json.dump(config, file, indent=2)
+        os.rename(tmp, self._fn_config)
+
+    def _submitted(self):
+        try:
+            with open(self._fn_jobs) as file:
+                return [json.loads(line) for line in file if line.strip()]
+        except (IOError, OSError):
+            return []
+
+    def submit(self, name, array_size=None, after=None, hold=False):
+        """Add a job to the simulated queue.
+
+        :returns:
+            The id of the submitted job.
+        """
+        import fcntl
+
+        _mkdir_p(self.root)
+        with open(self._fn_jobs + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            _id = self.config()['num_jobs'] + len(self._submitted()) + 1
+            job = dict(id=_id, name=name, user=_get_user(), submitted=time.time(),
+                       array_size=array_size, after=list(after or ()), hold=hold)
+            with open(self._fn_jobs, 'a') as file:
+                file.write(json.dumps(job) + '\n')
+        return _id
+
+    def jobs(self, user=None):
+        """Yield the jobs that are currently reported by the simulated scheduler.
+
+        :yields:
+            Tuples of the job id, array index or None, name, user, and state, which
+            is one of 'queued', 'held', 'active', 'inactive', and 'error'.
+        """
+        config = self.config()
+        now = time.time()
+        for i in range(1, config['num_jobs'] + 1):
+            name = 'synthetic/{:06d}'.format(i)
+            yield i, None, name, user or 'synthetic', config['synthetic_state']
+        ends = dict()
+        for job in self._submitted():
+            start = job['submitted'] + config['queue_time']
+            for dep in job['after']:
+                start = max(start, ends.get(int(dep), start))
+            failed = random.Random(job['id']).random() < config['error_rate']
+            # Dependents of failed jobs are never started.
+            held = job['hold'] or failed
+            ends[job['id']] = float('inf') if held else start + config['run_time']
+            if job['hold'] or start == float('inf'):
+                state = 'held' if job['hold'] else 'queued'
+            elif now < start:
+                state = 'queued'
+            elif now < start + config['run_time']:
+                state = 'active'
+            elif now < start + config['run_time'] + config['keep_time']:
+                state = 'error' if failed else 'inactive'
+            else:
+                continue
+            if user is not None and job['user'] != user:
+                continue
+            if job['array_size']:
+                for index in range(1, job['array_size'] + 1):
+                    yield job['id'], index, job['name'], job['user'], state
+            else:
+                yield job['id'], None, job['name'], job['user'], state
+
+
+def _get_user():
+    try:
+        return getpass.getuser()
+    except Exception:   # The user name cannot be determined on all systems.
+        return ''
+
+
+def _directives(script, prefix):
+    "Return the arguments of all directives with the given prefix in the script."
+    args = []
+    with open(script) as file:
+        for line in file:
+            if line.startswith(prefix):
+                args.extend(shlex.split(line[len(prefix):]))
+    return args
+
+
+def _parse_submit_args(parser, args, prefix):
+    """Parse the submission options from the command line and the script directives.
+
+    Options on the command line take precedence over directives in the script,
+    which is the last positional argument.
+    """
+    script = parser.parse_known_args(args)[0].script[-1]
+    directives = parser.parse_known_args(_directives(script, prefix))[0]
+    return parser.parse_known_args(args, namespace=directives)[0]
+
+
+def _array_size(spec):
+    "Return the size of an array specification like '1-10'."
+    if spec:
+        return int(spec.split('%')[0].split('-')[-1])
+
+
+def _fail(config, key, message):
+    "Exit with an error message with the probability configured with key."
+    if random.random() < config[key]:
+        print(message, file=sys.stderr)
+        sys.exit(1)
+
+
+def _simulate(simulator, latency, failure_rate, message):
+    config = simulator.config()
+    time.sleep(config[latency])
+    _fail(config, failure_rate, message)
+
+
+def main_squeue(simulator, args):
+    parser = argparse.ArgumentParser(prog='squeue', add_help=False)
+    parser.add_argument('-u', '--user')
+    parser.add_argument('-h', '--noheader', action='store_true')
+    parser.add_argument('-o', '--format', default='%i %j %t')
+    args, _ = parser.parse_known_args(args)
+    _simulate(simulator, 'query_latency', 'query_failure_rate',
+              "slurm_load_jobs error: Socket timed out on send/recv operation")
+    codes = dict(queued='PD', held='PD', active='R', inactive='CD', error='F')
+
+    def fmt(fields):
+        return re.sub(r'%\.?\d*([a-zA-Z])', lambda m: fields.get(m.group(1), ''), args.format)
+
+    if not args.noheader:
+        print(fmt(dict(i='JOBID', j='NAME', t='ST', K='ARRAY_TASK_ID', u='USER')))
+    for _id, index, name, user, state in simulator.jobs(args.user):
+        print(fmt(dict(i=str(_id) if index is None else '{}_{}'.format(_id, index),
+                       j=name, t=codes[state], u=user,
+                       K='N/A' if index is None else str(index))))
+
+
+def main_sbatch(simulator, args):
+    parser = argparse.ArgumentParser(prog='sbatch', add_help=False)
+    parser.add_argument('-J', '--job-name')
+    parser.add_argument('-a', '--array')
+    parser.add_argument('-d', '--dependency')
+    parser.add_argument('-H', '--hold', action='store_true')
+    parser.add_argument('-V', '--version', action='store_true')
+    parser.add_argument('script', nargs='*')
+    if parser.parse_known_args(args)[0].version:
+        print('slurm (simulator)')
+        return
+    args = _parse_submit_args(parser, args, '#SBATCH')
+    _simulate(simulator, 'submit_latency', 'submit_failure_rate',
+              "sbatch: error: Batch job submission failed: Socket timed out on send/recv operation")
+    _id = simulator.submit(
+        name=args.job_name or os.path.basename(args.script[-1]),
+        array_size=_array_size(args.array),
+        after=args.dependency.partition(':')[2].split(':') if args.dependency else None,
+        hold=args.hold)
+    print('Submitted batch job {}'.format(_id))
+
+
+def main_bjobs(simulator, args):
+    parser = argparse.ArgumentParser(prog='bjobs', add_help=False)
+    parser.add_argument('-u')
+    parser.add_argument('-J')
+    parser.add_argument('-o', default='jobid stat job_name user')
+    parser.add_argument('-json', action='store_true')
+    parser.add_argument('-V', action='store_true')
+    args, _ = parser.parse_known_args(args)
+    if args.V:
+        print('IBM Spectrum LSF (simulator)')
+        return
+    _simulate(simulator, 'query_latency', 'query_failure_rate',
+              "LSF is down. Please wait ...")
+    codes = dict(queued='PEND', held='PSUSP', active='RUN', inactive='DONE', error='EXIT')
+    # Fields may be followed by a width, e.g., 'job_name:20', options are ignored.
+    fields = [f.split(':')[0].upper() for f in args.o.split() if '=' not in f]
+    records = []
+    for _id, index, name, user, state in simulator.jobs(args.u):
+        if index is not None:
+            name = '{}[{}]'.format(name, index)
+        if args.J and not fnmatch.fnmatchcase(name, args.J):
+            continue
+        record = dict(JOBID=str(_id), STAT=codes[state], JOB_NAME=name, USER=user)
+        records.append({field: record.get(field, '') for field in fields})
+    if args.json:
+        print(json.dumps(dict(COMMAND='bjobs', JOBS=len(records), RECORDS=records), indent=2))
+    elif records:
+        print(' '.join(fields))
+        for record in records:
+            print(' '.join(record[field] for field in fields))
+    else:
+        print('No unfinished job found')
+
+
+def main_bsub(simulator, args):
+    parser = argparse.ArgumentParser(prog='bsub', add_help=False)
+    parser.add_argument('-J')
+    parser.add_argument('-w')
+    parser.add_argument('-H', action='store_true')
+    parser.add_argument('-V', action='store_true')
+    parser.add_argument('script', nargs='*')
+    if parser.parse_known_args(args)[0].V:
+        print('IBM Spectrum LSF (simulator)')
+        return
+    args = _parse_submit_args(parser, args, '#BSUB')
+    _simulate(simulator, 'submit_latency', 'submit_failure_rate',
+              "Failed in an LSF library call: Slave LIM configuration is not ready yet.")
+    name, array_size = args.J or os.path.basename(args.script[-1]), None
+    match = re.match(r'(.*)\[(\d+-\d+)\]$', name)     # job arrays, e.g., 'name[1-10]'
+    if match:
+        name, array_size = match.group(1), _array_size(match.group(2))
+    _id = simulator.submit(
+        name=name, array_size=array_size,
+        after=re.findall(r'\((\d+)\)', args.w) if args.w else None, hold=args.H)
+    print('Job <{}> is submitted to default queue <normal>.'.format(_id))
+
+
+def main_qstat(simulator, args):
+    parser = argparse.ArgumentParser(prog='qstat', add_help=False)
+    parser.add_argument('-u')
+    parser.add_argument('-f', action='store_true')
+    parser.add_argument('-x', action='store_true')
+    parser.add_argument('-t', action='store_true')
+    args, _ = parser.parse_known_args(args)
+    _simulate(simulator, 'query_latency', 'query_failure_rate',
+              "Communication failure.\nqstat: cannot connect to server simulator (errno=111)")
+    codes = dict(queued='Q', held='H', active='R', inactive='C', error='C')
+    # TORQUE does not print anything if there are no jobs.
+    empty = True
+    for _id, index, name, user, state in simulator.jobs(args.u):
+        if empty:
+            sys.stdout.write('<Data>')
+            empty = False
+        if index is not None:
+            _id, name = '{}[{}]'.format(_id, index), '{}-{}'.format(name, index)
+        sys.stdout.write(
+            '<Job><Job_Id>{}.simulator</Job_Id><Job_Name>{}</Job_Name>'
+            '<Job_Owner>{}@simulator</Job_Owner><job_state>{}</job_state></Job>'.format(
+                _id, escape(name), escape(user), codes[state]))
+    if not empty:
+        sys.stdout.write('</Data>\n')
+
+
+def main_qsub(simulator, args):
+    parser = argparse.ArgumentParser(prog='qsub', add_help=False)
+    parser.add_argument('-N')
+    parser.add_argument('-t')
+    parser.add_argument('-W')
+    parser.add_argument('-h', action='store_true')
+    parser.add_argument('--version', action='store_true')
+    parser.add_argument('script', nargs='*')
+    if parser.parse_known_args(args)[0].version:
+        print('Version: simulator')
+        return
+    args = _parse_submit_args(parser, args, '#PBS')
+    _simulate(simulator, 'submit_latency', 'submit_failure_rate',
+              "qsub: cannot connect to server simulator (errno=111) Connection refused")
+    after = None
+    if args.W and args.W.startswith('depend='):
+        after = [_id.split('.')[0] for _id in args.W.partition(':')[2].split(':')]
+    _id = simulator.submit(
+        name=args.N or os.path.basename(args.script[-1]),
+        array_size=_array_size(args.t), after=after, hold=args.h)
+    print('{}.simulator'.format(_id))
+
+
+COMMANDS = dict(
+    squeue=main_squeue, sbatch=main_sbatch,
+    bjobs=main_bjobs, bsub=main_bsub,
+    qstat=main_qstat, qsub=main_qsub)
+
+
+def install(bin_dir, data_dir, **kwargs):
+    """Install the simulated scheduler commands and configure the simulator.
+
+    :param bin_dir:
+        The directory in which the commands are installed, which needs to be
+        added to the ``PATH`` to use the simulator.
+    :type bin_dir:
+        str
+    :param data_dir:
+        The directory in which the configuration and jobs of the simulator are stored.
+    :type data_dir:
+        str
+    :param kwargs:
+        Configuration values of the simulator, see ``DEFAULT_CONFIG``.
+    :returns:
+        The :class:`.Simulator` instance.
+    """
+    simulator = Simulator(os.path.abspath(data_dir))
+    simulator.configure(**kwargs)
+    # The flow package is importable from this path when the commands are executed.
+    path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    _mkdir_p(bin_dir)
+    for cmd in COMMANDS:
+        fn = os.path.join(bin_dir, cmd)
+        with open(fn, 'w') as file:
+            file.write('#!/bin/sh\n')
+            file.write('export {}="{}"\n'.format(DATA_VAR, simulator.root))
+            file.write('export PYTHONPATH="{}${{PYTHONPATH:+:$PYTHONPATH}}"\n'.format(path))
+            file.write('exec "{}" -m flow.scheduling.simulator {} "$@"\n'.format(
+                sys.executable, cmd))
+        os.chmod(fn, 0o755)
+    return simulator
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    if args and args[0] in COMMANDS:
+        if DATA_VAR not in os.environ:
+            print("The {} environment variable is not set.".format(DATA_VAR), file=sys.stderr)
+            sys.exit(2)
+        COMMANDS[args[0]](Simulator(os.environ[DATA_VAR]), args[1:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Simulate the SLURM, LSF, and TORQUE schedulers.")
+    subparsers = parser.add_subparsers()
+    parser_install = subparsers.add_parser(
+        'install',
+        description="Install the simulated scheduler commands into a directory, "
+                    "which needs to be added to the PATH. The simulator is configured "
+                    "with the given options, the command may be repeated to change them.")
+    parser_install.add_argument(
+        'bin_dir',
+        help="The directory in which the commands are installed.")
+    parser_install.add_argument(
+        '--data',
+        required=True,
+        help="The directory in which the configuration and jobs are stored.")
+    for key, default in sorted(DEFAULT_CONFIG.items()):
+        parser_install.add_argument(
+            '--' + key.replace('_', '-'),
+            type=type(default),
+            choices=SYNTHETIC_STATES if key == 'synthetic_state' else None,
+            help="Default: {}".format(default))
+    args = parser.parse_args(args)
+    if not hasattr(args, 'bin_dir'):
+        parser.print_usage()
+        sys.exit(2)
+    config = {key: getattr(args, key) for key in DEFAULT_CONFIG
+              if getattr(args, key) is not None}
+    install(args.bin_dir, args.data, **config)
+    print('export PATH="{}:$PATH"'.format(os.path.abspath(args.bin_dir)))
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@
 This module implements the Scheduler and ClusterJob classes for SLURM.
 """
 from __future__ import print_function
+import re
 import getpass
 import subprocess
 import tempfile
@@ -14,14 +15,40 @@ import errno
 
 from .base import Scheduler
 from .base import ClusterJob, JobStatus
+from .base import _write_script
 from ..errors import SubmitError
 
 
 logger = logging.getLogger(__name__)
 
 
-def _fetch(user=None):
-    "Fetch the cluster job status information from the SLURM scheduler."
+def _parse_array_indices(s):
+    """Parse the job array indices reported by squeue, e.g., '3' or '[5-9,12%2]'.
+
+    :returns:
+        The list of indices or None if the job is not part of a job array.
+    """
+    s = s.strip().strip('[]').split('%')[0]
+    if s in ('', 'N/A'):
+        return None
+    indices = []
+    try:
+        for token in s.split(','):
+            start, _, stop = token.partition('-')
+            stop, _, step = stop.partition(':')
+            indices.extend(range(int(start), int(stop or start) + 1, int(step or 1)))
+    except ValueError:  # The field may be truncated for large arrays.
+        return None
+    return indices
+
+
+def _fetch(user=None, prefix=None):
+    """Fetch the cluster job status information from the SLURM scheduler.
+
+    The output of squeue is parsed line by line as it is generated and jobs
+    with names that do not start with prefix are skipped, since squeue does
+    not support filtering by a partial job name.
+    """
 
     def parse_status(s):
         s = s.strip()
@@ -38,22 +65,31 @@ def _fetch(user=None):
     if user is None:
         user = getpass.getuser()
 
-    cmd = ['squeue', '-u', user, '-h', "--format=%2t%100j"]
+    cmd = ['squeue', '-u', user, '-h', "--format=%t|%K|%j"]
     try:
-        result = subprocess.check_output(cmd).decode('utf-8', errors='backslashreplace')
-    except subprocess.CalledProcessError:
-        raise
-    except IOError as error:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    except (IOError, OSError) as error:
         if error.errno != errno.ENOENT:
             raise
         else:
             raise RuntimeError("SLURM not available.")
-    lines = result.split('\n')
-    for line in lines:
-        if line:
-            status = line[:2]
-            name = line[2:].rstrip()
-            yield SlurmJob(name, parse_status(status))
+    with process.stdout:
+        for line in process.stdout:
+            line = line.decode('utf-8', errors='backslashreplace').rstrip()
+            if not line:
+                continue
+            status, index, name = line.split('|', 2)
+            if prefix and not name.startswith(prefix):
+                continue
+            indices = _parse_array_indices(index)
+            if indices is None:
+                yield SlurmJob(name, parse_status(status))
+            else:
+                # Elements of job arrays are named after the array and their index.
+                for i in indices:
+                    yield SlurmJob('{}[{}]'.format(name, i), parse_status(status))
+    if process.wait():
+        raise subprocess.CalledProcessError(process.returncode, cmd)
 
 
 class SlurmJob(ClusterJob):
@@ -75,14 +111,24 @@ class SlurmScheduler(Scheduler):
     # The standard command used to submit jobs to the SLURM scheduler.
     submit_cmd = ['sbatch']
 
+    array_index_var = 'SLURM_ARRAY_TASK_ID'
+    stream_scripts = True
+    query_by_prefix = True
+
     def __init__(self, user=None, **kwargs):
         super(SlurmScheduler, self).__init__(**kwargs)
         self.user = user
 
-    def jobs(self):
-        "Yield cluster jobs by querying the scheduler."
-        self._prevent_dos()
-        for job in _fetch(user=self.user):
+    def jobs(self, prefix=None):
+        """Yield cluster jobs by querying the scheduler.
+
+        :param prefix:
+            Only yield cluster jobs with names starting with this prefix.
+        :type prefix:
+            str
+        """
+        for job in self._cached_jobs(
+                lambda: _fetch(user=self.user, prefix=prefix), self.user, prefix):
             yield job
 
     def submit(self, script, after=None, hold=False, pretend=False, flags=None, **kwargs):
@@ -91,9 +137,10 @@ class SlurmScheduler(Scheduler):
         :param script:
             The job script submitted for execution.
         :type script:
-            str
+            str or iterable of str
         :param after:
-            Execute the submitted script after a job with this id has completed.
+            Execute the submitted script after the jobs with these ids, separated
+            by colons, have completed successfully.
         :type after:
             str
         :param pretend:
@@ -107,7 +154,7 @@ class SlurmScheduler(Scheduler):
         :type flags:
             list
         :returns:
-            Returns True if the cluster job was successfully submitted, otherwise None.
+            The cluster job id if the script was successfully submitted, otherwise None.
         """
         if flags is None:
             flags = []
@@ -117,8 +164,8 @@ class SlurmScheduler(Scheduler):
         submit_cmd = self.submit_cmd + flags
 
         if after is not None:
-            submit_cmd.extend(
-                ['-W', 'depend="afterany:{}"'.format(after.split('.')[0])])
+            submit_cmd.append('--dependency=afterok:{}'.format(
+                ':'.join(_id.split('.')[0] for _id in after.split(':'))))
 
         if hold:
             submit_cmd += ['--hold']
@@ -129,15 +176,15 @@ class SlurmScheduler(Scheduler):
             print()
         else:
             with tempfile.NamedTemporaryFile() as tmp_submit_script:
-                tmp_submit_script.write(str(script).encode('utf-8'))
-                tmp_submit_script.flush()
+                _write_script(tmp_submit_script, script)
                 try:
-                    subprocess.check_output(submit_cmd + [tmp_submit_script.name],
-                                            universal_newlines=True)
+                    output = subprocess.check_output(submit_cmd + [tmp_submit_script.name],
+                                                     universal_newlines=True)
                 except subprocess.CalledProcessError as e:
                     raise SubmitError("sbatch error: {}".format(e.output))
 
-                return True
+                match = re.search(r'Submitted batch job (\d+)', output)
+                return match.group(1) if match else True
 
     @classmethod
     def is_present(cls):
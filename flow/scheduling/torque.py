@@ -6,74 +6,96 @@
 This module implements the Scheduler and ClusterJob classes for TORQUE.
 """
 from __future__ import print_function
-import io
 import errno
 import getpass
 import subprocess
 import tempfile
 import logging
-import xml.etree.ElementTree as ET
 
 from .base import Scheduler
 from .base import ClusterJob, JobStatus
+from .base import _write_script
 from ..errors import SubmitError
 
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_status(s):
+    if s == 'R':
+        return JobStatus.active
+    if s == 'Q':
+        return JobStatus.queued
+    if s == 'C':
+        return JobStatus.inactive
+    if s == 'H':
+        return JobStatus.held
+    return JobStatus.registered
+
+
 def _fetch(user=None):
-    "Fetch the cluster job status information from the TORQUE scheduler."
+    """Fetch the cluster job status information from the TORQUE scheduler.
+
+    The XML output of qstat is parsed incrementally while it is generated.
+    Only the id, name, and state of each job are extracted and all other
+    elements are discarded as soon as they have been parsed.
+    """
+    import xml.etree.ElementTree as ET
+
     if user is None:
         user = getpass.getuser()
-    cmd = "qstat -fx -u {user}".format(user=user)
+    cmd = ['qstat', '-fx', '-t', '-u', user]
     try:
-        result = io.BytesIO(subprocess.check_output(cmd.split()))
-        tree = ET.parse(source=result)
-        return tree.getroot()
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    except (IOError, OSError) as error:
+        if error.errno == errno.ENOENT:
+            raise RuntimeError("Torque not available.")
+        else:
+            raise error
+    fields = dict()
+    root = None
+    try:
+        with process.stdout:
+            for event, element in ET.iterparse(process.stdout, events=('start', 'end')):
+                if root is None:
+                    root = element
+                if event == 'start':
+                    continue
+                if element.tag in ('Job_Id', 'Job_Name', 'job_state'):
+                    fields[element.tag] = element.text
+                elif element.tag == 'Job':
+                    yield TorqueJob(
+                        fields.get('Job_Id'), fields.get('Job_Name'), fields.get('job_state'))
+                    fields = dict()
+                    root.clear()
     except ET.ParseError as error:
         if str(error) == 'no element found: line 1, column 0':
             logger.warn(
                 "No scheduler jobs, from any user(s), were detected. "
                 "This may be the result of a misconfiguration in the "
                 "environment.")
-            # Return empty, but well-formed result:
-            return ET.parse(source=io.BytesIO(b"<Data></Data>"))
         else:
             raise
-    except (IOError, OSError) as error:
-        if error.errno == errno.ENOENT:
-            raise RuntimeError("Torque not available.")
-        else:
-            raise error
+    if process.wait():
+        raise subprocess.CalledProcessError(process.returncode, cmd)
 
 
 class TorqueJob(ClusterJob):
     "Implementation of the abstract ClusterJob class for TORQUE schedulers."
 
-    def __init__(self, node):
-        self.node = node
-
-    def _id(self):
-        return self.node.find('Job_Id').text
-
-    def __str__(self):
-        return str(self._id())
+    def __init__(self, jobid, name, state):
+        super(TorqueJob, self).__init__(jobid, _parse_status(state))
+        self._name = name
 
     def name(self):
-        return self.node.find('Job_Name').text
-
-    def status(self):
-        job_state = self.node.find('job_state').text
-        if job_state == 'R':
-            return JobStatus.active
-        if job_state == 'Q':
-            return JobStatus.queued
-        if job_state == 'C':
-            return JobStatus.inactive
-        if job_state == 'H':
-            return JobStatus.held
-        return JobStatus.registered
+        name = self._name
+        # Elements of job arrays, e.g., '123[4].host', are named after the array and their index.
+        index = self._id().partition('[')[2].partition(']')[0]
+        if index:
+            if name.endswith('-' + index):
+                name = name[:-len(index) - 1]
+            return '{}[{}]'.format(name, index)
+        return name
 
 
 class TorqueScheduler(Scheduler):
@@ -90,16 +112,28 @@ class TorqueScheduler(Scheduler):
     # The standard command used to submit jobs to the TORQUE scheduler.
     submit_cmd = ['qsub']
 
+    array_index_var = 'PBS_ARRAYID'
+    stream_scripts = True
+    query_by_prefix = True
+
     def __init__(self, user=None, **kwargs):
         super(TorqueScheduler, self).__init__(**kwargs)
         self.user = user
 
-    def jobs(self):
-        "Yield cluster jobs by querying the scheduler."
-        self._prevent_dos()
-        nodes = _fetch(user=self.user)
-        for node in nodes.findall('Job'):
-            yield TorqueJob(node)
+    def jobs(self, prefix=None):
+        """Yield cluster jobs by querying the scheduler.
+
+        :param prefix:
+            Only yield cluster jobs with names starting with this prefix.
+        :type prefix:
+            str
+        """
+        def fetch():
+            return [job for job in _fetch(user=self.user)
+                    if not prefix or job.name().startswith(prefix)]
+
+        for job in self._cached_jobs(fetch, self.user, prefix):
+            yield job
 
     def submit(self, script, after=None, pretend=False, hold=False, flags=None, *args, **kwargs):
         """Submit a job script for execution to the scheduler.
@@ -107,9 +141,10 @@ class TorqueScheduler(Scheduler):
         :param script:
             The job script submitted for execution.
         :type script:
-            str
+            str or iterable of str
         :param after:
-            Execute the submitted script after a job with this id has completed.
+            Execute the submitted script after the jobs with these ids, separated
+            by colons, have completed successfully.
         :type after:
             str
         :param pretend:
@@ -133,8 +168,8 @@ class TorqueScheduler(Scheduler):
         submit_cmd = self.submit_cmd + flags
 
         if after is not None:
-            submit_cmd.extend(
-                ['-W', 'depend="afterok:{}"'.format(after.split('.')[0])])
+            submit_cmd.extend(['-W', 'depend=afterok:{}'.format(
+                ':'.join(_id.split('.')[0] for _id in after.split(':')))])
 
         if hold:
             submit_cmd += ['-h']
@@ -145,14 +180,13 @@ class TorqueScheduler(Scheduler):
             print()
         else:
             with tempfile.NamedTemporaryFile() as tmp_submit_script:
-                tmp_submit_script.write(str(script).encode('utf-8'))
-                tmp_submit_script.flush()
+                _write_script(tmp_submit_script, script)
                 try:
                     output = subprocess.check_output(
                         submit_cmd + [tmp_submit_script.name])
                     jobsid = output.decode('utf-8').strip()
                 except subprocess.CalledProcessError as e:
-                    raise SubmitError("qsub error: {}".format(e.output()))
+                    raise SubmitError("qsub error: {}".format(e.output))
             return jobsid
 
     @classmethod
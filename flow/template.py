@@ -13,17 +13,6 @@ import errno
 import logging
 
 from signac.common import six
-try:
-    import jinja2
-    from jinja2 import TemplateNotFound as Jinja2TemplateNotFound
-except ImportError:
-    # Mock exception, which will never be raised.
-    class Jinja2TemplateNotFound(Exception):
-        pass
-
-    JINJA2 = False
-else:
-    JINJA2 = True
 
 from .util.misc import _is_identifier
 
@@ -41,7 +30,9 @@ TEMPLATES = {
 
 def init(alias=None, template=None, root=None, out=None):
     "Initialize a templated FlowProject module."
-    if not JINJA2:
+    try:
+        import jinja2
+    except ImportError:
         raise ValueError("The init() function requires the 'jinja2' package.")
 
     if alias is None:
@@ -14,6 +14,14 @@ set -u
 cd {{ project.config.project_dir }}
 {% endblock %}
 {% block body %}
+{% if array_table %}
+{% if operations[0].directives.omp_num_threads %}
+export OMP_NUM_THREADS={{ operations[0].directives.omp_num_threads }}
+{% endif %}
+
+# Execute the operations of the job array element with index ${{ array_index }}.
+eval "$(awk -F '\t' -v i="${{ array_index }}" 'NR == i {print $2; exit}' "{{ array_table }}")"
+{% else %}
 {% set cmd_suffix = cmd_suffix|default('') ~ (' &' if parallel else '') %}
 {% for operation in operations %}
 {% if operation.directives.nranks and not mpi_prefix %}
@@ -26,6 +34,7 @@ export OMP_NUM_THREADS={{ operation.directives.omp_num_threads }}
 {% endif %}
 {{ mpi_prefix }}{{ cmd_prefix }}{{ operation.cmd }}{{ cmd_suffix }}
 {% endfor %}
+{% endif %}
 {% endblock %}
 {% block footer %}
 {% if parallel %}
@@ -1,7 +1,11 @@
 {% extends "base_script.sh" %}
 {% block header %}
 #!/bin/bash
+{% if array_size %}
+#BSUB -J "{{ id }}[1-{{ array_size }}]"
+{% else %}
 #BSUB -J {{ id }}
+{% endif %}
 {% if partition %}
 #BSUB -q {{ partition }}
 {% endif %}
@@ -2,6 +2,9 @@
 {% block header %}
 #!/bin/bash
 #SBATCH --job-name="{{ id }}"
+{% if array_size %}
+#SBATCH --array=1-{{ array_size }}
+{% endif %}
 {% if partition %}
 #SBATCH --partition={{ partition }}
 {% endif %}
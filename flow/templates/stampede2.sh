@@ -36,7 +36,9 @@
 {% endblock %}
 
 {% block body %}
-{% if ns.use_launcher %}
+{% if array_table %}
+{{ super() -}}
+{% elif ns.use_launcher %}
 {% if parallel %}
 {{("Bundled submission without MPI on Stampede2 is using launcher; the --parallel option is therefore ignored.")|print_warning}}
 {% endif %}
@@ -3,9 +3,9 @@
 {% extends "lsf.sh" %}
 {% set cores_per_node = 42 %}
 {% set gpus_per_node = 6 %}
+{% set nn, plan = operations|plan_resource_sets(cores_per_node, gpus_per_node, parallel) %}
 {% block tasks %}
 {% set threshold = 0 if force else 0.9 %}
-{% set nn = operations|map('guess_resource_sets', cores_per_node, gpus_per_node)|calc_num_nodes(cores_per_node, gpus_per_node) %}
 #BSUB -nnodes {{ nn }}
 {% endblock %}
 {% block header %}
@@ -16,10 +16,13 @@
 {% endif %}
 {% endblock %}
 {% block body %}
+{% if array_table %}
+{% raise "Job arrays are not supported on Summit, since all operations are launched with jsrun." %}
+{% endif %}
 {% set cmd_suffix = cmd_suffix|default('') ~ (' &' if parallel else '') %}
-{% for operation in operations %}
+{% for operation, resource_set in plan %}
 {% set extra_args = operation|jsrun_extra_args %}
-{% set mpi_prefix = "jsrun " ~ operation|guess_resource_sets(cores_per_node, gpus_per_node)|jsrun_options ~ " -d packed -b rs " ~ (extra_args ~ ' ' if extra_args else '') %}
+{% set mpi_prefix = "jsrun " ~ resource_set|jsrun_options ~ " -d packed -b rs " ~ (extra_args ~ ' ' if extra_args else '') %}
 
 # {{ "%s"|format(operation) }}
 {% if operation.directives.omp_num_threads %}
@@ -1,6 +1,9 @@
 {% extends "base_script.sh" %}
 {% block header %}
 #PBS -N {{ id }}
+{% if array_size %}
+#PBS -t 1-{{ array_size }}
+{% endif %}
 {% if walltime %}
 #PBS -l walltime={{ walltime|format_timedelta }}
 {% endif %}
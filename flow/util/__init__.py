@@ -1,7 +1,23 @@
 # Copyright (c) 2018 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
-"Defines the API for the util sub package."
-from . import tabulate, tqdm, misc, translate, template_filters
+"""Defines the API for the util sub package.
+
+The vendored tabulate and tqdm modules are only imported on first access.
+"""
+import sys
+import importlib
+
+from . import misc, translate, template_filters
+
+_LAZY_MODULES = ('tabulate', 'tqdm')
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name in _LAZY_MODULES:
+            return importlib.import_module('.' + name, __name__)
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+else:
+    from . import tabulate, tqdm  # noqa: F401
 
 __all__ = ['tabulate', 'tqdm', 'misc', 'translate', 'template_filters']
@@ -0,0 +1,146 @@
+# Copyright (c) 2019 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""A file-based cache that is shared by all processes of a user.
+
+The cache is located within the user's cache directory, which is determined by
+the ``XDG_CACHE_HOME`` environment variable and defaults to ``~/.cache``.
+Each entry is stored in its own file, which is replaced atomically, and expires
+after a time-to-live (TTL).
+"""
+import os
+import json
+import time
+import uuid
+import errno
+import logging
+from hashlib import sha1
+
+from .misc import _mkdir_p
+
+
+logger = logging.getLogger(__name__)
+
+
+def user_cache_dir():
+    "Return the path of the signac-flow cache directory of the current user."
+    root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'signac-flow')
+
+
+class FileCache(object):
+    """A persistent cache of JSON-serializable values with a time-to-live.
+
+    :param root:
+        The directory in which the cache entries are stored.
+    :type root:
+        str
+    :param ttl:
+        The time-to-live of entries in seconds.
+    :type ttl:
+        float
+    """
+
+    def __init__(self, root, ttl):
+        self.root = root
+        self.ttl = ttl
+
+    def _fn(self, key):
+        return os.path.join(self.root, sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def _key(self, fn):
+        try:
+            with open(fn) as file:
+                return json.load(file).get('key', '')
+        except (IOError, OSError, ValueError):
+            return ''
+
+    def get(self, key, default=None):
+        "Return the value for key or default if there is no unexpired entry."
+        try:
+            with open(self._fn(key)) as file:
+                entry = json.load(file)
+        except (IOError, OSError, ValueError):
+            return default
+        if entry.get('key') != key or time.time() - entry.get('time', 0) > self.ttl:
+            return default
+        return entry['value']
+
+    def set(self, key, value):
+        "Store value for key; errors are logged, since the cache is optional."
+        fn = self._fn(key)
+        tmp = '{}.{}.tmp'.format(fn, uuid.uuid4().hex)
+        try:
+            _mkdir_p(self.root)
+            with open(tmp, 'w') as file:
+                json.dump(dict(key=key, time=time.time(), value=value), file)
+            os.rename(tmp, fn)
+        except (IOError, OSError) as error:
+            logger.debug("Unable to write to cache '{}': {}".format(self.root, error))
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def invalidate(self, key=None, prefix=None):
+        """Remove the entry for key, the entries with keys starting with prefix,
+        or all entries if both are None."""
+        if key is None:
+            try:
+                fns = [os.path.join(self.root, fn) for fn in os.listdir(self.root)]
+            except OSError:
+                return
+            if prefix is not None:
+                fns = [fn for fn in fns if self._key(fn).startswith(prefix)]
+        else:
+            fns = [self._fn(key)]
+        for fn in fns:
+            try:
+                os.unlink(fn)
+            except OSError as error:
+                if error.errno != errno.ENOENT:
+                    raise
+
+
+def template_bytecode_cache(directory):
+    """Return a jinja2 bytecode cache that stores compiled templates in directory.
+
+    The compiled templates are validated against a checksum of the template
+    source, such that modified templates are recompiled. Cache files are
+    replaced atomically and errors are logged, since the cache is optional.
+
+    :param directory:
+        The directory in which the compiled templates are stored.
+    :type directory:
+        str
+    """
+    import jinja2
+
+    class BytecodeCache(jinja2.FileSystemBytecodeCache):
+
+        def load_bytecode(self, bucket):
+            try:
+                super(BytecodeCache, self).load_bytecode(bucket)
+            except Exception as error:
+                logger.debug("Unable to load compiled template: {}".format(error))
+                bucket.reset()
+
+        def dump_bytecode(self, bucket):
+            fn = self._get_cache_filename(bucket)
+            tmp = '{}.{}.tmp'.format(fn, uuid.uuid4().hex)
+            try:
+                _mkdir_p(self.directory)
+                with open(tmp, 'wb') as file:
+                    bucket.write_bytecode(file)
+                os.rename(tmp, fn)
+            except (IOError, OSError) as error:
+                logger.debug("Unable to store compiled template: {}".format(error))
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+    return BytecodeCache(directory, '__flow_%s.cache')
+
+
+__all__ = ['FileCache', 'user_cache_dir', 'template_bytecode_cache']
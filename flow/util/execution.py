@@ -1,6 +1,8 @@
 # Copyright (c) 2018 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
+import os
+import time
 import subprocess
 from signac.common import six
 
@@ -14,14 +16,55 @@ else:
 
 
 def fork(cmd, timeout=None):
-    "Helper function for py2/3 compatible execution of forked processes."
-    if timeout is not None:
-        raise RuntimeError("Executing with a timeout is not supported in Python 2.7.")
+    """Helper function for py2/3 compatible execution of forked processes.
 
+    :returns:
+        The exit status of the forked process.
+    """
     if six.PY2:
-        subprocess.call(cmd, shell=True)
+        if timeout is not None:
+            raise RuntimeError("Executing with a timeout is not supported in Python 2.7.")
+        return subprocess.call(cmd, shell=True)
     else:
-        subprocess.call(cmd, shell=True, timeout=timeout)
+        return subprocess.call(cmd, shell=True, timeout=timeout)
+
+
+def _exit_status(status):
+    "Convert a wait status into an exit status as reported by subprocess."
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def fork_with_usage(cmd, timeout=None):
+    """Execute a forked process and measure its resource usage.
+
+    The resource usage is obtained for the forked process and its descendants
+    only, unlike the usage of all children of the current process.
+
+    :returns:
+        A tuple of the exit status of the forked process and its resource
+        usage as returned by :func:`os.wait4`, or None where not available.
+    """
+    if not hasattr(os, 'wait4'):
+        return fork(cmd, timeout), None
+    if six.PY2 and timeout is not None:
+        raise RuntimeError("Executing with a timeout is not supported in Python 2.7.")
+    process = subprocess.Popen(cmd, shell=True)
+    deadline = None if timeout is None else time.time() + timeout
+    delay = 0.001
+    while True:
+        pid, status, usage = os.wait4(process.pid, 0 if deadline is None else os.WNOHANG)
+        if pid:
+            break
+        if time.time() > deadline:
+            process.kill()
+            process.wait()
+            raise TimeoutExpired(cmd, timeout)
+        time.sleep(delay)
+        delay = min(2 * delay, 0.1)
+    process.returncode = _exit_status(status)
+    return process.returncode, usage
 
 
-__all__ = ['fork', 'TimeoutExpired']
+__all__ = ['fork', 'fork_with_usage', 'TimeoutExpired']
@@ -0,0 +1,230 @@
+# Copyright (c) 2019 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Expiring file system leases to claim work across processes and nodes.
+
+A lease is a small file that is created atomically with a hard link, which is
+safe on NFS and Lustre file systems, unlike O_EXCL on older NFS versions.
+Leases are kept alive by a heartbeat thread that periodically updates the
+modification time of all leases held by the current process. A lease that has
+not been renewed within its time-to-live (TTL) is considered expired and may be
+broken by other processes, e.g., after the owning process was killed.
+
+The TTL should be significantly larger than the attribute cache timeout of the
+underlying network file system (typically up to 60 seconds).
+"""
+import os
+import json
+import time
+import uuid
+import errno
+import socket
+import logging
+import threading
+from hashlib import sha1
+
+from .misc import _mkdir_p
+
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseManager(object):
+    """Acquire and maintain leases for arbitrary keys within a directory.
+
+    :param root:
+        The directory in which the lease files are stored.
+    :type root:
+        str
+    :param ttl:
+        The time-to-live of a lease in seconds; leases that were not renewed
+        within this time are considered expired.
+    :type ttl:
+        float
+    """
+    DEFAULT_TTL = 300
+
+    def __init__(self, root, ttl=None):
+        self.root = root
+        self.ttl = self.DEFAULT_TTL if ttl is None else ttl
+        self._init_process_state()
+
+    def _init_process_state(self):
+        "Initialize the state that is specific to the current process."
+        self._pid = os.getpid()
+        self._owner = '{}:{}:{}'.format(socket.gethostname(), self._pid, uuid.uuid4().hex)
+        self._held = dict()     # key -> reference count
+        self._lock = threading.Lock()
+        self._heartbeat = None
+        self._stop = threading.Event()
+
+    def _check_process(self):
+        "Reset the process-specific state in forked processes."
+        if self._pid != os.getpid():
+            self._init_process_state()
+
+    def __getstate__(self):
+        return dict(root=self.root, ttl=self.ttl)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_process_state()
+
+    def _fn(self, key):
+        return os.path.join(self.root, sha1(key.encode('utf-8')).hexdigest())
+
+    def _read(self, fn):
+        "Return the content of the lease file fn or None if it does not exist."
+        try:
+            with open(fn) as file:
+                return json.load(file)
+        except (IOError, OSError) as error:
+            if error.errno == errno.ENOENT:
+                return None
+            raise
+        except ValueError:  # The lease file is being written or corrupted.
+            return dict()
+
+    def _expired(self, fn):
+        try:
+            return time.time() - os.stat(fn).st_mtime > self.ttl
+        except OSError as error:
+            if error.errno == errno.ENOENT:
+                return True
+            raise
+
+    def _create(self, fn, key):
+        "Atomically create the lease file fn; return True on success."
+        tmp = '{}.{}.tmp'.format(fn, uuid.uuid4().hex)
+        with open(tmp, 'w') as file:
+            json.dump(dict(key=key, owner=self._owner), file)
+        try:
+            try:
+                os.link(tmp, fn)
+            except OSError:
+                pass    # The link count is checked below, since the error may be spurious on NFS.
+            return os.stat(tmp).st_nlink == 2
+        finally:
+            os.unlink(tmp)
+
+    def _break(self, fn):
+        "Remove the expired lease file fn."
+        broken = '{}.{}.broken'.format(fn, uuid.uuid4().hex)
+        try:
+            os.rename(fn, broken)
+        except OSError:
+            return  # Another process broke the lease first.
+        if not self._expired(broken):
+            # The lease was renewed or re-acquired in the meantime, try to restore it.
+            try:
+                os.link(broken, fn)
+            except OSError:
+                pass
+        os.unlink(broken)
+
+    def acquire(self, key):
+        """Try to acquire the lease for key.
+
+        Leases are reentrant within the same process.
+
+        :param key:
+            The key to acquire the lease for.
+        :type key:
+            str
+        :returns:
+            True if the lease was acquired, otherwise False.
+        """
+        self._check_process()
+        with self._lock:
+            if key in self._held:
+                self._held[key] += 1
+                return True
+        _mkdir_p(self.root)
+        fn = self._fn(key)
+        for _ in range(2):
+            if self._create(fn, key):
+                break
+            if not self._expired(fn):
+                return False
+            logger.info("Breaking expired lease for '{}'.".format(key))
+            self._break(fn)
+        else:
+            return False
+        with self._lock:
+            self._held[key] = 1
+            self._start_heartbeat()
+        return True
+
+    def release(self, key):
+        "Release the lease for key, which must have been acquired by this process."
+        self._check_process()
+        with self._lock:
+            self._held[key] -= 1
+            if self._held[key] > 0:
+                return
+            del self._held[key]
+        fn = self._fn(key)
+        if (self._read(fn) or dict()).get('owner') == self._owner:
+            try:
+                os.unlink(fn)
+            except OSError:
+                pass
+
+    def held(self, key):
+        "Return True if this process holds the lease for key."
+        self._check_process()
+        return key in self._held
+
+    def claimed(self, key):
+        "Return True if the lease for key is held by any process and not expired."
+        return os.path.exists(self._fn(key)) and not self._expired(self._fn(key))
+
+    def active(self):
+        """Return all keys with active leases.
+
+        :returns:
+            A mapping of keys to the owner of the respective lease.
+        """
+        try:
+            fns = os.listdir(self.root)
+        except OSError:
+            return dict()
+        result = dict()
+        for fn in fns:
+            if '.' in fn:   # temporary files
+                continue
+            fn = os.path.join(self.root, fn)
+            lease = self._read(fn)
+            if lease and 'key' in lease and not self._expired(fn):
+                result[lease['key']] = lease['owner']
+        return result
+
+    def _renew(self):
+        "Renew all leases held by this process."
+        with self._lock:
+            keys = list(self._held)
+        for key in keys:
+            fn = self._fn(key)
+            if (self._read(fn) or dict()).get('owner') == self._owner:
+                try:
+                    os.utime(fn, None)
+                    continue
+                except OSError:
+                    pass
+            logger.warning("Lost lease for '{}'.".format(key))
+
+    def _start_heartbeat(self):
+        if self._heartbeat is None:
+            self._heartbeat = threading.Thread(target=self._run_heartbeat)
+            self._heartbeat.daemon = True
+            self._heartbeat.start()
+
+    def _run_heartbeat(self):
+        while not self._stop.wait(self.ttl / 3.0):
+            try:
+                self._renew()
+            except Exception as error:
+                logger.warning("Failed to renew leases: {}".format(error))
+
+
+__all__ = ['LeaseManager']
@@ -0,0 +1,114 @@
+# Copyright (c) 2019 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Content-addressed cache for the outputs of operations.
+
+The outputs of an operation are stored in a directory that is named after a
+hash of all quantities that determine the outputs, that means the operation's
+name and source code, the job's state point, and the content of all input files.
+"""
+import os
+import json
+import uuid
+import errno
+import shutil
+import inspect
+import logging
+from hashlib import sha1
+
+from .misc import _mkdir_p
+
+
+logger = logging.getLogger(__name__)
+
+
+def _source(func):
+    "Return the source code of func or its byte code if the source is not available."
+    try:
+        return inspect.getsource(func).encode('utf-8')
+    except (IOError, OSError, TypeError):
+        return func.__code__.co_code
+
+
+def _hash_file(fn, blocksize=1 << 20):
+    h = sha1()
+    with open(fn, 'rb') as file:
+        for chunk in iter(lambda: file.read(blocksize), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class MemoCache(object):
+    """A content-addressed cache for files produced by operations.
+
+    :param root:
+        The directory in which the cached files are stored.
+    :type root:
+        str
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    @staticmethod
+    def key(name, func, job, inputs):
+        """Compute the cache key for the execution of an operation.
+
+        :param name:
+            The name of the operation.
+        :param func:
+            The operation function.
+        :param job:
+            The job the operation is executed for.
+        :param inputs:
+            The file names of the input files, relative to the job's workspace.
+        :returns:
+            The cache key.
+        :rtype:
+            str
+        """
+        h = sha1()
+        h.update(name.encode('utf-8'))
+        h.update(_source(func))
+        h.update(json.dumps(job.statepoint(), sort_keys=True).encode('utf-8'))
+        for fn in sorted(inputs):
+            h.update(fn.encode('utf-8'))
+            h.update(_hash_file(job.fn(fn)).encode('utf-8'))
+        return h.hexdigest()
+
+    def _fn(self, key):
+        return os.path.join(self.root, key)
+
+    def restore(self, key, outputs, workspace):
+        """Copy the cached outputs for key into workspace.
+
+        :returns:
+            True if all outputs were restored, otherwise False.
+        """
+        src = self._fn(key)
+        if not all(os.path.isfile(os.path.join(src, fn)) for fn in outputs):
+            return False
+        for fn in outputs:
+            dst = os.path.join(workspace, fn)
+            _mkdir_p(os.path.dirname(dst))
+            shutil.copy2(os.path.join(src, fn), dst)
+        return True
+
+    def store(self, key, outputs, workspace):
+        "Store copies of the outputs located in workspace under key."
+        if os.path.isdir(self._fn(key)):
+            return
+        tmp = '{}.{}.tmp'.format(self._fn(key), uuid.uuid4().hex)
+        try:
+            for fn in outputs:
+                dst = os.path.join(tmp, fn)
+                _mkdir_p(os.path.dirname(dst))
+                shutil.copy2(os.path.join(workspace, fn), dst)
+            os.rename(tmp, self._fn(key))
+        except (IOError, OSError) as error:
+            if getattr(error, 'errno', None) not in (errno.EEXIST, errno.ENOTEMPTY):
+                logger.warning("Unable to store outputs in cache: {}".format(error))
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+__all__ = ['MemoCache']
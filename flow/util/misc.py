@@ -3,10 +3,12 @@
 # This software is licensed under the BSD 3-Clause License.
 import os
 import re
+import time
 import errno
 import json
 import argparse
 import logging
+import threading
 from contextlib import contextmanager
 
 from signac.common import six
@@ -195,6 +197,25 @@ class TrackGetItemDict(dict):
         return self._keys_used.copy()
 
 
+class _RateLimiter(object):
+    "Space the returns from wait() at least 1/rate seconds apart across all threads."
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def wait(self, rate):
+        "Block until the next call is permitted; a rate of zero means unlimited."
+        if not rate:
+            return
+        with self._lock:
+            now = time.time()
+            delay = self._next - now
+            self._next = max(now, self._next) + 1.0 / rate
+        if delay > 0:
+            time.sleep(delay)
+
+
 # Remove this after we drop Python 2.7 support:
 def fullmatch(regex, string, flags=0):
     """Emulate python-3.4 re.fullmatch()."""
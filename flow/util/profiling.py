@@ -0,0 +1,242 @@
+# Copyright (c) 2019 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Record and summarize the resource usage of executed job-operations.
+
+Profile records are stored in a compact, append-only format with one JSON
+record per line. Each host writes to its own file to avoid interleaved
+writes from different nodes on shared file systems.
+"""
+import os
+import sys
+import json
+import math
+import time
+import socket
+import logging
+from contextlib import contextmanager
+
+from .misc import _mkdir_p
+
+try:
+    import resource
+except ImportError:  # The resource module is not available on all platforms.
+    resource = None
+
+
+logger = logging.getLogger(__name__)
+
+
+# Environment variables that indicate the MPI rank of the current process.
+_MPI_RANK_VARIABLES = ('OMPI_COMM_WORLD_RANK', 'PMI_RANK', 'PMIX_RANK', 'MV2_COMM_WORLD_RANK')
+
+
+def _mpi_rank():
+    "Return the MPI rank of this process as indicated by the environment or 0."
+    for var in _MPI_RANK_VARIABLES:
+        if var in os.environ:
+            try:
+                return int(os.environ[var])
+            except ValueError:
+                pass
+    return 0
+
+
+def _cpu_time():
+    "Return the total CPU time (in seconds) of the current process."
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _kilobytes(maxrss):
+    "Return the max. resident set size reported by getrusage() in kB."
+    if sys.platform == 'darwin':
+        return maxrss // 1024   # reported in bytes instead of kilobytes
+    return maxrss
+
+
+def _maxrss():
+    "Return the max. resident set size (in kB) of the current process."
+    if resource is None:
+        return None
+    return _kilobytes(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def usage_record(usage):
+    """Return the CPU time and max. resident set size recorded for a resource usage.
+
+    :param usage:
+        The resource usage of a single forked process, e.g., as returned by
+        :func:`os.wait4`, or None if not available.
+    :returns:
+        A dictionary with the CPU time (in seconds) and the max. resident
+        set size (in kB).
+    """
+    if usage is None:
+        return dict(cpu=None, maxrss=None)
+    return dict(cpu=round(usage.ru_utime + usage.ru_stime, 6),
+                maxrss=_kilobytes(usage.ru_maxrss))
+
+
+def percentile(values, q):
+    """Return the q-th percentile of values with the nearest-rank method.
+
+    :param values:
+        The values, which must be sorted in ascending order.
+    :type values:
+        list
+    :param q:
+        The percentile within the range [0, 100].
+    :type q:
+        float
+    """
+    if not values:
+        return None
+    rank = int(math.ceil(q / 100.0 * len(values)))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+class ProfileStore(object):
+    """A per-project store of job-operation profile records.
+
+    :param root:
+        The directory in which the records are stored.
+    :type root:
+        str
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _fn_records(self):
+        return os.path.join(self.root, '{}.jsonl'.format(socket.gethostname()))
+
+    def add(self, record):
+        "Append a single record to the store."
+        _mkdir_p(self.root)
+        line = (json.dumps(record, sort_keys=True, separators=(',', ':')) + '\n').encode()
+        # A single write on a file opened in append mode is not interleaved
+        # with the writes of other processes on the same host.
+        fd = os.open(self._fn_records(), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def __iter__(self):
+        try:
+            fns = sorted(os.listdir(self.root))
+        except OSError:
+            return
+        for fn in fns:
+            if not fn.endswith('.jsonl'):
+                continue
+            with open(os.path.join(self.root, fn)) as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:  # Most likely an incomplete line.
+                        logger.debug("Skipping corrupted profile record in '{}'.".format(fn))
+
+    @contextmanager
+    def profile(self, name, job, forked=False):
+        """Profile the execution of a job-operation within this context.
+
+        The wall time, CPU time, max. resident set size and exit status are
+        recorded when the context is exited. The yielded dictionary may be used
+        to set the exit status and resource usage of forked processes explicitly.
+
+        For operations executed within the current process, the max. resident
+        set size is the high-water mark of the whole process at the end of the
+        execution, which includes the memory used prior to the operation.
+
+        :param name:
+            The name of the operation.
+        :type name:
+            str
+        :param job:
+            The id of the job the operation is executed for.
+        :type job:
+            str
+        :param forked:
+            The operation is executed in a forked process, whose resource usage
+            is set by the caller (see :func:`usage_record`).
+        :type forked:
+            bool
+        """
+        record = dict(op=name, job=job, status=0, cpu=None, maxrss=None)
+        cpu_start = None if forked else _cpu_time()
+        start = time.time()
+        try:
+            yield record
+        except BaseException:
+            record['status'] = 1
+            raise
+        finally:
+            if _mpi_rank() == 0:
+                record['start'] = round(start, 3)
+                record['wall'] = round(time.time() - start, 6)
+                if cpu_start is not None:
+                    record['cpu'] = round(_cpu_time() - cpu_start, 6)
+                if not forked:
+                    record['maxrss'] = _maxrss()
+                try:
+                    self.add(record)
+                except (IOError, OSError) as error:
+                    logger.warning("Unable to store profile record: {}".format(error))
+
+    def estimates(self):
+        """Estimate the duration of job-operations from the recorded wall times.
+
+        :returns:
+            A tuple of the median wall time per operation name and the last
+            recorded wall time per (operation name, job id) pair.
+        """
+        walltimes = dict()
+        latest = dict()
+        for record in self:
+            if record.get('status'):
+                continue    # Failed executions are not representative.
+            walltimes.setdefault(record['op'], []).append(record['wall'])
+            latest[(record['op'], record['job'])] = record['wall']
+        medians = {name: percentile(sorted(values), 50) for name, values in walltimes.items()}
+        return medians, latest
+
+    def summary(self, names=None):
+        """Summarize the recorded wall times per operation.
+
+        :param names:
+            Only summarize the records of the operations with the given names.
+        :type names:
+            Sequence of :class:`str`
+        :returns:
+            A mapping of operation names to dictionaries with the number of
+            records, failures, and the p50, p95 and max wall time and max. RSS.
+        """
+        walltimes = dict()
+        failures = dict()
+        maxrss = dict()
+        for record in self:
+            name = record['op']
+            if names is not None and name not in names:
+                continue
+            walltimes.setdefault(name, []).append(record['wall'])
+            failures[name] = failures.get(name, 0) + bool(record.get('status'))
+            if record.get('maxrss') is not None:
+                maxrss[name] = max(maxrss.get(name, 0), record['maxrss'])
+        summary = dict()
+        for name, values in walltimes.items():
+            values.sort()
+            summary[name] = dict(
+                count=len(values),
+                failed=failures[name],
+                p50=percentile(values, 50),
+                p95=percentile(values, 95),
+                max=values[-1],
+                maxrss=maxrss.get(name))
+        return summary
+
+
+__all__ = ['ProfileStore', 'percentile', 'usage_record']
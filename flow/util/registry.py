@@ -0,0 +1,170 @@
+# Copyright (c) 2019 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""A registry of the operations of submitted bundles.
+
+Each bundle is stored in its own small file, which is written atomically once
+on submission and only read afterwards, since a shared database file cannot be
+locked reliably on network file systems such as NFS and Lustre. Bundles that
+are no longer reported by the scheduler are removed lazily, at most once per
+collection interval, based on the modification time of their file.
+"""
+import os
+import json
+import time
+import uuid
+import errno
+import logging
+from hashlib import sha1
+
+from .misc import _mkdir_p
+
+
+logger = logging.getLogger(__name__)
+
+
+class BundleRegistry(object):
+    """A registry of the operation ids of bundles and job arrays.
+
+    Each bundle consists of one or more elements, where a regular bundle has
+    exactly one element and a job array has one element per array index.
+
+    :param root:
+        The directory in which the bundle files are stored.
+    :type root:
+        str
+    """
+    # The maximum time in seconds between two collections of expired bundles.
+    COLLECT_INTERVAL = 3600
+
+    def __init__(self, root):
+        self.root = root
+
+    def _fn(self, bundle_id):
+        return os.path.join(self.root, sha1(bundle_id.encode('utf-8')).hexdigest() + '.json')
+
+    def _read(self, bundle_id):
+        "Return the elements of the bundle or None if it is not registered."
+        try:
+            with open(self._fn(bundle_id)) as file:
+                entry = json.load(file)
+        except (IOError, OSError, ValueError):
+            return None
+        return entry['elements'] if entry.get('id') == bundle_id else None
+
+    def add(self, bundle_id, elements):
+        """Register a bundle.
+
+        :param bundle_id:
+            The id of the bundle.
+        :type bundle_id:
+            str
+        :param elements:
+            The operation ids of each element of the bundle.
+        :type elements:
+            A sequence of sequences of str
+        """
+        fn = self._fn(bundle_id)
+        tmp = '{}.{}.tmp'.format(fn, uuid.uuid4().hex)
+        _mkdir_p(self.root)
+        try:
+            with open(tmp, 'w') as file:
+                json.dump(dict(id=bundle_id, elements=[list(ids) for ids in elements]), file)
+            os.rename(tmp, fn)
+        except (IOError, OSError):
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def lookup(self, bundle_ids):
+        """Look up the operations of the given bundles.
+
+        The registry is not modified by a lookup.
+
+        :param bundle_ids:
+            The ids of the bundles.
+        :returns:
+            A mapping of the ids of all registered bundles to the operation ids
+            of their elements.
+        :rtype:
+            dict
+        """
+        result = dict()
+        for bundle_id in set(bundle_ids):
+            elements = self._read(bundle_id)
+            if elements is not None:
+                result[bundle_id] = elements
+        return result
+
+    def collection_due(self, grace):
+        """Determine whether expired bundles should be collected now.
+
+        Collections are due at most once per collection interval, or once per
+        grace period if that is shorter. The time of the collection is recorded
+        when it is due, which is the only write to the registry apart from the
+        registration of bundles.
+
+        :param grace:
+            The grace period in seconds.
+        :type grace:
+            float
+        """
+        if not os.path.isdir(self.root):
+            return True     # Nothing was registered yet, so there is nothing to record.
+        fn = os.path.join(self.root, '.collected')
+        try:
+            if time.time() - os.stat(fn).st_mtime < min(grace, self.COLLECT_INTERVAL):
+                return False
+        except OSError as error:
+            if error.errno != errno.ENOENT:
+                raise
+        try:
+            with open(fn, 'w'):
+                pass
+        except (IOError, OSError) as error:
+            logger.debug("Unable to record the bundle collection: {}".format(error))
+            return False
+        return True
+
+    def collect(self, grace, active):
+        """Remove all inactive bundles that were registered before the grace period.
+
+        :param grace:
+            The grace period in seconds.
+        :type grace:
+            float
+        :param active:
+            The ids of the bundles that are reported by the scheduler.
+        :type active:
+            set
+        :returns:
+            The ids of the removed bundles.
+        :rtype:
+            list
+        """
+        if not os.path.isdir(self.root):
+            return []
+        threshold = time.time() - grace
+        removed = []
+        for fn in os.listdir(self.root):
+            if not fn.endswith('.json'):
+                continue
+            path = os.path.join(self.root, fn)
+            try:
+                if os.path.getmtime(path) >= threshold:
+                    continue
+                with open(path) as file:
+                    bundle_id = json.load(file)['id']
+                if bundle_id not in active:
+                    os.unlink(path)
+                    removed.append(bundle_id)
+            except (IOError, OSError, ValueError, KeyError):
+                pass    # The file was removed by another process or is corrupted.
+        if removed:
+            logger.debug("Removed {} expired bundle(s) from the registry.".format(len(removed)))
+        return removed
+
+
+__all__ = ['BundleRegistry']
@@ -160,6 +160,53 @@ def calc_num_nodes(np, ppn=1, threshold=0, name=None):
     return check_utilization(nn, np, ppn, threshold, name)
 
 
+def pack_resource_sets(resource_sets, cores_per_node, gpus_per_node=0, sort=True):
+    """Calculate the number of nodes required to place resource sets at the same time.
+
+    Resource sets are never split across nodes. Each resource set is placed on
+    the first node with sufficient free cores and GPUs, where the largest resource
+    sets are placed first unless sort is False.
+
+    :param resource_sets:
+        Tuples of the number of resource sets, and the number of tasks, cores,
+        and GPUs per resource set.
+    :param cores_per_node:
+        Number of cores available per node.
+    :param gpus_per_node:
+        Number of GPUs available per node.
+    :param sort:
+        If False, the resource sets are placed in the given order.
+    :returns:
+        The number of required nodes.
+    :raises SubmitError:
+        If GPUs are requested, but the nodes do not provide any GPUs.
+    """
+    def size(cores, gpus):
+        return max(cores / cores_per_node, gpus / gpus_per_node if gpus else 0)
+
+    sets = [(cores, gpus) for nsets, _, cores, gpus in resource_sets for _ in range(nsets)]
+    if not gpus_per_node and any(gpus for _, gpus in sets):
+        raise SubmitError(
+            "Resource sets request GPUs, but the nodes do not provide any GPUs.")
+    if sort:
+        sets.sort(key=lambda s: size(*s), reverse=True)
+    free = []       # the free cores and GPUs of each node
+    oversized = 0
+    for cores, gpus in sets:
+        if cores > cores_per_node or gpus > gpus_per_node:
+            # Resource sets that exceed a single node are placed on dedicated nodes.
+            oversized += int(ceil(size(cores, gpus)))
+            continue
+        for node in free:
+            if node[0] >= cores and node[1] >= gpus:
+                node[0] -= cores
+                node[1] -= gpus
+                break
+        else:
+            free.append([cores_per_node - cores, gpus_per_node - gpus])
+    return len(free) + oversized
+
+
 def print_warning(msg):
     """Print warning message within jinja2 template
 
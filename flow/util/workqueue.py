@@ -0,0 +1,99 @@
+# Copyright (c) 2019 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""A file system queue of work items that is shared by processes on multiple nodes.
+
+Each item is stored in its own file, which is created atomically by renaming a
+temporary file, such that items can be added and removed concurrently without
+locking. The queue does not claim items by itself, processes that consume items
+are expected to claim them with a lease (see :class:`~.LeaseManager`) and to
+remove them once they are processed.
+"""
+import os
+import json
+import time
+import uuid
+import errno
+import logging
+from hashlib import sha1
+
+from .misc import _mkdir_p
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkQueue(object):
+    """A queue of JSON-serializable work items identified by a key.
+
+    :param root:
+        The directory in which the items are stored.
+    :type root:
+        str
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _fn(self, key):
+        return os.path.join(self.root, sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def put(self, items):
+        """Add items to the queue, replacing items with the same key.
+
+        :param items:
+            The keys and values of the items in the order in which they should
+            be processed.
+        :type items:
+            Iterable of tuples of str and a JSON-serializable value.
+        """
+        _mkdir_p(self.root)
+        queued = time.time()
+        for index, (key, value) in enumerate(items):
+            fn = self._fn(key)
+            tmp = '{}.{}.tmp'.format(fn, uuid.uuid4().hex)
+            with open(tmp, 'w') as file:
+                json.dump(dict(key=key, value=value, queued=queued, index=index), file)
+            os.rename(tmp, fn)
+
+    def items(self):
+        """Return all items in the order in which they were added.
+
+        :returns:
+            A list of tuples of the key and the value of each item.
+        """
+        try:
+            fns = os.listdir(self.root)
+        except OSError:
+            return []
+        entries = []
+        for fn in fns:
+            if not fn.endswith('.json'):
+                continue    # temporary files
+            try:
+                with open(os.path.join(self.root, fn)) as file:
+                    entries.append(json.load(file))
+            except (IOError, OSError) as error:
+                if error.errno != errno.ENOENT:     # removed in the meantime
+                    raise
+            except ValueError:
+                logger.warning("Ignoring corrupted queue item '{}'.".format(fn))
+        entries.sort(key=lambda entry: (entry['queued'], entry['index']))
+        return [(entry['key'], entry['value']) for entry in entries]
+
+    def remove(self, key):
+        "Remove the item with the given key from the queue if it exists."
+        try:
+            os.unlink(self._fn(key))
+        except OSError as error:
+            if error.errno != errno.ENOENT:
+                raise
+
+    def __contains__(self, key):
+        return os.path.exists(self._fn(key))
+
+    def __len__(self):
+        return len(self.items())
+
+
+__all__ = ['WorkQueue']
@@ -1,13 +1,58 @@
 # Copyright (c) 2017 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
+import os
 import unittest
 
+import flow.environment
 from flow import get_environment
 from flow.environment import ComputeEnvironment
 from flow.environment import TestEnvironment
+from flow.environment import StandardEnvironment
+from flow.environment import SimpleSchedulerEnvironment
+from flow.environment import invalidate_environment_cache
 from flow.errors import ConfigKeyError
-from test_project import StringIO, redirect_stdout
+from flow.errors import SubmitError
+from flow.scheduling.base import Scheduler
+from flow.scheduling.base import ClusterJob
+from flow.scheduling.base import JobStatus
+from test_project import StringIO, redirect_stdout, isolate_environ, mock
+
+
+class CountingEnvironment(ComputeEnvironment):
+    num_checks = 0
+
+    @classmethod
+    def is_present(cls):
+        cls.num_checks += 1
+        return False
+
+
+class FlakyScheduler(Scheduler):
+    errors = []
+    queued = []
+    queue_on_error = False
+    num_submissions = 0
+
+    def jobs(self):
+        return [ClusterJob(name, JobStatus.queued) for name in self.queued]
+
+    def submit(self, script, _id=None, **kwargs):
+        type(self).num_submissions += 1
+        if self.errors:
+            if self.queue_on_error:
+                self.queued.append(_id)
+            raise SubmitError(self.errors.pop(0))
+        self.queued.append(_id)
+        return '42'
+
+    @classmethod
+    def is_present(cls):
+        return False
+
+
+class FlakyEnvironment(ComputeEnvironment):
+    scheduler_type = FlakyScheduler
 
 
 class ProjectTest(unittest.TestCase):
@@ -32,6 +77,97 @@ class ProjectTest(unittest.TestCase):
         a = env.get_config_value('a', 42)
         self.assertEqual(a, 42)
 
+    def test_environment_cache(self):
+        isolate_environ(self)
+        CountingEnvironment.num_checks = 0
+        env = get_environment()
+        self.assertEqual(CountingEnvironment.num_checks, 1)
+        self.assertIs(get_environment(), env)
+        self.assertEqual(CountingEnvironment.num_checks, 1)
+        invalidate_environment_cache()
+        self.assertIs(get_environment(), env)
+        self.assertEqual(CountingEnvironment.num_checks, 2)
+
+    def test_environment_cache_variables(self):
+        isolate_environ(self)
+        os.environ.pop('SIGNAC_FLOW_ENVIRONMENT', None)
+        os.environ.pop('SIMPLE_SCHEDULER', None)
+        registry = {'SimpleSchedulerEnvironment': SimpleSchedulerEnvironment}
+        with mock.patch.dict(ComputeEnvironment.registry, registry, clear=True):
+            self.assertIs(get_environment(import_configured=False), StandardEnvironment)
+            # The cached result is not used once the detection variables change.
+            os.environ['SIMPLE_SCHEDULER'] = 'echo'
+            self.assertIs(get_environment(import_configured=False), SimpleSchedulerEnvironment)
+            del os.environ['SIMPLE_SCHEDULER']
+            self.assertIs(get_environment(import_configured=False), StandardEnvironment)
+
+    def test_submit_retries(self):
+        retry_delay = flow.environment.SUBMIT_RETRY_DELAY
+        flow.environment.SUBMIT_RETRY_DELAY = 0
+        self.addCleanup(setattr, flow.environment, 'SUBMIT_RETRY_DELAY', retry_delay)
+
+        isolate_environ(self)
+
+        def submit(errors, queue_on_error=False, **kwargs):
+            FlakyScheduler.num_submissions = 0
+            FlakyScheduler.errors = list(errors)
+            FlakyScheduler.queue_on_error = queue_on_error
+            del FlakyScheduler.queued[:]
+            return FlakyEnvironment.submit('script', **kwargs)
+
+        # Submissions are retried if the scheduler can not be reached.
+        unreachable = 'sbatch: error: Unable to contact slurm controller (connect failure)'
+        self.assertEqual(submit([unreachable]), '42')
+        self.assertEqual(FlakyScheduler.num_submissions, 2)
+        with self.assertRaises(SubmitError):
+            submit(['sbatch: error: Resource temporarily unavailable'] * 10)
+        self.assertEqual(FlakyScheduler.num_submissions, flow.environment.SUBMIT_RETRIES + 1)
+
+        # Submissions that timed out are only repeated if the cluster job was not queued.
+        timeout = 'sbatch: error: Socket timed out on send/recv operation'
+        self.assertEqual(submit([timeout], _id='project/op'), '42')
+        self.assertEqual(FlakyScheduler.num_submissions, 2)
+        self.assertIs(submit([timeout], queue_on_error=True, _id='project/op'), True)
+        self.assertEqual(FlakyScheduler.num_submissions, 1)
+        self.assertEqual(FlakyScheduler.queued, ['project/op'])
+        with self.assertRaises(SubmitError):
+            submit([timeout])
+        self.assertEqual(FlakyScheduler.num_submissions, 1)
+
+        # Other errors are not retried.
+        for error in ('sbatch: error: Invalid account', 'sbatch: error: Node is busy'):
+            with self.assertRaises(SubmitError):
+                submit([error], _id='project/op')
+            self.assertEqual(FlakyScheduler.num_submissions, 1)
+
+    def test_summit_plan_resource_sets(self):
+        from flow.environments.incite import SummitEnvironment
+
+        class Operation(object):
+            def __init__(self, **directives):
+                self.directives = directives
+
+        # Each operation uses a single resource set with one GPU.
+        ops = [Operation(np=np, ngpu=1) for np in (6, 20, 30, 22)]
+        nn, plan = SummitEnvironment.plan_resource_sets(ops, 42, 6, parallel=True)
+        self.assertEqual(nn, 2)
+        self.assertEqual([op.directives['np'] for op, _ in plan], [30, 22, 20, 6])
+        self.assertEqual(plan[0][1], (1, 1, 30, 1))
+
+        # Operations executed in sequence share the nodes.
+        ops = [Operation(np=30, ngpu=1), Operation(np=30, ngpu=1)]
+        nn, plan = SummitEnvironment.plan_resource_sets(ops, 42, 6, parallel=False)
+        self.assertEqual(nn, 1)
+        self.assertEqual([op for op, _ in plan], ops)
+        nn, _ = SummitEnvironment.plan_resource_sets(ops, 42, 6, parallel=True)
+        self.assertEqual(nn, 2)
+
+    def test_pack_resource_sets_without_gpus(self):
+        from flow.util.template_filters import pack_resource_sets
+        self.assertEqual(pack_resource_sets([(2, 1, 30, 0)], 42), 2)
+        with self.assertRaises(SubmitError):
+            pack_resource_sets([(1, 1, 6, 1)], 42, gpus_per_node=0)
+
 
 if __name__ == '__main__':
     unittest.main()
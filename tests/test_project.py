@@ -9,9 +9,13 @@ import uuid
 import os
 import sys
 import inspect
+import argparse
 import subprocess
 import tempfile
+import time
+import datetime
 from contextlib import contextmanager
+from collections import defaultdict
 from distutils.version import StrictVersion
 
 import signac
@@ -22,18 +26,29 @@ from flow.scheduling.base import Scheduler
 from flow.scheduling.base import ClusterJob
 from flow.scheduling.base import JobStatus
 from flow.environment import ComputeEnvironment
+from flow.environment import TestEnvironment
+from flow.errors import SubmitError
+from flow.errors import NoSchedulerError
 from flow.util.misc import add_path_to_environment_pythonpath
 from flow.util.misc import add_cwd_to_environment_pythonpath
 from flow.util.misc import switch_to_directory
+from flow.util.lease import LeaseManager
+from flow.project import _aggregate_jobs
+from flow.project import JobOperation
+from flow.project import pack_bundles
+from flow.project import fit_bundles
 from flow import init
+from flow.util.profiling import resource
 
 from define_test_project import TestProject
 from define_test_project import TestDynamicProject
 
 if six.PY2:
     from tempdir import TemporaryDirectory
+    import mock
 else:
     from tempfile import TemporaryDirectory
+    from unittest import mock
 
 
 # Need to implement context managers below while supporting
@@ -75,6 +90,24 @@ def suspend_logging():
         logging.disable(logging.NOTSET)
 
 
+def isolate_environ(testcase):
+    """Revert changes of the environment variables after the test.
+
+    The user cache directory is set to a temporary directory and the scheduler
+    query cache is cleared after the test.
+
+    :returns:
+        The path of the temporary directory.
+    """
+    tmp_dir = TemporaryDirectory()
+    testcase.addCleanup(tmp_dir.cleanup)
+    patcher = mock.patch.dict(os.environ, {'XDG_CACHE_HOME': tmp_dir.name})
+    patcher.start()
+    testcase.addCleanup(patcher.stop)
+    testcase.addCleanup(Scheduler._query_cache.clear)
+    return tmp_dir.name
+
+
 class StringIO(io.StringIO):
     "PY27 compatibility layer."
 
@@ -88,6 +121,8 @@ class StringIO(io.StringIO):
 class MockScheduler(Scheduler):
     _jobs = {}  # needs to be singleton
     _scripts = {}
+    _after = {}
+    array_index_var = 'MOCK_ARRAY_INDEX'
 
     @classmethod
     def jobs(cls):
@@ -95,18 +130,26 @@ class MockScheduler(Scheduler):
             yield job
 
     @classmethod
-    def submit(cls, script, _id=None, *args, **kwargs):
+    def submit(cls, script, _id=None, array_size=None, after=None, *args, **kwargs):
         if _id is None:
             for line in script:
                 _id = str(line).strip()
                 break
-        cid = uuid.uuid4()
-        cls._jobs[cid] = ClusterJob(_id, status=JobStatus.submitted)
         signac_path = os.path.dirname(os.path.dirname(os.path.abspath(signac.__file__)))
         flow_path = os.path.dirname(os.path.dirname(os.path.abspath(flow.__file__)))
         pythonpath = ':'.join(os.environ.get('PYTHONPATH', []) + [signac_path, flow_path])
-        cls._scripts[cid] = 'export PYTHONPATH={}\n'.format(pythonpath) + script
-        return JobStatus.submitted
+        if array_size is None:
+            elements = [(_id, '')]
+        else:
+            elements = [('{}[{}]'.format(_id, i), 'export MOCK_ARRAY_INDEX={}\n'.format(i))
+                        for i in range(1, array_size + 1)]
+        for name, export in elements:
+            cid = str(uuid.uuid4())
+            cls._jobs[cid] = ClusterJob(name, status=JobStatus.submitted)
+            cls._scripts[cid] = 'export PYTHONPATH={}\n'.format(pythonpath) + export + script
+            if after is not None:
+                cls._after[cid] = after.split(':')
+        return cid if array_size is None else JobStatus.submitted
 
     @classmethod
     def step(cls):
@@ -119,6 +162,9 @@ class MockScheduler(Scheduler):
                 if job._status in (JobStatus.submitted, JobStatus.held):
                     job._status = JobStatus(job._status + 1)
                 elif job._status == JobStatus.queued:
+                    if any(dep in cls._jobs and cls._jobs[dep]._status != JobStatus.inactive
+                           for dep in cls._after.get(cid, ())):
+                        continue    # wait for the dependencies
                     job._status = JobStatus.active
                     try:
                         with tempfile.NamedTemporaryFile() as tmpfile:
@@ -144,6 +190,7 @@ class MockScheduler(Scheduler):
     @classmethod
     def reset(cls):
         cls._jobs.clear()
+        cls._after.clear()
 
 
 class MockEnvironment(ComputeEnvironment):
@@ -154,6 +201,33 @@ class MockEnvironment(ComputeEnvironment):
         return True
 
 
+class PostProcessingEnvironment(MockEnvironment):
+    scripts = []
+
+    @classmethod
+    def submit(cls, script, *args, **kwargs):
+        cls.scripts.append(script)
+        return super(PostProcessingEnvironment, cls).submit(script, *args, **kwargs)
+
+
+class StreamingScheduler(Scheduler):
+    stream_scripts = True
+    scripts = []
+
+    @classmethod
+    def submit(cls, script, *args, **kwargs):
+        cls.scripts.append(script)
+        return JobStatus.submitted
+
+    @classmethod
+    def is_present(cls):
+        return False
+
+
+class StreamingEnvironment(ComputeEnvironment):
+    scheduler_type = StreamingScheduler
+
+
 class BaseProjectTest(unittest.TestCase):
     project_class = signac.Project
 
@@ -209,6 +283,81 @@ class ProjectStatusPerformanceTest(BaseProjectTest):
         MockScheduler.reset()
 
 
+class ProjectExecStartupTest(BaseProjectTest):
+    project_class = TestProject
+    # The time in seconds to execute a single operation ten times.
+    EXEC_TIME_BUDGET = 5
+
+    def test_exec_startup(self):
+        '''Ensure that the exec command does not detect the environment and starts fast.'''
+        import timeit
+
+        project = self.mock_project()
+        job = next(iter(project))
+
+        def get_environment(*args, **kwargs):
+            raise AssertionError("The environment must not be detected for 'exec'.")
+
+        argv = sys.argv
+        get_environment_ = flow.project.get_environment
+        flow.project.get_environment = get_environment
+        try:
+            sys.argv = ['project.py', 'exec', 'op2', job.get_id()]
+            time = timeit.timeit(
+                lambda: self.project_class.get_project(root=self._tmp_dir.name).main(),
+                number=10)
+        finally:
+            sys.argv = argv
+            flow.project.get_environment = get_environment_
+        self.assertTrue(job.doc.test)
+        # The budget is generous, it only catches the construction of the full
+        # parser or the evaluation of the whole project on start-up.
+        self.assertLess(time, self.EXEC_TIME_BUDGET)
+
+
+class LazyImportTest(unittest.TestCase):
+    # The import time of flow in seconds, excluding the import of signac. The
+    # budget is generous, it only catches imports of whole (optional) packages.
+    IMPORT_TIME_BUDGET = 0.5
+
+    def _python(self, *args):
+        return subprocess.check_output(
+            [sys.executable] + list(args), stderr=subprocess.STDOUT).decode()
+
+    def _imported_modules(self, statement):
+        return set(self._python(
+            '-c', statement + '; import sys; print(" ".join(sys.modules))').split())
+
+    def test_lazy_imports(self):
+        modules = self._imported_modules('import flow')
+        for module in ('jinja2', 'flow.util.tabulate', 'flow.util.tqdm', 'xml.etree'):
+            self.assertNotIn(module, modules)
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'requires module __getattr__ (PEP 562)')
+    def test_lazy_scheduler_imports(self):
+        modules = self._imported_modules('import flow')
+        for module in ('flow.scheduling.fakescheduler', 'flow.scheduling.simple_scheduler',
+                       'flow.scheduling.lsf', 'flow.scheduling.slurm', 'flow.scheduling.torque'):
+            self.assertNotIn(module, modules)
+        # The multiprocessing.pool module is already imported by signac.
+        signac_modules = self._imported_modules('import signac')
+        self.assertNotIn('multiprocessing.pool', modules - signac_modules)
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'requires python -X importtime')
+    def test_import_time(self):
+        def import_time():
+            cumulative = dict()
+            for line in self._python('-X', 'importtime', '-c', 'import flow').splitlines():
+                if line.startswith('import time:') and '|' in line:
+                    _, us, name = line.split('|')
+                    if us.strip().isdigit():
+                        cumulative[name.strip()] = int(us) * 1e-6
+            return cumulative['flow'] - cumulative.get('signac', 0)
+
+        # The first import may compile the byte code.
+        self.assertLess(min(import_time() for _ in range(3)), self.IMPORT_TIME_BUDGET)
+
+
 class ProjectClassTest(BaseProjectTest):
 
     def test_operation_definition(self):
@@ -423,7 +572,7 @@ class ProjectTest(BaseProjectTest):
         for job in project:
             labels = list(project.classify(job))
             self.assertEqual(len(labels), 2 - (job.sp.b % 2))
-            self.assertTrue(all((isinstance(l, str)) for l in labels))
+            self.assertTrue(all((isinstance(label, str)) for label in labels))
             self.assertIn('default_label', labels)
             self.assertNotIn('negative_default_label', labels)
 
@@ -500,6 +649,96 @@ class ProjectTest(BaseProjectTest):
                 self.assertNotIn('echo "hello"', script)
                 self.assertIn('exec op2', script)
 
+    def test_script_fuses_operations(self):
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post.true('a')
+        def op_a(job):
+            pass    # The post-condition is not met.
+
+        @Project.operation
+        @Project.post.true('b')
+        def op_b(job):
+            job.doc.b = True
+
+        @Project.operation
+        @directives(np=2)
+        def op_c(job):
+            pass
+
+        project = Project(self.mock_project().config)
+        job = next(iter(project))
+        script = project.script(project.next_operations(job))
+        self.assertNotIn('--then', script)
+        script = project.script(project.next_operations(job), fuse=True)
+        self.assertIn('exec op_a {} --then op_b\n'.format(job), script)
+        self.assertIn('exec op_c {}\n'.format(job), script)
+        script = project.script(project.next_operations(job), parallel=True, fuse=True)
+        self.assertNotIn('--then', script)
+
+        # Fused operations are only executed if the preceding post-conditions are met:
+        with suspend_logging():
+            project._main_exec(argparse.Namespace(
+                operation='op_a', jobid=[job.get_id()], then=['op_b']))
+        self.assertNotIn('b', job.doc)
+        job.doc.a = True
+        project._main_exec(argparse.Namespace(
+            operation='op_a', jobid=[job.get_id()], then=['op_b']))
+        self.assertTrue(job.doc.b)
+
+    def test_script_combines_jobs(self):
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post.true('a')
+        def op_a(job):
+            if job.sp.b == 1:
+                raise RuntimeError("Failure for a single job.")
+            job.doc.a = True
+
+        @Project.operation
+        @directives(nranks=2)
+        def op_mpi(job):
+            pass
+
+        project = Project(self.mock_project().config)
+        jobs = list(project.find_jobs(dict(a=0)))
+        ids = ' '.join(job.get_id() for job in jobs)
+        operations = list(project.next_operations(*jobs))
+        script = project.script(operations)
+        self.assertEqual(script.count('exec op_a'), 3)
+        script = project.script(operations, fuse=True)
+        self.assertEqual(script.count('exec op_a'), 1)
+        self.assertIn('exec op_a {}\n'.format(ids), script)
+        self.assertEqual(script.count('exec op_mpi'), 3)
+        script = project.script(operations, parallel=True, fuse=True)
+        self.assertIn('exec op_a {} --parallel 3 &\n'.format(ids), script)
+        self.assertEqual(script.count('exec op_mpi'), 3)
+
+        # Operations without the 'np' directive request at least one process each.
+        for op in operations:
+            op.directives['np'] = None
+        fused = list(project._fuse_operations(operations, parallel=True))
+        self.assertEqual(fused[0].directives['np'], 3)
+
+        # Errors are isolated per job:
+        project = Project(project.config)
+        with suspend_logging():
+            with self.assertRaises(RuntimeError):
+                project._main_exec(argparse.Namespace(
+                    operation='op_a', jobid=[job.get_id() for job in jobs], parallel=2))
+        self.assertEqual([job.doc.get('a', False) for job in jobs],
+                         [job.sp.b != 1 for job in jobs])
+
+        # The original pickling error is raised if cloudpickle is not available.
+        with mock.patch.dict(sys.modules, {'cloudpickle': None}):
+            with self.assertRaises((six.moves.cPickle.PicklingError, AttributeError, TypeError)):
+                project._main_exec(argparse.Namespace(
+                    operation='op_a', jobid=[job.get_id() for job in jobs], parallel=2))
+
     def test_init(self):
         with open(os.devnull, 'w') as out:
             for fn in init(root=self._tmp_dir.name, out=out):
@@ -581,6 +820,297 @@ class ExecutionProjectTest(BaseProjectTest):
             else:
                 self.assertFalse(job.isfile('world.txt'))
 
+    def test_run_profile(self):
+        project = self.mock_project()
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    project.run(names=['op1', 'op2'])
+        records = list(project._profile_store())
+        even_jobs = [job for job in project if job.sp.b % 2 == 0]
+        self.assertEqual(len([r for r in records if r['op'] == 'op1']), len(even_jobs))
+        self.assertEqual(len([r for r in records if r['op'] == 'op2']), len(project))
+        for record in records:
+            self.assertEqual(record['status'], 0)
+            self.assertGreaterEqual(record['wall'], 0)
+            self.assertIn(record['job'], {job.get_id() for job in project})
+        summary = project._profile_store().summary()
+        self.assertEqual(summary['op2']['count'], len(project))
+        self.assertLessEqual(summary['op2']['p50'], summary['op2']['p95'])
+        self.assertLessEqual(summary['op2']['p95'], summary['op2']['max'])
+        output = StringIO()
+        project.print_profile(slowest=2, file=output)
+        self.assertIn('op1', output.getvalue())
+        self.assertIn('op2', output.getvalue())
+
+    def test_profile_forked_usage(self):
+        from flow.util.execution import fork_with_usage
+        from flow.util.profiling import usage_record
+        store = self.mock_project()._profile_store()
+        commands = ['"{}" -c "x = bytearray(200 * 2 ** 20)"'.format(sys.executable), 'true']
+        for command in commands:
+            with store.profile('op', 'job', forked=True) as record:
+                record['status'], usage = fork_with_usage(command)
+                record.update(usage_record(usage))
+        with store.profile('op', 'job'):
+            pass
+        heavy, light, direct = list(store)
+        self.assertEqual([heavy['status'], light['status']], [0, 0])
+        # The peak memory usage is measured for each forked process separately.
+        self.assertGreater(heavy['maxrss'], 200 * 1024)
+        self.assertLess(light['maxrss'], 100 * 1024)
+        # The high-water mark of the current process is recorded for direct executions.
+        self.assertGreater(direct['maxrss'], 0)
+        self.assertEqual(fork_with_usage('exit 3')[0], 3)
+
+    @unittest.skipIf(resource is None, 'requires the resource module')
+    def test_exec_profile_usage(self):
+        project = self.mock_project()
+        job = next(iter(project))
+        project._main_exec(argparse.Namespace(operation='op2', jobid=[job.get_id()]))
+        record, = project._profile_store()
+        self.assertEqual(record['op'], 'op2')
+        self.assertIsInstance(record['maxrss'], int)
+        self.assertGreater(record['maxrss'], 0)
+
+    def test_hooks(self):
+        project = self.mock_project()
+        events = defaultdict(list)
+        project.hooks.on_start.append(lambda op: events['start'].append(op))
+        project.hooks.on_success.append(lambda op, elapsed: events['success'].append(op))
+        project.hooks.on_condition_evaluated.append(
+            lambda name, job, eligible, elapsed: events['condition'].append((name, eligible)))
+        project.hooks.on_submit.append(
+            lambda _id, ops, status, elapsed: events['submit'].append(status))
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    project.run(names=['op2'])
+        self.assertEqual(len(events['start']), len(project))
+        self.assertEqual(events['start'], events['success'])
+        self.assertIn(('op2', True), events['condition'])
+        self.assertIn(('op1', False), events['condition'])
+        MockScheduler.reset()
+        with redirect_stderr(StringIO()):
+            project.submit(names=['op1'])
+        self.assertEqual(len(events['submit']), len(list(MockScheduler.jobs())))
+        self.assertTrue(all(status == JobStatus.submitted for status in events['submit']))
+        MockScheduler.reset()
+
+    def test_hooks_on_exception(self):
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        def failing_op(job):
+            raise RuntimeError(job)
+
+        project = Project(self.mock_project().config)
+        errors = []
+        project.hooks.on_exception.append(
+            lambda op, error, elapsed: errors.append((op.name, error)))
+        with redirect_stderr(StringIO()):
+            with self.assertRaises(RuntimeError):
+                project.run()
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0][0], 'failing_op')
+        self.assertIsInstance(errors[0][1], RuntimeError)
+
+    def test_order_operations(self):
+        project = self.mock_project()
+        operations = list(project._get_pending_operations(project, ['op2']))
+        self.assertEqual(project._order_operations(operations), operations)
+        with self.assertRaises(ValueError):
+            project._order_operations(operations, 'unknown-policy')
+
+        for i, job in enumerate(project):
+            job.doc.priority = i % 3
+        ordered = project._order_operations(operations, 'priority')
+        priorities = [op.job.doc.priority for op in ordered]
+        self.assertEqual(priorities, sorted(priorities, reverse=True))
+
+        store = project._profile_store()
+        for i, op in enumerate(operations):
+            store.add(dict(op=op.name, job=str(op.job), wall=float(i), status=0))
+        ordered = project._order_operations(operations, 'lpt')
+        self.assertEqual(ordered, list(reversed(operations)))
+
+        ordered = project._order_operations(operations, lambda op: -op.job.sp.b)
+        bs = [op.job.sp.b for op in ordered]
+        self.assertEqual(bs, sorted(bs))
+
+    def test_order_operations_by_declared_cost(self):
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @directives(cost=lambda job: job.sp.b)
+        def op_with_cost(job):
+            pass
+
+        project = Project(self.mock_project().config)
+        ordered = project._order_operations(project.next_operations(*project), 'lpt')
+        bs = [op.job.sp.b for op in ordered]
+        self.assertEqual(bs, sorted(bs, reverse=True))
+
+    def test_lease_manager(self):
+        root = os.path.join(self._tmp_dir.name, 'leases')
+        leases = LeaseManager(root, ttl=60)
+        other = LeaseManager(root, ttl=60)
+        self.assertTrue(leases.acquire('a'))
+        self.assertTrue(leases.acquire('a'))    # reentrant
+        self.assertFalse(other.acquire('a'))
+        self.assertTrue(other.claimed('a'))
+        self.assertEqual(list(other.active()), ['a'])
+        leases.release('a')
+        self.assertTrue(leases.held('a'))
+        leases.release('a')
+        self.assertFalse(leases.held('a'))
+        self.assertFalse(other.claimed('a'))
+        self.assertTrue(other.acquire('a'))
+        # Expired leases are broken by other processes:
+        past = time.time() - 120
+        os.utime(other._fn('a'), (past, past))
+        self.assertFalse(leases.claimed('a'))
+        self.assertTrue(leases.acquire('a'))
+        self.assertEqual(leases.active(), {'a': leases._owner})
+
+    def test_run_respects_leases(self):
+        project = self.mock_project()
+        other = LeaseManager(project._leases.root)
+        operations = list(project._get_pending_operations(project, ['op2']))
+        claimed = operations[0]
+        self.assertTrue(other.acquire(claimed.get_id()))
+        self.assertFalse(project.eligible_for_submission(claimed))
+        self.assertTrue(project.eligible_for_submission(operations[1]))
+        status = project.get_job_status(claimed.job)
+        self.assertEqual(status['operations']['op2']['scheduler_status'], JobStatus.active)
+        with redirect_stderr(StringIO()):
+            project.run(names=['op2'])
+        self.assertFalse(claimed.job.doc.get('test', False))
+        self.assertTrue(all(op.job.doc.get('test') for op in operations[1:]))
+        other.release(claimed.get_id())
+        with redirect_stderr(StringIO()):
+            project.run(names=['op2'])
+        self.assertTrue(claimed.job.doc.get('test', False))
+        self.assertEqual(project._leases.active(), dict())
+
+    def test_memoize(self):
+        class Project(FlowProject):
+            pass
+
+        executions = []
+
+        @Project.operation(memoize=True)
+        @Project.pre.isfile('input.txt')
+        @Project.post.isfile('output.txt')
+        def memoized_op(job):
+            executions.append(job.get_id())
+            with open(job.fn('output.txt'), 'w') as file:
+                file.write(job.get_id() + open(job.fn('input.txt')).read())
+
+        with self.assertRaises(ValueError):
+            @Project.operation(memoize=True)
+            def op_without_outputs(job):
+                pass
+
+        project = Project(self.mock_project().config)
+        for job in project:
+            with open(job.fn('input.txt'), 'w') as file:
+                file.write('a')
+        with redirect_stderr(StringIO()):
+            project.run()
+        self.assertEqual(len(executions), len(project))
+
+        # Outputs are restored instead of executing the operation again:
+        for job in project:
+            os.remove(job.fn('output.txt'))
+        with redirect_stderr(StringIO()):
+            project.run()
+        self.assertEqual(len(executions), len(project))
+        for job in project:
+            with open(job.fn('output.txt')) as file:
+                self.assertEqual(file.read(), job.get_id() + 'a')
+
+        # Changed inputs require the execution of the operation:
+        job = next(iter(project))
+        os.remove(job.fn('output.txt'))
+        with open(job.fn('input.txt'), 'w') as file:
+            file.write('b')
+        with redirect_stderr(StringIO()):
+            project.run()
+        self.assertEqual(len(executions), len(project) + 1)
+        with open(job.fn('output.txt')) as file:
+            self.assertEqual(file.read(), job.get_id() + 'b')
+
+    def test_aggregate(self):
+        class Project(FlowProject):
+            pass
+
+        calls = []
+
+        @Project.operation(aggregate='a')
+        @Project.post.true('analyzed')
+        def analyze(jobs):
+            calls.append(sorted(job.sp.b for job in jobs))
+            for job in jobs:
+                job.doc.analyzed = True
+
+        @Project.operation(aggregate=True)
+        @Project.pre.after(analyze)
+        @Project.post(lambda jobs: all(job.doc.get('summarized') for job in jobs))
+        def summarize(jobs):
+            for job in jobs:
+                job.doc.summarized = len(jobs)
+
+        for invalid in (0, [], object()):
+            with self.assertRaises(ValueError):
+                Project.operation(aggregate=invalid)(lambda jobs: None)
+
+        project = Project(self.mock_project().config)
+        operations = list(project.next_operations(*project))
+        self.assertEqual([op.name for op in operations], ['analyze'] * 3)
+        self.assertEqual(len({op.get_id() for op in operations}), 3)
+        for op in operations:
+            self.assertEqual(len({job.sp.a for job in op.jobs}), 1)
+            self.assertTrue(all(job.get_id() in op.cmd for job in op.jobs))
+        status = project.get_job_status(operations[0].job)
+        self.assertTrue(status['operations']['analyze']['eligible'])
+        self.assertFalse(status['operations']['summarize']['eligible'])
+
+        with redirect_stderr(StringIO()):
+            project.run()
+        self.assertEqual(calls, [[0, 1, 2]] * 3)
+        for job in project:
+            self.assertEqual(job.doc.summarized, len(project))
+            status = project.get_job_status(job)
+            self.assertTrue(status['operations']['analyze']['completed'])
+            self.assertTrue(status['operations']['summarize']['completed'])
+
+        # Batches of a fixed size:
+        batches = _aggregate_jobs(4, project)
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 1])
+        self.assertEqual(_aggregate_jobs(4, reversed(list(project))), batches)
+
+    def test_aggregate_job_status(self):
+        class Project(FlowProject):
+            pass
+
+        evaluated = []
+
+        @Project.operation(aggregate='a')
+        @Project.pre(lambda jobs: evaluated.append(jobs) or True)
+        def analyze(jobs):
+            pass
+
+        project = Project(self.mock_project().config)
+        job = next(iter(project))
+        status = project.get_job_status(job)
+        self.assertTrue(status['operations']['analyze']['eligible'])
+        # Only the conditions of the aggregate that contains the job are evaluated.
+        self.assertEqual(len(evaluated), 1)
+        self.assertIn(job, evaluated[0])
+
     def test_submit_operations(self):
         MockScheduler.reset()
         project = self.mock_project()
@@ -593,6 +1123,31 @@ class ExecutionProjectTest(BaseProjectTest):
             project.submit_operations(_id=cluster_job_id, operations=operations)
         self.assertEqual(len(list(MockScheduler.jobs())), 1)
 
+    def test_submit_stream(self):
+        project = self.mock_project()
+        operations = [op for job in project for op in project.next_operations(job)]
+        del StreamingScheduler.scripts[:]
+        with redirect_stderr(StringIO()):
+            status = project.submit_operations(operations=operations, env=StreamingEnvironment)
+        self.assertEqual(status, JobStatus.submitted)
+        script, = StreamingScheduler.scripts
+        self.assertNotIsInstance(script, six.string_types)
+        chunks = list(script)
+        self.assertGreater(len(chunks), 1)
+        for op in operations:
+            self.assertIn(op.job.get_id(), ''.join(chunks))
+        self.assertEqual(str(script), ''.join(chunks))
+
+    def test_template_bytecode_cache(self):
+        cache_home = isolate_environ(self)
+        project = self.mock_project()
+        context = dict(project=project, base_script='base_script.sh',
+                       operations=[], parallel=False)
+        template = project._setup_template_environment().get_template('script.sh')
+        self.assertTrue(os.listdir(os.path.join(cache_home, 'signac-flow', 'templates')))
+        cached = project._setup_template_environment().get_template('script.sh')
+        self.assertEqual(cached.render(**context), template.render(**context))
+
     def test_submit(self):
         MockScheduler.reset()
         project = self.mock_project()
@@ -604,6 +1159,49 @@ class ExecutionProjectTest(BaseProjectTest):
         self.assertEqual(len(list(MockScheduler.jobs())), num_jobs_submitted)
         MockScheduler.reset()
 
+    def test_submit_environment_override(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        operations = list(project.next_operations(next(iter(project))))
+        del PostProcessingEnvironment.scripts[:]
+        with redirect_stderr(StringIO()):
+            status = project.submit_operations(
+                operations=operations, env=PostProcessingEnvironment)
+        self.assertEqual(status, JobStatus.submitted)
+        self.assertEqual(len(PostProcessingEnvironment.scripts), 1)
+        self.assertEqual(len(list(MockScheduler.jobs())), 1)
+        MockScheduler.reset()
+
+    def test_submit_concurrent(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        with redirect_stderr(StringIO()):
+            project.submit(max_in_flight=4)
+        even_jobs = [job for job in project if job.sp.b % 2 == 0]
+        self.assertEqual(len(list(MockScheduler.jobs())), len(project) + len(even_jobs))
+        for job in project:
+            for op in project.next_operations(job):
+                self.assertEqual(op.get_status(), JobStatus.submitted)
+
+        # Errors are raised after all concurrent submissions have finished.
+        bundles = [[op] for job in project for op in project.next_operations(job)]
+        with redirect_stderr(StringIO()):
+            with self.assertRaises(NoSchedulerError):
+                list(project._submit_bundles(bundles, max_in_flight=2, env=ComputeEnvironment))
+
+        # The status of successful submissions is stored if a submission fails.
+        project.document._status.clear()
+
+        def submissions():
+            for bundle in bundles[:2]:
+                yield bundle, JobStatus.submitted
+            raise SubmitError()
+
+        with self.assertRaises(SubmitError):
+            project._store_submission_status(submissions())
+        self.assertEqual(bundles[1][0].get_status(), JobStatus.submitted)
+        self.assertEqual(bundles[2][0].get_status(), JobStatus.unknown)
+
     def test_submit_bad_names_argument(self):
         MockScheduler.reset()
         project = self.mock_project()
@@ -658,6 +1256,389 @@ class ExecutionProjectTest(BaseProjectTest):
             project.submit(bundle_size=0)
             self.assertEqual(len(list(MockScheduler.jobs())), 1)
 
+    def test_submit_chain(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        with redirect_stderr(StringIO()):
+            project.submit(chain=True, names=['op1'])
+        num_ops = len([job for job in project if job.sp.b % 2 == 0])
+        # Only the dynamic project declares an operation to be executed after op1.
+        num_chained = num_ops if 'op3' in project.operations else 0
+        cids = {sjob.name(): cid for cid, sjob in MockScheduler._jobs.items()}
+        self.assertEqual(len(cids), num_ops + num_chained)
+        self.assertEqual(len(MockScheduler._after), num_chained)
+        for job in project:
+            if job.sp.b % 2 == 0 and num_chained:
+                ops = {op.name: op for op in project._job_operations(job, False)}
+                self.assertEqual(MockScheduler._after[cids[ops['op3'].get_id()]],
+                                 [cids[ops['op1'].get_id()]])
+                self.assertEqual(ops['op3'].get_status(), JobStatus.submitted)
+
+        # The chained operations are executed once the operations they depend on completed.
+        for _ in range(4):
+            MockScheduler.step()
+        self.assertEqual(len([job for job in project if job.sp.get('dynamic')]), num_chained)
+
+        with self.assertRaises(SubmitError):
+            project.submit(chain=True, array=True)
+
+    def test_bundle_registry(self):
+        project = self.mock_project()
+        ids = [op.get_id() for job in project for op in project.next_operations(job)]
+        registry = project._bundle_registry()
+        bundle_ids = ['{}/bundle/{}'.format(project, i) for i in range(2)]
+        registry.add(bundle_ids[0], [ids[:2]])
+        registry.add(bundle_ids[1], [ids[2:4]])
+        self.assertEqual(registry.lookup(bundle_ids + ['unknown']),
+                         {bundle_ids[0]: [ids[:2]], bundle_ids[1]: [ids[2:4]]})
+        scheduler_jobs = [ClusterJob(bid, JobStatus.queued) for bid in bundle_ids]
+        self.assertEqual([sjob.name() for sjob in project._expand_bundled_jobs(scheduler_jobs)],
+                         ids[:4])
+
+        # The registry is only read by status queries and collected at most once per interval.
+        def registry_files():
+            return {fn: os.path.getmtime(os.path.join(registry.root, fn))
+                    for fn in os.listdir(registry.root)}
+
+        files = registry_files()
+        self.assertEqual(len(list(project._expand_bundled_jobs(scheduler_jobs))), 4)
+        self.assertEqual(registry_files(), files)
+        self.assertFalse(registry.collection_due(flow.project.BUNDLE_GC_GRACE))
+
+        # Bundles stored in their own file are still expanded.
+        legacy_id = '{}/bundle/legacy'.format(project)
+        fn_legacy = project._fn_bundle(legacy_id)
+        os.makedirs(os.path.dirname(fn_legacy))
+        with open(fn_legacy, 'w') as file:
+            file.write('\n'.join(ids[4:6]) + '\n')
+        self.assertEqual([sjob.name() for sjob in project._expand_bundled_jobs(
+            [ClusterJob(legacy_id, JobStatus.queued)])], ids[4:6])
+
+        # Bundles that are no longer reported by the scheduler are removed.
+        grace = flow.project.BUNDLE_GC_GRACE
+        flow.project.BUNDLE_GC_GRACE = 0.2
+        self.addCleanup(setattr, flow.project, 'BUNDLE_GC_GRACE', grace)
+        time.sleep(0.3)
+        self.assertEqual(len(list(project._expand_bundled_jobs(scheduler_jobs[:1]))), 2)
+        self.assertEqual(list(registry.lookup(bundle_ids)), [bundle_ids[0]])
+        self.assertFalse(os.path.exists(fn_legacy))
+        time.sleep(0.3)
+        self.assertEqual(list(project._expand_bundled_jobs([])), [])
+        self.assertEqual(registry.lookup(bundle_ids), dict())
+
+    def test_submit_array(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        with redirect_stderr(StringIO()):
+            project.submit(bundle_size=2, array=True, names=['op1'])
+        num_ops = len([job for job in project if job.sp.b % 2 == 0])
+        sjobs = list(MockScheduler.jobs())
+        self.assertEqual(len(sjobs), (num_ops + 1) // 2)
+        self.assertEqual(len({sjob.name().partition('[')[0] for sjob in sjobs}), 1)
+        for job in project:
+            for op in project.next_operations(job):
+                if op.name == 'op1':
+                    self.assertEqual(op.get_status(), JobStatus.submitted)
+
+        # The elements are mapped back to the job-operations.
+        scheduler_jobs = list(project.scheduler_jobs(MockScheduler))
+        self.assertEqual(len(scheduler_jobs), num_ops)
+        self.assertEqual(len({sjob.name() for sjob in scheduler_jobs}), num_ops)
+
+        # Each element executes the operations of its bundle.
+        for _ in range(3):
+            MockScheduler.step()
+        for job in project:
+            self.assertEqual(job.isfile('world.txt'), job.sp.b % 2 == 0)
+
+        with self.assertRaises(SubmitError):
+            project.submit(array=True, env=TestEnvironment)
+
+    def test_pack_bundles(self):
+        project = self.mock_project()
+        job = next(iter(project))
+
+        def ops(n, **directives):
+            return [JobOperation('op', job, 'true', directives) for _ in range(n)]
+
+        # Serial operations fill one node, larger operations are not mixed in.
+        bundles = list(pack_bundles(ops(10) + ops(2, np=16), cores_per_node=4))
+        self.assertEqual([len(b) for b in bundles], [4, 4, 2, 1, 1])
+        self.assertTrue(all(len({op.directives['np'] for op in b}) == 1 for b in bundles))
+
+        # Bundles are homogeneous in their OpenMP/MPI layout and GPU operations
+        # are limited by the number of GPUs per node.
+        bundles = list(pack_bundles(
+            ops(4, omp_num_threads=2) + ops(4, nranks=2) + ops(4, ngpu=1),
+            cores_per_node=4, gpus_per_node=2))
+        self.assertEqual([len(b) for b in bundles], [2, 2, 2, 2, 2, 2])
+        for bundle in bundles:
+            self.assertEqual(len({tuple(sorted(dict.items(op.directives)))
+                                  for op in bundle}), 1)
+
+        # MPI operations may span multiple nodes to reach the target utilization.
+        bundles = list(pack_bundles(ops(8, nranks=20), cores_per_node=28))
+        self.assertEqual([len(b) for b in bundles], [4, 4])     # 80 of 84 cores on 3 nodes
+        bundles = list(pack_bundles(ops(8, omp_num_threads=20), cores_per_node=28))
+        self.assertEqual([len(b) for b in bundles], [1] * 8)
+
+        # Operations of similar duration are bundled together.
+        mixed = [op for i in range(4) for op in ops(1, walltime=i % 2 + 1)]
+        bundles = list(pack_bundles(
+            mixed, cores_per_node=2, duration=lambda op: op.directives['walltime']))
+        self.assertEqual([[op.directives['walltime'] for op in b] for b in bundles],
+                         [[2, 2], [1, 1]])
+
+    def test_fit_bundles(self):
+        bundles = fit_bundles([3, 5, 1, 3, 4, 2, 10], walltime=6, duration=lambda d: d)
+        self.assertEqual(bundles, [[10], [5, 1], [4, 2], [3, 3]])
+
+    def test_submit_auto_walltime(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        directives = project.operations['op2'].directives
+        project.operations['op2'].directives = dict(cost=600)
+        self.addCleanup(setattr, project.operations['op2'], 'directives', directives)
+
+        walltimes = []
+        original, submit = MockScheduler.__dict__['submit'], MockScheduler.submit
+
+        def record(script, walltime=None, **kwargs):
+            walltimes.append(walltime)
+            return submit(script, **kwargs)
+
+        MockScheduler.submit = staticmethod(record)
+        self.addCleanup(setattr, MockScheduler, 'submit', original)
+        with redirect_stderr(StringIO()):
+            project.submit(names=['op2'], walltime=1, auto_walltime=True)
+        # Five operations with an estimated duration of 10 minutes fit into one hour.
+        self.assertEqual(len(list(MockScheduler.jobs())), 2)
+        self.assertEqual(sorted(walltimes),
+                         [datetime.timedelta(minutes=48), datetime.timedelta(minutes=60)])
+
+    def test_submit_pack(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        with self.assertRaises(SubmitError):
+            project.submit(pack=True, env=MockEnvironment)
+
+        MockEnvironment.cores_per_node = 2
+        self.addCleanup(delattr, MockEnvironment, 'cores_per_node')
+        with redirect_stderr(StringIO()):
+            project.submit(pack=True, names=['op1'], env=MockEnvironment)
+        num_ops = len([job for job in project if job.sp.b % 2 == 0])
+        self.assertEqual(len(list(MockScheduler.jobs())), (num_ops + 1) // 2)
+
+    def test_submit_pilot(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        with redirect_stderr(StringIO()):
+            project.submit(pilot=2, names=['op1'])
+        self.assertEqual(len(list(MockScheduler.jobs())), 2)
+        even_jobs = [job for job in project if job.sp.b % 2 == 0]
+        queue = project._work_queue()
+        self.assertEqual(len(queue), len(even_jobs))
+        MockScheduler.step()
+        MockScheduler.step()
+        project._fetch_scheduler_status(file=StringIO())
+        for job in even_jobs:
+            op = project.next_operation(job)
+            self.assertFalse(project.eligible_for_submission(op))
+            self.assertEqual(project.get_job_status(job)['operations']['op1']['scheduler_status'],
+                             JobStatus.queued)
+        with self.assertRaises(SubmitError):
+            project.submit(pilot=1, array=True)
+
+        # The first pilot job executes all queued operations, the second one exits.
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                for _ in range(4):
+                    MockScheduler.step()
+        self.assertEqual(len(queue), 0)
+        self.assertTrue(all(job.isfile('world.txt') for job in even_jobs))
+
+    def test_submit_pilot_exited(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        even_jobs = [job for job in project if job.sp.b % 2 == 0]
+        with redirect_stderr(StringIO()):
+            self.assertEqual(project.submit(pilot=1, names=['op1']), 1)
+            self.assertEqual(project.submit(pilot=1, names=['op1']), 0)
+        # The pilot job exits without executing the queued operations.
+        MockScheduler.reset()
+        project._fetch_scheduler_status(file=StringIO())
+        for job in even_jobs:
+            self.assertTrue(project.eligible_for_submission(project.next_operation(job)))
+        with redirect_stderr(StringIO()):
+            self.assertEqual(project.submit(pilot=1, names=['op1']), 1)
+        pilot, = [sjob.name() for sjob in MockScheduler.jobs()]
+        queue = project._work_queue()
+        self.assertEqual(len(queue), len(even_jobs))
+        self.assertTrue(all(value[2] == [pilot] for _, value in queue.items()))
+        MockScheduler.reset()
+
+    def test_work(self):
+        project = self.mock_project()
+        ops = [op for job in project for op in project.next_operations(job) if op.name == 'op2']
+        queue = project._work_queue()
+        queue.put((op.get_id(), [op.name, [op.job.get_id()]]) for op in ops)
+        self.assertEqual([key for key, _ in queue.items()], [op.get_id() for op in ops])
+
+        # Operations that are not expected to complete within the walltime are not started.
+        directives = project.operations['op2'].directives
+        project.operations['op2'].directives = dict(cost=3600)
+        self.addCleanup(setattr, project.operations['op2'], 'directives', directives)
+        self.assertEqual(project.work(walltime=0.5), 0)
+        self.assertEqual(len(queue), len(ops))
+
+        # Complete operations and operations of unknown jobs are removed from the queue.
+        ops[0].job.doc.test = True
+        queue.put([('unknown', ['op2', ['0' * 32]])])
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    self.assertEqual(project.work(), len(ops) - 1)
+        self.assertEqual(len(queue), 0)
+        self.assertTrue(all(job.doc.get('test') for job in project))
+
+    def test_submit_max_queued(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        MockScheduler._jobs['other'] = ClusterJob('OtherProject/bundle/0', JobStatus.queued)
+        with redirect_stderr(StringIO()):
+            self.assertEqual(project.submit(names=['op2'], max_queued=4), 4)
+            self.assertEqual(project.submit(names=['op2'], max_queued=4), 0)
+        self.assertEqual(len(list(MockScheduler.jobs())), 5)
+        del MockScheduler._jobs['other']
+
+        # Once the cluster jobs have finished, the queue is topped up again.
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                for _ in range(4):
+                    MockScheduler.step()
+        with redirect_stderr(StringIO()):
+            self.assertEqual(project.submit(names=['op2'], max_queued=4), 4)
+            self.assertEqual(project.submit(names=['op2'], max_queued=8), 1)
+
+    def test_repeat_with_backoff(self):
+        calls = []
+
+        def submit():
+            calls.append(None)
+            if len(calls) == 1:
+                raise SubmitError("The scheduler is not available.")
+            return len(calls) < 3
+
+        flow.project._repeat_with_backoff(submit, 0.01)
+        self.assertEqual(len(calls), 3)
+
+    def test_scheduler_query_cache(self):
+        isolate_environ(self)
+        queries = []
+
+        class QueriedScheduler(Scheduler):
+            _query_cache = dict()
+
+            def jobs(self):
+                return self._cached_jobs(self.fetch)
+
+            def fetch(self):
+                queries.append(None)
+                return [ClusterJob('a', JobStatus.queued), ClusterJob('b', JobStatus.active)]
+
+        for _ in range(3):
+            jobs = QueriedScheduler().jobs()
+            self.assertEqual([(job.name(), job.status()) for job in jobs],
+                             [('a', JobStatus.queued), ('b', JobStatus.active)])
+        self.assertEqual(len(queries), 1)
+        # Other processes read the snapshot stored in the user's cache directory.
+        QueriedScheduler._query_cache.clear()
+        QueriedScheduler().jobs()
+        self.assertEqual(len(queries), 1)
+
+    def test_scheduler_query_prefix(self):
+        from flow.scheduling.slurm import SlurmScheduler
+        project = self.mock_project()
+        bin_dir = isolate_environ(self)
+        with open(os.path.join(bin_dir, 'squeue'), 'w') as squeue:
+            squeue.write('#!/bin/sh\n')
+            squeue.write("echo 'PD|N/A|{}/op1/abc'\n".format(str(project)[:12]))
+            squeue.write("echo 'R|3|{}/array/abc'\n".format(project))
+            squeue.write("echo 'R|N/A|other/op1/abc'\n")
+        os.chmod(os.path.join(bin_dir, 'squeue'), 0o755)
+        os.environ['PATH'] = os.pathsep.join((bin_dir, os.environ['PATH']))
+        sjobs = project._query_scheduler(SlurmScheduler(user='user'))
+        self.assertEqual(
+            [(sjob.name(), sjob.status()) for sjob in sjobs],
+            [('{}/op1/abc'.format(str(project)[:12]), JobStatus.queued),
+             ('{}/array/abc[3]'.format(project), JobStatus.active)])
+
+    def test_torque_query(self):
+        from flow.scheduling.torque import TorqueScheduler
+        bin_dir = isolate_environ(self)
+        with open(os.path.join(bin_dir, 'qstat'), 'w') as qstat:
+            qstat.write('#!/bin/sh\n')
+            qstat.write("echo '<Data>"
+                        "<Job><Job_Id>1.host</Job_Id><Job_Name>op</Job_Name>"
+                        "<Resource_List><walltime>01:00:00</walltime></Resource_List>"
+                        "<job_state>Q</job_state></Job>"
+                        "<Job><Job_Id>2[4].host</Job_Id><Job_Name>array-4</Job_Name>"
+                        "<job_state>R</job_state></Job></Data>'\n")
+        os.chmod(os.path.join(bin_dir, 'qstat'), 0o755)
+        os.environ['PATH'] = os.pathsep.join((bin_dir, os.environ['PATH']))
+        sjobs = TorqueScheduler(user='user').jobs()
+        self.assertEqual([(sjob.name(), sjob.status()) for sjob in sjobs],
+                         [('op', JobStatus.queued), ('array[4]', JobStatus.active)])
+
+    def test_scheduler_simulator(self):
+        from flow.scheduling import simulator
+        from flow.scheduling.slurm import SlurmScheduler
+        from flow.scheduling.lsf import LSFScheduler
+        from flow.scheduling.torque import TorqueScheduler
+        tmp_dir = isolate_environ(self)
+        simulator.install(os.path.join(tmp_dir, 'bin'), os.path.join(tmp_dir, 'data'),
+                          num_jobs=2, queue_time=3600)
+        os.environ['PATH'] = os.pathsep.join((os.path.join(tmp_dir, 'bin'), os.environ['PATH']))
+        scripts = {
+            SlurmScheduler: '#SBATCH --job-name="project/{}"\n',
+            LSFScheduler: '#BSUB -J project/{}\n',
+            TorqueScheduler: '#PBS -N project/{}\n',
+        }
+        for scheduler_type, script in scripts.items():
+            scheduler = scheduler_type()
+            self.assertTrue(scheduler_type.is_present())
+            cluster_id = scheduler.submit(script.format(scheduler_type.__name__))
+            scheduler.submit(script.format('after'), after=cluster_id, hold=True)
+        # All scheduler commands share the jobs stored in the data directory,
+        # squeue reports held jobs as pending.
+        for scheduler_type in scripts:
+            held = JobStatus.queued if scheduler_type is SlurmScheduler else JobStatus.held
+            expected = [('project/' + t.__name__, JobStatus.queued) for t in scripts]
+            expected.extend([('project/after', held)] * len(scripts))
+            sjobs = scheduler_type().jobs(prefix='project/')
+            self.assertEqual(sorted((sjob.name(), sjob.status()) for sjob in sjobs),
+                             sorted(expected))
+
+    def test_scheduler_query_after_submit(self):
+        from flow.environment import SlurmEnvironment
+        from flow.scheduling import simulator
+        tmp_dir = isolate_environ(self)
+        simulator.install(os.path.join(tmp_dir, 'bin'), os.path.join(tmp_dir, 'data'),
+                          queue_time=3600)
+        os.environ['PATH'] = os.pathsep.join((os.path.join(tmp_dir, 'bin'), os.environ['PATH']))
+        project = self.mock_project()
+        scheduler = SlurmEnvironment.get_scheduler()
+        self.assertEqual(list(project._query_scheduler(scheduler)), [])
+        script = '#SBATCH --job-name="{}/op1"\n'.format(project)
+        self.assertTrue(SlurmEnvironment.submit(script))
+        # The submitted cluster job is reported within the time-to-live of the snapshots.
+        sjobs = list(project._query_scheduler(scheduler))
+        self.assertEqual([sjob.name() for sjob in sjobs], ['{}/op1'.format(project)])
+        # Counting the queued cluster jobs bypasses the snapshots.
+        SlurmEnvironment.get_scheduler().submit(script)
+        self.assertEqual(len(list(project._query_scheduler(scheduler))), 1)
+        self.assertEqual(len(list(project._query_scheduler(scheduler, refresh=True))), 2)
+
     def test_submit_status(self):
         MockScheduler.reset()
         project = self.mock_project()
@@ -826,6 +1807,12 @@ class ProjectMainInterfaceTest(BaseProjectTest):
         for job in self.project:
             self.assertTrue(job.doc.get('test', False))
 
+    def test_main_profile(self):
+        self.call_subcmd('exec op2')
+        output = self.call_subcmd('profile').decode()
+        self.assertIn('op2', output)
+        self.assertIn(next(iter(self.project)).get_id(), output)
+
     def test_main_run(self):
         self.assertTrue(len(self.project))
         for job in self.project: